@@ -1 +1,6 @@
-from .interface import Interface
+def __getattr__(name: str):
+	# Интерфейс тянет за собой rich, поэтому импортируется только при обращении (пакетный режим и сервер без него).
+	if name == 'Interface':
+		from .interface import Interface
+		return Interface
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
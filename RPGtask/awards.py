@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+from math import sqrt
 from random import Random
 from typing import TYPE_CHECKING
 
 from .config import *
-from .content import all_items
+from .drops import DropSampler
 from .inventory import Item
+from .player import Skill
 from .utils import calculate_item_bonus
 
 if TYPE_CHECKING:
+	from .daily_tasks import DailyTask
 	from .interface import Interface
 
+# До этого количества слагаемых сумма случайных множителей считается честно, дальше по нормальному приближению.
+EXACT_UNIFORM_SUM = 64
+
 
 class AwardsManager:
 	"""
@@ -21,36 +27,44 @@ class AwardsManager:
 
 	Аргументы:
 		rnd (Random): Объект класса Random.
+		drops (DropSampler): Выбор выпадающих предметов.
 
 	Методы:
 		get_rewards_user_tasks(nums): Получение наград и наказаний для пользовательских заданий.
 		get_rewards_daily_tasks(need_items): Получение наград и наказаний за ежедневные задания.
+		get_penalty_missed_days(missed): Наказание за пропущенные повторения ежедневных заданий.
 		get_price_skill(lvl): Получение цены.
+		buy_skill_level(skill): Покупка уровня навыка.
 		uniform(): Генерирует рандомное число в промежутке.
+		uniform_sum(n): Сумма n рандомных чисел в промежутке.
 	"""
 
 	def __init__(self, interface: Interface):
 		self.interface = interface
 		self.rnd = Random()
+		self.drops = DropSampler()
 
-	def get_rewards_user_tasks(self, nums: list | set, need_items: bool = True) -> tuple[int, dict, list | list[Item]]:
+	def get_rewards_user_tasks(self, tasks: list | set, need_items: bool = True) -> tuple[int, dict, list | list[Item]]:
 		"""
 		Получение наград и наказаний для пользовательских заданий.
 
 		Аргументы:
-			nums (list[int]): Номера заданий, за которые надо выдать награду.
+			tasks (list[int | Task]): Номера заданий или задания, за которые надо выдать награду.
 			need_items (bool): Нужно ли выдавать предметы. Параметр необходим для наказаний. По умолчанию True.
 
 		Возвращается:
 			tuple: Кортеж, содержащий золото, опыт за навыки и предметы.
 		"""
 		gold, skills_exp, items = 0, {}, []
+		drops = self.drops.table('user')
 		sum_all_skills = self.interface.player.sum_level()
 		if sum_all_skills < DIVISOR_SUM_LEVELS:
 			sum_all_skills = DIVISOR_SUM_LEVELS
 
-		for num in nums:
-			skills = self.interface.task_manager.get_task(num).skills
+		for task in tasks:
+			if isinstance(task, int):
+				task = self.interface.task_manager.get_task(task)
+			skills = task.skills
 
 			if skills is None:
 				gold += self.uniform() * (sum_all_skills / DIVISOR_SUM_LEVELS) * MULTIPLIER_OBTAINING_GOLD
@@ -71,12 +85,8 @@ class AwardsManager:
 					else:
 						skills_exp[skill] = exp
 
-			if self.rnd.choices([False, True], weights=PROBABILITY_ITEM_FALL_OUT)[0] and need_items:
-				item_lvl = self.rnd.choices(['one', 'two', 'three'], weights=PROBABILITY_DROP_ITEM_CERTAIN_LEVEL)[0]
-				identifier = self.rnd.choice(list(all_items[item_lvl].keys()))
-				item = all_items[item_lvl][identifier]
-
-				items.append(item)
+			if need_items and (outcome := drops.sample(self.rnd)):
+				items.append(self.drops.item(outcome))
 
 		return gold, skills_exp, items
 
@@ -92,6 +102,7 @@ class AwardsManager:
 			tuple: Кортеж, содержащий золото, опыт за навыки и предметы.
 		"""
 		gold, skills_exp, items = 0, {}, []
+		drops = self.drops.table('daily')
 		sum_all_skills = self.interface.player.sum_level()
 		sum_all_skills = DIVISOR_SUM_LEVELS if sum_all_skills < DIVISOR_SUM_LEVELS else sum_all_skills
 
@@ -118,15 +129,49 @@ class AwardsManager:
 					else:
 						skills_exp[skill] = exp
 
-			if self.rnd.choices([False, True], weights=PROBABILITY_ITEM_FALL_OUT_DAILY_TASK)[0] and need_items:
-				item_lvl = self.rnd.choices(['one', 'two', 'three'], weights=PROBABILITY_DROP_ITEM_CERTAIN_LEVEL)[0]
-				identifier = self.rnd.choice(list(all_items[item_lvl].keys()))
-				item = all_items[item_lvl][identifier]
-
-				items.append(item)
+			if need_items and (outcome := drops.sample(self.rnd)):
+				items.append(self.drops.item(outcome))
 
 		return gold, skills_exp, items
 
+	def get_penalty_missed_days(self, missed: list[tuple[DailyTask, int]]) -> tuple[float, dict[Skill, float]]:
+		"""
+		Наказание за пропущенные повторения ежедневных заданий по формулам get_rewards_daily_tasks.
+
+		Пока игрока нет, уровни навыков и снаряжение не меняются, поэтому наказание за каждый день считается по одним
+		и тем же уровням. Золото и опыт не уходят ниже нуля, поэтому отнять сумму за все дни сразу — то же самое, что
+		отнимать её по дням. Для каждой формулы считается, сколько раз она применялась, и случайные множители
+		складываются одним числом (uniform_sum), так что время не зависит от количества дней.
+
+		Аргументы:
+			missed (list[tuple[DailyTask, int]]): Задания и количество невыполненных повторений.
+
+		Возвращается:
+			tuple[float, dict[Skill, float]]: Золото и опыт, которые надо отнять.
+		"""
+		# Сколько раз применялась каждая формула
+		gold_plain, gold_skills, skill_counts = 0, 0, {}
+		for task, count in missed:
+			if task.skills is None:
+				gold_plain += count
+			else:
+				gold_skills += count
+				for skill in task.skills:
+					skill_counts[skill] = skill_counts.get(skill, 0) + count
+
+		sum_all_skills = max(self.interface.player.sum_level(), DIVISOR_SUM_LEVELS)
+		gold = (self.uniform_sum(gold_plain) * MULTIPLIER_OBTAINING_GOLD + self.uniform_sum(gold_skills)) \
+			* (sum_all_skills / DIVISOR_SUM_LEVELS)
+
+		skills_exp = {}
+		for skill, count in skill_counts.items():
+			skill = self.interface.player.skills[skill]
+			item_bonus = calculate_item_bonus(self.interface.inventory, skill)
+			skills_exp[skill] = self.uniform_sum(count) * max(skill.level, 1) * item_bonus \
+				* DAILY_TASK_EXPERIENCE_MULTIPLIER
+
+		return gold, skills_exp
+
 	@staticmethod
 	def get_price_skill(lvl: int) -> tuple[float, float]:
 		"""
@@ -148,6 +193,39 @@ class AwardsManager:
 
 		return demand_exp, demand_gold
 
-	def uniform(self, min_n: float = 0.01, max_n: float = 0.05) -> float:
+	def buy_skill_level(self, skill: Skill) -> bool | None:
+		"""
+		Покупка уровня навыка. Опыт при покупке не тратится, он только должен быть не меньше требуемого.
+
+		Аргументы:
+			skill (Skill): Навык, уровень которого покупается.
+
+		Возвращается:
+			bool | None: True если уровень куплен, False если не хватает опыта, None если не хватает золота.
+		"""
+		demand_exp, demand_gold = self.get_price_skill(skill.level)
+		gold = self.interface.player.gold
+
+		if demand_exp > skill.exp:
+			return False
+		if gold.gold - demand_gold < 0:
+			return None
+
+		gold.payment(demand_gold)
+		skill.level_up()
+		return True
+
+	def uniform(self, min_n: float = MIN_REWARD_FACTOR, max_n: float = MAX_REWARD_FACTOR) -> float:
 		""" Генерирует рандомное число в промежутке """
 		return self.rnd.uniform(min_n, max_n)
+
+	def uniform_sum(self, n: int, min_n: float = MIN_REWARD_FACTOR, max_n: float = MAX_REWARD_FACTOR) -> float:
+		"""
+		Сумма n рандомных чисел в промежутке. При больших n вместо сложения используется нормальное распределение
+		с тем же средним и дисперсией (центральная предельная теорема), обрезанное до возможных значений.
+		"""
+		if n <= EXACT_UNIFORM_SUM:
+			return sum(self.rnd.uniform(min_n, max_n) for _ in range(n))
+
+		value = self.rnd.gauss(n * (min_n + max_n) / 2, (max_n - min_n) * sqrt(n / 12))
+		return min(max(value, n * min_n), n * max_n)
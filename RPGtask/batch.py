@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .config import *
+from .drops import AliasTable
+from .inventory import Item
+from .player import SkillType
+from .utils import calculate_bonus_vector
+
+# До этого количества слагаемых сумма рандомных чисел считается честно, дальше по нормальному приближению.
+EXACT_UNIFORM_SUM = 10_000
+
+if TYPE_CHECKING:
+	from .awards import AwardsManager
+	from .daily_tasks import DailyTask
+	from .tasks import Task
+
+
+class BatchAwardsManager:
+	"""
+	Пакетный расчёт наград. Считает награды сразу для множества заданий одним проходом NumPy
+	по тем же формулам, что и AwardsManager.
+
+	Параметры:
+		awards_manager (AwardsManager): Менеджер наград, через который берутся данные игрока и инвентаря.
+		seed (int | None): Зерно генератора случайных чисел. По умолчанию None.
+
+	Аргументы:
+		rng (np.random.Generator): Генератор случайных чисел.
+
+	Методы:
+		skill_mask(tasks): Матрица навыков заданий.
+		skill_factor(daily): Множители опыта по навыкам.
+		get_rewards(tasks, daily, need_items): Награды за задания.
+		get_penalty(missed): Наказание за пропущенные повторения ежедневных заданий.
+		get_drops(count, daily): Номера выпавших предметов в таблице awards_manager.drops, начиная с 0.
+		summarize(gold, exp, drops): Приводит награды к виду, который возвращает AwardsManager.
+		uniform(size): Массив рандомных чисел в промежутке.
+		uniform_sum(counts): Суммы counts[i] рандомных чисел в промежутке.
+	"""
+
+	def __init__(self, awards_manager: AwardsManager, seed: int | None = None):
+		self.awards_manager = awards_manager
+		self.rng = np.random.default_rng(seed)
+
+		# Таблицы Уолкера из DropSampler в виде массивов.
+		self.tables: dict[str, tuple[AliasTable, np.ndarray, np.ndarray]] = {}
+
+	@staticmethod
+	def skill_mask(tasks: list[Task | DailyTask]) -> np.ndarray:
+		""" Матрица (задания x навыки), в которой отмечены навыки каждого задания. """
+		mask = np.zeros((len(tasks), len(SkillType)), dtype=bool)
+
+		rows, columns = [], []
+		for row, task in enumerate(tasks):
+			if task.skills:
+				rows.extend([row] * len(task.skills))
+				columns.extend(task.skills)
+		mask[rows, columns] = True
+
+		return mask
+
+	def skill_factor(self, daily: bool = False) -> np.ndarray:
+		""" Множители опыта по навыкам: уровень (не меньше 1), бонус предметов и бонус ежедневных заданий. """
+		interface = self.awards_manager.interface
+		levels = np.array([max(skill.level, 1) for skill in interface.player.skills], dtype=float)
+		inventory = interface.inventory
+		if inventory.bonus is None:  # Тот же кэш, что и в calculate_item_bonus
+			inventory.bonus = calculate_bonus_vector(inventory)
+		bonus = np.array(inventory.bonus[0], dtype=float)
+		return levels * bonus * (DAILY_TASK_EXPERIENCE_MULTIPLIER if daily else 1)
+
+	def get_rewards(self, tasks: list[Task | DailyTask], daily: bool = False,
+					need_items: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""
+		Награды за задания.
+
+		Аргументы:
+			tasks (list[Task | DailyTask]): Задания, за которые надо выдать награду.
+			daily (bool): Ежедневные ли это задания. По умолчанию False.
+			need_items (bool): Нужно ли выдавать предметы. По умолчанию True.
+
+		Возвращается:
+			tuple: Золото за каждое задание (N), опыт за каждое задание по навыкам (N x 8)
+				и номера выпавших предметов (N), -1 если предмет не выпал (см. get_drops).
+		"""
+		interface = self.awards_manager.interface
+		count = len(tasks)
+
+		sum_all_skills = max(interface.player.sum_level(), DIVISOR_SUM_LEVELS)
+		mask = self.skill_mask(tasks)
+		no_skills = ~mask.any(axis=1)
+
+		gold = self.uniform(count) * (sum_all_skills / DIVISOR_SUM_LEVELS)
+		gold[no_skills] *= MULTIPLIER_OBTAINING_GOLD
+
+		exp = self.uniform((count, len(SkillType))) * self.skill_factor(daily)
+		exp[~mask] = 0
+
+		drops = self.get_drops(count, daily) if need_items else np.full(count, -1)
+
+		return gold, exp, drops
+
+	def get_penalty(self, missed: list[tuple[DailyTask, int]]) -> tuple[float, dict]:
+		"""
+		Наказание за пропущенные повторения ежедневных заданий по формулам get_rewards_daily_tasks.
+
+		Для каждой формулы считается, сколько раз она применялась (золото за задания без навыков, золото за задания
+		с навыками и опыт каждого навыка), и случайные множители складываются одним вызовом uniform_sum.
+
+		Аргументы:
+			missed (list[tuple[DailyTask, int]]): Задания и количество невыполненных повторений.
+
+		Возвращается:
+			tuple[float, dict[Skill, float]]: Золото и опыт, которые надо отнять.
+		"""
+		if not missed:
+			return 0, {}
+
+		interface = self.awards_manager.interface
+		counts = np.array([count for _, count in missed], dtype=np.int64)
+		mask = self.skill_mask([task for task, _ in missed])
+		no_skills = ~mask.any(axis=1)
+
+		formulas = np.concatenate(([counts[no_skills].sum(), counts[~no_skills].sum()], counts @ mask))
+		sums = self.uniform_sum(formulas)
+
+		sum_all_skills = max(interface.player.sum_level(), DIVISOR_SUM_LEVELS)
+		gold = (sums[0] * MULTIPLIER_OBTAINING_GOLD + sums[1]) * (sum_all_skills / DIVISOR_SUM_LEVELS)
+
+		exp = sums[2:] * self.skill_factor(daily=True)
+		skills = interface.player.skills
+		skills_exp = {skills[skill]: float(exp[skill]) for skill in np.flatnonzero(formulas[2:])}
+
+		return float(gold), skills_exp
+
+	def get_drops(self, count: int, daily: bool = False) -> np.ndarray:
+		"""
+		Индексы выпавших предметов.
+
+		Аргументы:
+			count (int): Количество заданий.
+			daily (bool): Ежедневные ли это задания. По умолчанию False.
+		"""
+		source = 'daily' if daily else 'user'
+		table = self.awards_manager.drops.table(source)
+
+		cached = self.tables.get(source)
+		if cached is None or cached[0] is not table:
+			cached = self.tables[source] = (table, np.array(table.prob), np.array(table.alias))
+		_, prob, alias = cached
+
+		cells = self.rng.integers(len(prob), size=count)
+		outcomes = np.where(self.rng.random(count) < prob[cells], cells, alias[cells])
+
+		return outcomes - 1
+
+	def summarize(self, gold: np.ndarray, exp: np.ndarray, drops: np.ndarray) -> tuple[float, dict, list[Item]]:
+		"""
+		Приводит награды к виду, который возвращает AwardsManager.
+
+		Возвращается:
+			tuple: Кортеж, содержащий золото, опыт за навыки и предметы.
+		"""
+		skills = self.awards_manager.interface.player.skills
+		total_exp = exp.sum(axis=0)
+		used = exp.any(axis=0)
+
+		skills_exp = {skills[skill]: float(total_exp[skill]) for skill in np.flatnonzero(used)}
+		items = [self.awards_manager.drops.item(int(index) + 1) for index in drops[drops >= 0]]
+
+		return float(gold.sum()), skills_exp, items
+
+	def uniform(self, size) -> np.ndarray:
+		""" Генерирует массив рандомных чисел в промежутке. """
+		return self.rng.uniform(MIN_REWARD_FACTOR, MAX_REWARD_FACTOR, size)
+
+	def uniform_sum(self, counts: np.ndarray) -> np.ndarray:
+		"""
+		Суммы counts[i] рандомных чисел в промежутке. До EXACT_UNIFORM_SUM слагаемых числа честно генерируются
+		и складываются, при больших значениях используется нормальное распределение с тем же средним и дисперсией
+		(центральная предельная теорема), обрезанное до возможных значений.
+		"""
+		counts = np.asarray(counts, dtype=np.int64)
+		sums = np.zeros(len(counts))
+
+		exact = counts <= EXACT_UNIFORM_SUM
+		if counts[exact].sum():
+			draws = self.uniform(int(counts[exact].sum()))
+			ends = np.cumsum(counts[exact])
+			totals = np.concatenate(([0], np.cumsum(draws)))
+			sums[exact] = totals[ends] - totals[ends - counts[exact]]
+
+		large = counts[~exact].astype(float)
+		if len(large):
+			mean = large * (MIN_REWARD_FACTOR + MAX_REWARD_FACTOR) / 2
+			std = (MAX_REWARD_FACTOR - MIN_REWARD_FACTOR) * np.sqrt(large / 12)
+			sums[~exact] = np.clip(self.rng.normal(mean, std), large * MIN_REWARD_FACTOR, large * MAX_REWARD_FACTOR)
+
+		return sums
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return f"<BatchAwardsManager tables={len(self.tables)}>"
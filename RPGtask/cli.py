@@ -0,0 +1,236 @@
+"""
+Пакетный режим без интерактивного меню. Загружает данные, выполняет команды, один раз сохраняет и завершается.
+
+	python -m RPGtask add "Полить цветочки" "Проверить почту [Ремесло, Финансы] -e"
+	python -m RPGtask complete 3 5 7
+	python -m RPGtask import backlog.txt
+	python -m RPGtask export > backup.json
+	python -m RPGtask --batch commands.txt
+"""
+import argparse
+import json
+import shlex
+import sys
+from datetime import date
+
+from .importer import TaskImporter, parse_task_line, read_lines
+from .player import SkillType
+from .quests import BossFight
+from .session import Session, CompletionResult
+
+
+class CommandError(Exception):
+	""" Ошибка выполнения команды пакетного режима. """
+
+
+def create_parser() -> argparse.ArgumentParser:
+	""" Разбор аргументов командной строки. """
+	parser = argparse.ArgumentParser(prog='rpgtask', description='Пакетный режим RPGtask.')
+	parser.add_argument('--batch', metavar='FILE', help="файл с командами, по одной в строке ('-' - стандартный ввод)")
+	commands = parser.add_subparsers(dest='command', metavar='command')
+
+	add = commands.add_parser('add', help='добавить задания')
+	add.add_argument('lines', nargs='+', metavar='TASK', help='задание в формате "задание [навык, навык] -e"')
+
+	import_ = commands.add_parser('import', help='импортировать задания из файла')
+	import_.add_argument('file', help="файл с заданиями, по одному в строке ('-' - стандартный ввод)")
+
+	complete = commands.add_parser('complete', help='отметить задания выполненными')
+	complete.add_argument('nums', nargs='+', type=int, metavar='N', help='номера заданий из команды list')
+
+	commands.add_parser('list', help='показать задания с номерами')
+	commands.add_parser('export', help='вывести все данные в формате JSON')
+
+	return parser
+
+
+def format_result(result: CompletionResult) -> list[str]:
+	""" Текстовое описание наград за выполненные задания. """
+	lines = [f'Выполнено заданий: {len(result.user_tasks) + len(result.daily_tasks) + len(result.goals)}']
+
+	if result.gold:
+		lines.append(f'Золото: +{round(result.gold, 2)}')
+	if result.skills_exp:
+		exp = ', '.join(f'{SkillType.description(skill.skill_type)} +{round(value, 2)}'
+						for skill, value in result.skills_exp.items())
+		lines.append(f'Опыт: {exp}')
+	if result.items:
+		lines.append(f'Предметы: {", ".join(item.name for item in result.items)}')
+
+	if result.quest is not None:
+		lines.append(f'Квест «{result.quest.name}» выполнен: золото +{round(result.quest_gold, 2)}')
+		if result.quest_items:
+			lines.append(f'Предметы за квест: {", ".join(item.name for item in result.quest_items)}')
+	if result.rank_up:
+		lines.append('Получен новый ранг')
+	if result.overflow:
+		lines.append(f'Продано из-за нехватки места: {", ".join(item.name for item, _ in result.overflow)}')
+	return lines
+
+
+class BatchRunner:
+	"""
+	Выполняет команды пакетного режима над одной сессией.
+
+	Параметры:
+		session (Session): Загруженные данные игрока.
+		out: Поток для вывода результатов.
+
+	Методы:
+		run(args): Выполняет одну команду.
+		run_batch(lines) -> int: Выполняет команды из строк, возвращает количество ошибок.
+	"""
+
+	def __init__(self, session: Session, out=sys.stdout):
+		self.session = session
+		self.out = out
+		self.parser = create_parser()
+
+	def print(self, *lines: str):
+		""" Выводит строки результата. """
+		for line in lines:
+			print(line, file=self.out)
+
+	def run(self, args: argparse.Namespace):
+		""" Выполняет одну команду. """
+		getattr(self, f'command_{args.command}')(args)
+
+	def run_batch(self, lines) -> int:
+		"""
+		Выполняет команды из строк. Пустые строки и строки, начинающиеся с #, пропускаются.
+		Ошибочная команда не прерывает выполнение остальных.
+
+		Возвращается:
+			int: Количество команд, которые не удалось выполнить.
+		"""
+		errors = 0
+		for line_no, line in enumerate(lines, 1):
+			line = line.strip()
+			if not line or line.startswith('#'):
+				continue
+
+			try:
+				args = self.parser.parse_args(shlex.split(line))
+				if args.command is None or args.batch is not None:
+					raise CommandError('ожидается команда')
+				self.run(args)
+			except (CommandError, ValueError) as e:
+				errors += 1
+				print(f'строка {line_no}: {e}', file=sys.stderr)
+			except SystemExit:  # argparse уже вывел сообщение об ошибке
+				errors += 1
+				print(f'строка {line_no}: некорректная команда', file=sys.stderr)
+		return errors
+
+	def command_add(self, args: argparse.Namespace):
+		""" Добавляет задания. """
+		session = self.session
+		for line in args.lines:
+			parsed = parse_task_line(line)
+			if parsed.error is not None:
+				raise CommandError(f'{line!r}: {parsed.error}')
+			if parsed.unknown:
+				print(f'{line!r}: неизвестные навыки: {", ".join(parsed.unknown)}', file=sys.stderr)
+
+			if parsed.daily:
+				task = session.daily_tasks_manager.add_task(parsed.task, parsed.skills, parsed.rule)
+				session.record('daily_add', task.id, task.task, task.skills, task.rule.save())
+			else:
+				task = session.task_manager.add_task(parsed.task, parsed.skills)
+				session.record('task_add', task.id, task.task, task.skills)
+			self.print(f'Добавлено: {task.task}')
+
+	def command_import(self, args: argparse.Namespace):
+		""" Импортирует задания из файла. """
+		session = self.session
+		importer = TaskImporter(session.task_manager, session.daily_tasks_manager, session.storage)
+		try:
+			report = importer.import_file(args.file)
+		except OSError as e:
+			raise CommandError(f'не удалось прочитать файл: {e}') from None
+		self.print(report.format())
+
+	def command_complete(self, args: argparse.Namespace):
+		""" Отмечает задания выполненными. """
+		session = self.session
+		_, _, quests_count = session.task_counts()
+
+		wrong = [num for num in args.nums if not 0 < num < quests_count]
+		if wrong:
+			raise CommandError(f'нет заданий с номерами {", ".join(map(str, wrong))}')
+
+		result = session.complete_tasks(*session.resolve_tasks(set(args.nums)))
+		self.print(*format_result(result))
+
+	def command_list(self, args: argparse.Namespace):
+		""" Показывает задания с номерами, которые принимает команда complete. """
+		session = self.session
+		num = 1
+
+		for task in session.task_manager.tasks.values():
+			skills = ', '.join(SkillType.description(skill) for skill in task.skills or ())
+			self.print(f'({num}) {task.task}' + (f' [{skills}]' if skills else ''))
+			num += 1
+
+		for task in session.daily_tasks_manager.daily_tasks.values():
+			skills = ', '.join(SkillType.description(skill) for skill in task.skills or ())
+			mark = ('x' if task.done else ' ') if task.active else '-'
+			line = f'({num}) [{mark}] {task.task} {task.rule.flag()}' + (f' [{skills}]' if skills else '')
+			self.print(line if task.active else f'{line} (следующий раз {date.fromordinal(task.due)})')
+			num += 1
+
+		for active in session.quest_manager.active_quests:
+			if active.done:
+				continue
+			for goal in active.goals:
+				if not isinstance(goal, BossFight):
+					self.print(f'({num}) [{"x" if goal.completed else " "}] {goal.task} ({active.quest.name})')
+					num += 1
+
+	def command_export(self, args: argparse.Namespace):
+		""" Выводит все данные в формате JSON. """
+		session = self.session
+		data = {
+			'user_tasks': session.task_manager.save(),
+			'daily_tasks': session.daily_tasks_manager.save(),
+			'quests': session.quest_manager.save(),
+			'player': session.player.save(),
+			'inventory': session.inventory.save(),
+		}
+		json.dump(data, self.out, ensure_ascii=False, indent=2)
+		self.print()
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = create_parser()
+	args = parser.parse_args(argv)
+	if args.command is None and args.batch is None:
+		parser.print_help()
+		return 2
+
+	session = Session()
+	runner = BatchRunner(session)
+
+	# Все записи журнала сбрасываются на диск один раз
+	with session.storage.transaction():
+		penalty = session.update()
+		if penalty is not None:
+			gold, skills_exp = penalty
+			print(f'Наказание за невыполненные ежедневные задания: золото -{round(gold, 2)}', file=sys.stderr)
+
+		errors = 0
+		if args.batch is not None:
+			errors += runner.run_batch(read_lines(args.batch))
+		if args.command is not None:
+			try:
+				runner.run(args)
+			except (CommandError, ValueError) as e:
+				errors += 1
+				print(e, file=sys.stderr)
+
+	session.save()
+	return 1 if errors else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
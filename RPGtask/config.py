@@ -6,6 +6,10 @@ MULTIPLIER_GOLD = 2
 CONSTANT_SKILL = 0.3
 MULTIPLIER_SKILL = 2
 
+# Границы случайного множителя в формулах наград.
+MIN_REWARD_FACTOR = 0.01
+MAX_REWARD_FACTOR = 0.05
+
 MULTIPLIER_OBTAINING_GOLD = 2  # Коэффициент увеличения награды за задачи, у которых нет навыков.
 DAILY_TASK_EXPERIENCE_MULTIPLIER = 1.2  # Коэффициент увеличения опыта для ежедневных задач.
 
@@ -20,3 +24,14 @@ PROBABILITY_DROP_ITEM_CERTAIN_LEVEL = [0.7, 0.25, 0.05]
 
 NUMBER_QUEST_STORE = 10  # Количество квестов в магазине.
 NUMBER_ITEM_STORE = 10  # Количество предметов в магазине.
+
+MAX_TASK_SKILLS = 3  # Максимальное количество навыков у задания.
+
+# Режим хранения данных: 'json' - полная перезапись файлов при выходе, 'journal' - журнал изменений и снимки,
+# 'sqlite' - база данных SQLite с построчной записью изменений.
+STORAGE_MODE = 'journal'
+JOURNAL_COMPACT_SIZE = 500  # Количество записей в журнале, после которого записывается новый снимок данных.
+AUTOSAVE = False  # Сохранять изменившиеся данные после каждого действия в меню. Полезно для режима 'json'.
+
+# Хранилища начиная с этого размера создаются на массивах (CompactInventory). Экономит память на больших складах.
+COMPACT_INVENTORY_SIZE = 1000
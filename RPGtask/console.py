@@ -139,7 +139,8 @@ class AppConsole:
 			self.console.print(tree)
 
 	def print_task_tree(self, hide_root: bool = True):
-		user_tasks = self.interface.task_manager.tasks
+		user_tasks = list(self.interface.task_manager.tasks.values())
+		daily_tasks = list(self.interface.daily_tasks_manager.daily_tasks.values())
 		daily_tasks_manager = self.interface.daily_tasks_manager
 		quests = self.interface.quest_manager.active_quests
 
@@ -156,14 +157,14 @@ class AppConsole:
 				branch_user_tasks.add(str(task) + end)
 
 		# Ежедневные задания #
-		if not daily_tasks_manager.daily_tasks:
+		if not daily_tasks:
 			tree.add('[b yellow]Ежедневные задания[/]\nВы не добавили задания\n')
 		else:
 			c = '[green]x[/]' if daily_tasks_manager.done else ' '
 			branch_user_tasks = tree.add(f'[{c}] [b yellow]Ежедневные задания')
 
-			for i, task in enumerate(daily_tasks_manager.daily_tasks, 1):
-				end = '\n' if len(daily_tasks_manager.daily_tasks) == i else ''
+			for i, task in enumerate(daily_tasks, 1):
+				end = '\n' if len(daily_tasks) == i else ''
 				branch_user_tasks.add(str(task) + end)
 
 		# Квесты #
@@ -219,7 +220,7 @@ class AppConsole:
 		Аргументы:
 			count (int): Число, с которого номера заданий будут брать отсчёт. По умолчанию 1.
 		"""
-		user_tasks = self.interface.task_manager.tasks
+		user_tasks = self.interface.task_manager.tasks.values()
 
 		self.console.print('[green]Пользовательские задания')
 
@@ -240,7 +241,7 @@ class AppConsole:
 		Аргументы:
 			count (int): Число, с которого номера заданий будут брать отсчёт. По умолчанию 1.
 		"""
-		daily_tasks = self.interface.daily_tasks_manager.daily_tasks
+		daily_tasks = self.interface.daily_tasks_manager.daily_tasks.values()
 
 		self.console.print('[yellow]Ежедневные задания')
 
@@ -1,2 +1 @@
-from .items import all_items
 from .text import *
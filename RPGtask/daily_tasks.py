@@ -1,105 +1,327 @@
+from collections.abc import Iterable, Iterator
+from datetime import date
+from heapq import heapify, heappop, heappush
+
 from .player import SkillType
+from .recurrence import Recurrence, EVERY_DAY
+
+
+def to_mask(identifiers: Iterable[int]) -> int:
+	""" Битовая маска из идентификаторов. Собирается в bytearray, чтобы не копировать большое число на каждый бит. """
+	identifiers = list(identifiers)
+	if not identifiers:
+		return 0
+
+	bits = bytearray(max(identifiers) // 8 + 1)
+	for identifier in identifiers:
+		bits[identifier >> 3] |= 1 << (identifier & 7)
+	return int.from_bytes(bits, 'little')
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+	""" Номера установленных битов маски по возрастанию. Количество шагов равно количеству установленных битов. """
+	bits = bin(mask)[:1:-1]
+	index = bits.find('1')
+	while index != -1:
+		yield index
+		index = bits.find('1', index + 1)
 
 
 class DailyTask:
-	def __init__(self, task: str, skills: list[SkillType] | None, done: bool = False):
+	def __init__(self, task: str, skills: list[SkillType] | None, identifier: int | None = None,
+				 rule: Recurrence = EVERY_DAY):
 		self.task = task
 		self.skills = skills
-		self.done = done
+		self.id = identifier
+		self.rule = rule
+
+		self.due: int = 0  # Дата ближайшего повторения (date.toordinal)
+		self.manager: DailyTaskManager | None = None  # Менеджер, в котором хранятся отметки о выполнении
+
+	@property
+	def done(self) -> bool:
+		""" Выполнено ли задание в текущий день. """
+		return self.manager is not None and self.manager.is_done(self.id)
 
-	def save(self) -> tuple[str, list[SkillType] | None, bool]:
+	@property
+	def active(self) -> bool:
+		""" Нужно ли выполнить задание в текущий день. """
+		return self.manager is not None and self.manager.is_active(self.id)
+
+	def save(self) -> tuple[str, list[SkillType] | None, bool, int, list | None]:
 		""" Возвращает данные для сохранения заданий. """
-		return self.task, self.skills, self.done
+		return self.task, self.skills, self.done, self.id, self.rule.save()
 
 	def __str__(self):
 		""" Формирует удобочитаемое представление объекта. """
-		c = "[d][[green]x[/]]" if self.done else "[ ]"
+		if not self.active:
+			c = "[d][-][/]"
+			end = f"  [d]{self.rule}, следующий раз {date.fromordinal(self.due):%d.%m}[/]"
+		else:
+			c = "[d][[green]x[/]]" if self.done else "[ ]"
+			end = "" if self.rule.kind == 'daily' else f"  [d]{self.rule}[/]"
 
 		if self.skills:
-			return f"{c} [yellow]{self.task}  [d cyan]Навыки: {', '.join(map(lambda s: SkillType.description(s), self.skills))}"
-		return f"{c} [yellow]{self.task}"
+			skills = ', '.join(map(lambda s: SkillType.description(s), self.skills))
+			return f"{c} [yellow]{self.task}  [d cyan]Навыки: {skills}[/]{end}"
+		return f"{c} [yellow]{self.task}{end}"
 
 	def __repr__(self):
 		""" Возвращает строковое представление объекта. """
-		return f"<DailyTask name={self.task!r} skills={len(self.skills)} done={self.done}>"
+		return f"<DailyTask id={self.id} name={self.task!r} skills={len(self.skills or ())} done={self.done}>"
 
 
 class DailyTaskManager:
 	"""
-	Менеджер ежедневных заданий.
+	Менеджер ежедневных заданий. Задания повторяются по правилам (см. Recurrence). Задания, которые надо выполнить
+	в текущий день, отмечены в битовой маске active, а остальные лежат в куче по дате ближайшего повторения, поэтому
+	при начале нового дня просматриваются только задания, срок которых наступил. Отметки о выполнении хранятся в битовой
+	маске completed (бит с номером идентификатора задания) и сбрасываются все сразу.
 
 	Атрибуты:
-		daily_tasks (list[DailyTask]): Список всех ежедневных заданий. По умолчанию пустой список.
+		daily_tasks (dict[int, DailyTask]): Все ежедневные задания по идентификатору в порядке добавления.
+		next_id (int): Идентификатор, который получит следующее задание.
 		date (str): Дата, когда задание было получено. По умолчанию пустая строка.
-		done (bool): Выполнены ли задания. По умолчанию False.
+		day (int): Та же дата порядковым номером (date.toordinal).
+		version (int): Номер версии заданий. Увеличивается при каждом изменении.
+
+		active (int): Битовая маска заданий, которые надо выполнить в текущий день.
+		completed (int): Битовая маска выполненных заданий текущего дня. Всегда входит в active.
+		remaining (int): Количество невыполненных заданий текущего дня.
+		done (bool): Выполнены ли все задания текущего дня.
+		heap (list[tuple[int, int]]): Куча (дата повторения, идентификатор) остальных заданий. Записи удалённых
+			заданий не удаляются из кучи, а пропускаются при извлечении.
 
 	Методы:
 		save(): Возвращает данные для сохранения ежедневных заданий.
 		load(data): Загружает данные ежедневных заданий.
-		add_task(task, skills): Добавляет ежедневную задачу в список активных.
-		delete_task(num): Удаляет ежедневное задание по номеру. Если номер некорректный вызывает ошибку.
+		add_task(task, skills, rule): Добавляет ежедневную задачу в список активных.
+		add_tasks(tasks): Добавляет несколько ежедневных задач в список активных.
+		delete_task(identifier): Удаляет ежедневное задание по идентификатору. Если идентификатор некорректный вызывает ошибку.
+		delete_tasks(identifiers): Удаляет ежедневные задания по идентификаторам.
 		get_task(num): Получение ежедневного задания по номеру. Если номер некорректный вызывает ошибку.
-		complete(num): Отмечает ежедневную задачу выполненной и проверяет выполнение всех заданий.
-		all_complete(): Если все задания выполнены, то отмечает это.
-		update(): Начинает новый день.
+		ids(): Идентификаторы заданий в порядке отображения.
+		complete(identifier): Отмечает ежедневную задачу выполненной и проверяет выполнение всех заданий.
+		complete_tasks(identifiers): Отмечает ежедневные задачи выполненными.
+		is_active(identifier): Нужно ли выполнить задание в текущий день.
+		is_done(identifier): Выполнено ли задание в текущий день.
+		not_completed(): Невыполненные задания текущего дня.
+		schedule(task): Назначает заданию ближайшее повторение.
+		update(today): Начинает новый день.
 	"""
 
 	def __init__(self):
-		self.daily_tasks: list[DailyTask] = []
+		self.daily_tasks: dict[int, DailyTask] = {}
+		self.next_id: int = 1
 
 		self.date: str = ''
-		self.done: bool = False
+		self.day: int = date.today().toordinal()
+		self.version: int = 0
 
-	def save(self) -> dict[str, str | tuple[str, list[SkillType] | None, bool]]:
+		self.active: int = 0
+		self.completed: int = 0
+		self.remaining: int = 0
+		self.heap: list[tuple[int, int]] = []
+
+		# Порядок отображения заданий. Пересчитывается после удаления при первом обращении.
+		self.order: list[int] | None = []
+
+	def save(self) -> dict[str, str | tuple[str, list[SkillType] | None, bool, int, list | None]]:
 		""" Возвращает данные для сохранения ежедневных заданий. """
-		return {'tasks': [task.save() for task in self.daily_tasks], 'date': self.date}
+		return {'tasks': [task.save() for task in self.daily_tasks.values()], 'date': self.date}
+
+	def load(self, data: dict[str, str | tuple[str, list[SkillType] | None, bool, int, list | None]]):
+		""" Загружает данные ежедневных заданий. Заданиям из старых сохранений выдаются новые идентификаторы. """
+		tasks = []
+		for saved in data['tasks']:
+			# В старых сохранениях нет идентификаторов и правил повторения
+			task, skills, done, identifier, rule = (*saved, None, None)[:5]
+			tasks.append((DailyTask(task, skills, identifier, Recurrence.load(rule)), done))
+		self.next_id = max((task.id for task, _ in tasks if task.id is not None), default=0) + 1
+
+		self.daily_tasks = {}
+		for task, _ in tasks:
+			if task.id is None:
+				task.id = self.next_id
+				self.next_id += 1
+			task.manager = self
+			self.daily_tasks[task.id] = task
 
-	def load(self, data: dict[str, str | tuple[str, list[SkillType] | None, bool]]):
-		""" Загружает данные ежедневных заданий. """
-		self.daily_tasks = [DailyTask(*task) for task in data['tasks']]
 		self.date = data['date']
+		self.day = date.fromisoformat(self.date).toordinal() if self.date else date.today().toordinal()
+
+		# Ближайшие повторения не сохраняются: они однозначно следуют из правила и даты текущего дня.
+		active, self.heap = [], []
+		for task in self.daily_tasks.values():
+			task.due = task.rule.next_due(self.day)
+			if task.due <= self.day:
+				active.append(task.id)
+			else:
+				self.heap.append((task.due, task.id))
+		heapify(self.heap)
 
-		self.all_complete()
+		self.active = to_mask(active)
+		self.completed = self.active & to_mask(task.id for task, done in tasks if done)
+		self.remaining = self.active.bit_count() - self.completed.bit_count()
 
-	def add_task(self, task: str, skills: list[SkillType] = None):
+		self.order = None
+		self.version += 1
+
+	def add_task(self, task: str, skills: list[SkillType] = None, rule: Recurrence = EVERY_DAY) -> DailyTask:
 		""" Добавляет ежедневную задачу в список активных. """
-		self.daily_tasks.append(DailyTask(task, skills or None))
-		self.done = False
+		return self.add_tasks([(task, skills, rule)])[0]
 
-	def delete_task(self, num: int) -> DailyTask:
-		""" Удаляет ежедневное задание по номеру. Если номер некорректный вызывает ошибку. """
-		if len(self.daily_tasks) > num:
-			return self.daily_tasks.pop(num)
-		raise ValueError(f"Daily task {num} not found")
+	def add_tasks(self, tasks: list[tuple[str, list[SkillType] | None] | tuple[str, list[SkillType] | None, Recurrence]]
+				  ) -> list[DailyTask]:
+		""" Добавляет несколько ежедневных задач в список активных. Версия увеличивается один раз. """
+		new_tasks = [
+			DailyTask(task, skills or None, identifier=self.next_id + i,
+					  rule=rule[0].anchored(self.day) if rule else EVERY_DAY)
+			for i, (task, skills, *rule) in enumerate(tasks)
+		]
+		if not new_tasks:
+			return []
+		self.next_id += len(new_tasks)
+
+		self.daily_tasks.update((task.id, task) for task in new_tasks)
+		if self.order is not None:
+			self.order.extend(task.id for task in new_tasks)
+		for task in new_tasks:
+			task.manager = self
+		self.schedule(new_tasks)
+
+		self.version += 1
+		return new_tasks
+
+	def delete_task(self, identifier: int) -> DailyTask:
+		""" Удаляет ежедневное задание по идентификатору. Если идентификатор некорректный вызывает ошибку. """
+		return self.delete_tasks([identifier])[0]
+
+	def delete_tasks(self, identifiers: list[int] | set[int]) -> list[DailyTask]:
+		""" Удаляет ежедневные задания по идентификаторам. Если идентификатор некорректный вызывает ошибку. """
+		if not identifiers:
+			return []
+
+		for identifier in identifiers:
+			if identifier not in self.daily_tasks:
+				raise ValueError(f"Daily task {identifier} not found")
+
+		deleted = [self.daily_tasks.pop(identifier) for identifier in identifiers]
+
+		mask = to_mask(identifiers)
+		self.remaining -= (self.active & ~self.completed & mask).bit_count()
+		self.active &= ~mask
+		self.completed &= ~mask
+		for task in deleted:
+			task.manager = None
+
+		self.order = None
+		self.version += 1
+		return deleted
 
 	def get_task(self, num: int) -> DailyTask:
 		""" Получение ежедневного задания по номеру. Если номер некорректный вызывает ошибку. """
-		if len(self.daily_tasks) > num:
-			return self.daily_tasks[num]
+		order = self.ids()
+		if len(order) > num:
+			return self.daily_tasks[order[num]]
 		raise ValueError(f"Daily task {num} not found")
 
+	def ids(self) -> list[int]:
+		""" Идентификаторы заданий в порядке отображения. """
+		if self.order is None:
+			self.order = list(self.daily_tasks)
+		return self.order
+
+	def complete(self, identifier: int):
+		""" Отмечает ежедневную задачу выполненной. """
+		self.complete_tasks([identifier])
+
+	def complete_tasks(self, identifiers: list[int] | set[int]):
+		"""
+		Отмечает ежедневные задачи выполненными. Задания, которые не нужно выполнять в текущий день, вызывают ошибку.
+		"""
+		if not identifiers:
+			return
+
+		for identifier in identifiers:
+			if not self.is_active(identifier):
+				raise ValueError(f"Daily task {identifier} not found or not due")
+
+		mask = to_mask(identifiers)
+		self.remaining -= (mask & ~self.completed).bit_count()
+		self.completed |= mask
+		self.version += 1
+
+	@property
+	def done(self) -> bool:
+		""" Выполнены ли все задания текущего дня. """
+		return self.remaining == 0
+
+	def is_active(self, identifier: int) -> bool:
+		""" Нужно ли выполнить задание в текущий день. """
+		return self.active >> identifier & 1 == 1
+
+	def is_done(self, identifier: int) -> bool:
+		""" Выполнено ли задание в текущий день. """
+		return self.completed >> identifier & 1 == 1
+
+	def not_completed(self) -> list[DailyTask]:
+		""" Невыполненные задания текущего дня. Перебираются только установленные биты. """
+		return [self.daily_tasks[identifier] for identifier in iter_bits(self.active & ~self.completed)]
+
+	def schedule(self, tasks: list[DailyTask]):
+		""" Назначает заданиям ближайшее повторение, начиная с текущего дня. """
+		due = []
+		for task in tasks:
+			task.due = task.rule.next_due(self.day)
+			if task.due <= self.day:
+				due.append(task.id)
+			else:
+				heappush(self.heap, (task.due, task.id))
+
+		self.active |= to_mask(due)
+		self.remaining += len(due)
+
+	def update(self, today: str) -> list[tuple[DailyTask, int]]:
+		"""
+		Начинает новый день. Просматриваются только задания текущего дня и задания из кучи, срок которых наступил.
+		Отметки о выполнении сбрасываются все сразу, объекты заданий не пересоздаются.
+
+		Возвращается:
+			list[tuple[DailyTask, int]]: Задания и количество их повторений, которые не были выполнены с прошлого дня.
+		"""
+		day = date.fromisoformat(today).toordinal()
+		missed, due = [], []
 
-	def complete(self, num: int):
-		""" Отмечает ежедневную задачу выполненной и проверяет выполнение всех заданий. """
-		self.get_task(num).done = True
-		self.all_complete()
+		# Задания прошлого дня: невыполненное повторение и повторения в пропущенные дни
+		for identifier in iter_bits(self.active):
+			task = self.daily_tasks[identifier]
+			count = (not self.is_done(identifier)) + task.rule.count(self.day + 1, day)
+			if count:
+				missed.append((task, count))
+			due.append(task)
 
-	def all_complete(self):
-		""" Если все задания выполнены, то отмечает это. """
-		self.done = all(task.done for task in self.daily_tasks)
+		# Задания, срок которых наступил в пропущенные дни или наступает сегодня
+		while self.heap and self.heap[0][0] <= day:
+			due_day, identifier = heappop(self.heap)
+			task = self.daily_tasks.get(identifier)
+			if task is None or task.due != due_day or self.is_active(identifier):
+				continue  # Задание удалено
 
-	def update(self, today: str) -> list[DailyTask]:
-		""" Начинает новый день. """
-		# Получение невыполненных заданий. Для выдачи наказаний.
-		not_complete_tasks = [task for task in self.daily_tasks if not task.done]
+			count = task.rule.count(due_day, day)
+			if count:
+				missed.append((task, count))
+			due.append(task)
 
-		# Сброс всех данных.
-		self.daily_tasks = [DailyTask(task.task, task.skills) for task in self.daily_tasks]
-		self.date = today
-		self.done = False
+		# Сброс и новые повторения
+		self.active, self.completed, self.remaining = 0, 0, 0
+		self.date, self.day = today, day
+		self.schedule(due)
+		self.version += 1
 
-		return not_complete_tasks
+		return missed
 
 	def __repr__(self):
 		""" Возвращает строковое представление объекта. """
-		return f"<DailyTaskManager daily_tasks={len(self.daily_tasks)} date={self.date} done={self.done}>"
+		return (f"<DailyTaskManager daily_tasks={len(self.daily_tasks)} active={self.active.bit_count()} "
+				f"remaining={self.remaining} date={self.date}>")
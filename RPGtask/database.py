@@ -1,18 +1,29 @@
 import json
+import os
+import pickle
+from contextlib import contextmanager
 from os import path
 from typing import Any
 
-import yaml
-
-from .player import SkillType
+from .config import JOURNAL_COMPACT_SIZE
+from .inventory import ItemType
+from .player import SkillType, RANK_BY_NAME
 
 # Пути до файлов с данными
 base_path = path.dirname(__file__)
 task_path = path.abspath(path.join(base_path, 'data/tasks.json'))
 hero_path = path.abspath(path.join(base_path, 'data/player.json'))
 inventory_path = path.abspath(path.join(base_path, 'data/inventory.json'))
+journal_path = path.abspath(path.join(base_path, 'data/journal.jsonl'))
+sqlite_path = path.abspath(path.join(base_path, 'data/rpgtask.db'))
 
 quest_path = path.abspath(path.join(base_path, 'content/quests.yaml'))
+quest_cache_path = path.abspath(path.join(base_path, 'content/quests.cache'))
+item_path = path.abspath(path.join(base_path, 'content/items.yaml'))
+item_cache_path = path.abspath(path.join(base_path, 'content/items.cache'))
+
+QUEST_CACHE_VERSION = 2  # Увеличивается при изменении формата скомпилированных квестов.
+ITEM_CACHE_VERSION = 1  # Увеличивается при изменении формата скомпилированных предметов.
 
 
 def all_save(tasks, hero_info, inventory):
@@ -22,10 +33,17 @@ def all_save(tasks, hero_info, inventory):
 	save_read_inventory(inventory)
 
 
+def dump(file_path: str, data):
+	""" Атомарная запись json файла. Файл заменяется целиком только после успешной записи. """
+	tmp_path = file_path + '.tmp'
+	with open(tmp_path, "w", encoding='utf-8') as file:
+		json.dump(data, file, ensure_ascii=False)
+	os.replace(tmp_path, file_path)
+
+
 def save_tasks(data):
 	""" Сохранение задач. """
-	with open(task_path, "w", encoding='utf-8') as file:
-		json.dump(data, file, ensure_ascii=False)
+	dump(task_path, data)
 
 
 def read_tasks() -> dict[str, list[tuple[str, list[SkillType] | None]] |
@@ -38,8 +56,7 @@ def read_tasks() -> dict[str, list[tuple[str, list[SkillType] | None]] |
 
 def save_hero_info(data):
 	""" Сохранение информации о золоте и навыках. """
-	with open(hero_path, "w", encoding='utf-8') as file:
-		json.dump(data, file, ensure_ascii=False)
+	dump(hero_path, data)
 
 
 def read_player_info() -> dict[str, float | list[list[int | float]]]:
@@ -50,8 +67,7 @@ def read_player_info() -> dict[str, float | list[list[int | float]]]:
 
 def save_read_inventory(data):
 	""" Сохранение инвентаря. """
-	with open(inventory_path, "w", encoding='utf-8') as file:
-		json.dump(data, file, ensure_ascii=False)
+	dump(inventory_path, data)
 
 
 def read_inventory():
@@ -60,6 +76,594 @@ def read_inventory():
 		return json.load(file)
 
 
+def compile_quest(quest_data: dict) -> dict:
+	"""
+	Проверяет описание квеста и приводит его к виду, в котором он хранится в кэше.
+
+	Аргументы:
+		quest_data (dict): Описание квеста из quests.yaml.
+	"""
+	for key in ('id', 'name', 'description', 'rank', 'in_guild', 'stages', 'rewards'):
+		if key not in quest_data:
+			raise ValueError(f"Quest {quest_data.get('id')!r} has no field {key!r}")
+	if quest_data['rank'] not in RANK_BY_NAME:
+		raise ValueError(f"Quest {quest_data['id']!r} has unknown rank {quest_data['rank']!r}")
+	if not quest_data['stages']:
+		raise ValueError(f"Quest {quest_data['id']!r} has no stages")
+
+	return {**quest_data, 'rank': int(RANK_BY_NAME[quest_data['rank']])}
+
+
+def compile_item(item_data: dict) -> dict:
+	"""
+	Проверяет описание предмета и приводит его к виду, в котором он хранится в кэше:
+	тип предмета и навыки в эффектах заменяются числами.
+
+	Аргументы:
+		item_data (dict): Описание предмета из items.yaml.
+	"""
+	for key in ('id', 'name', 'description', 'tier'):
+		if key not in item_data:
+			raise ValueError(f"Item {item_data.get('id')!r} has no field {key!r}")
+
+	def skill(name: str) -> int:
+		if name.upper() not in SkillType.__members__:
+			raise ValueError(f"Item {item_data['id']!r} has unknown skill {name!r}")
+		return int(SkillType[name.upper()])
+
+	item_type = item_data.get('type', 'item').upper()
+	if item_type not in ItemType.__members__:
+		raise ValueError(f"Item {item_data['id']!r} has unknown type {item_data['type']!r}")
+
+	effects = {}
+	for action, amount in item_data.get('effects', {}).items():
+		if action in ('quest', 'text'):
+			effects[action] = amount
+		elif action == 'textbook':
+			effects[action] = {skill(name): exp for name, exp in amount.items()}
+		else:
+			effects[skill(action)] = amount
+
+	return {
+		'id': item_data['id'],
+		'name': item_data['name'],
+		'description': item_data['description'],
+		'tier': item_data['tier'],
+		'type': int(ItemType[item_type]),
+		'stack': item_data.get('stack', 1),
+		'effects': effects,
+		'cost': item_data.get('cost', 0),
+		'sell': item_data.get('sell', 0),
+	}
+
+
+def read_cache(cache_path: str, version: int) -> dict | None:
+	""" Чтение скомпилированного контента. Возвращает None, если кэша нет или он в другом формате. """
+	try:
+		with open(cache_path, 'rb') as file:
+			cache = pickle.load(file)
+	except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+		return None
+
+	if not isinstance(cache, dict) or cache.get('version') != version:
+		return None
+	return cache
+
+
+def save_cache(cache_path: str, cache: dict):
+	""" Сохранение скомпилированного контента. Если папка недоступна для записи, то кэш не сохраняется. """
+	tmp_path = cache_path + '.tmp'
+	try:
+		with open(tmp_path, 'wb') as file:
+			pickle.dump(cache, file, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(tmp_path, cache_path)
+	except OSError:
+		pass
+
+
+def read_compiled(source_path: str, cache_path: str, version: int, compile_entry) -> list[dict]:
+	"""
+	Чтение yaml файла контента через кэш. Кэш используется, если файл не изменился: сначала сравнивается время
+	изменения и размер файла, а если они отличаются, то хэш содержимого. Иначе файл разбирается заново и кэш обновляется.
+
+	Аргументы:
+		source_path (str): Путь до yaml файла.
+		cache_path (str): Путь до кэша.
+		version (int): Версия формата скомпилированных записей.
+		compile_entry (Callable[[dict], dict]): Функция проверки и компиляции одной записи.
+	"""
+	stat = os.stat(source_path)
+	cache = read_cache(cache_path, version)
+
+	if cache is not None and cache['mtime'] == stat.st_mtime_ns and cache['size'] == stat.st_size:
+		return cache['entries']
+
+	# yaml нужен только при изменении контента, поэтому не замедляет обычный запуск
+	import hashlib
+	import yaml
+
+	with open(source_path, 'rb') as file:
+		raw = file.read()
+	digest = hashlib.sha256(raw).hexdigest()
+
+	if cache is None or cache['hash'] != digest:
+		loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+		cache = {
+			'version': version,
+			'hash': digest,
+			'entries': [compile_entry(entry) for entry in yaml.load(raw, Loader=loader) or []],
+		}
+
+	cache['mtime'], cache['size'] = stat.st_mtime_ns, stat.st_size
+	save_cache(cache_path, cache)
+
+	return cache['entries']
+
+
 def read_quest() -> list[dict]:
-	with open(quest_path, encoding='utf-8') as file:
-		return yaml.safe_load(file)
+	""" Чтение квестов из quests.yaml через кэш (см. read_compiled). """
+	return read_compiled(quest_path, quest_cache_path, QUEST_CACHE_VERSION, compile_quest)
+
+
+def read_items() -> list[dict]:
+	""" Чтение предметов из items.yaml через кэш (см. read_compiled). """
+	return read_compiled(item_path, item_cache_path, ITEM_CACHE_VERSION, compile_item)
+
+
+def number_tasks(tasks: list[list], id_index: int) -> list[list]:
+	"""
+	Выдаёт идентификаторы заданиям из старых сохранений так же, как это делают менеджеры заданий.
+
+	Аргументы:
+		tasks (list[list]): Сохранённые задания.
+		id_index (int): Позиция идентификатора в сохранённом задании.
+	"""
+	next_id = max((task[id_index] for task in tasks if len(task) > id_index and task[id_index] is not None),
+				  default=0) + 1
+
+	result = []
+	for task in tasks:
+		task = list(task) + [None] * (id_index + 1 - len(task))
+		if task[id_index] is None:
+			task[id_index] = next_id
+			next_id += 1
+		result.append(task)
+	return result
+
+
+def apply_record(tasks: dict, hero_info: dict, inventory: list, op: str, args: list):
+	"""
+	Применяет запись журнала к сохранённым данным.
+
+	Аргументы:
+		tasks (dict): Данные заданий. Пользовательские и ежедневные задания хранятся в словарях по идентификатору.
+		hero_info (dict): Данные игрока.
+		inventory (list): Данные инвентаря.
+		op (str): Тип изменения.
+		args (list): Аргументы изменения.
+	"""
+	if op == 'task_add':
+		identifier, task, skills = args
+		tasks['user_tasks'][identifier] = [task, skills, identifier]
+	elif op == 'task_delete':
+		tasks['user_tasks'].pop(args[0], None)
+	elif op == 'daily_add':
+		identifier, task, skills, *rule = args
+		tasks['daily_tasks']['tasks'][identifier] = [task, skills, False, identifier, rule[0] if rule else None]
+	elif op == 'daily_delete':
+		tasks['daily_tasks']['tasks'].pop(args[0], None)
+	elif op == 'daily_complete':
+		tasks['daily_tasks']['tasks'][args[0]][2] = True
+	elif op == 'daily_update':
+		tasks['daily_tasks']['date'] = args[0]
+		for task in tasks['daily_tasks']['tasks'].values():
+			task[2] = False
+	elif op == 'quests':
+		tasks['quests'] = args[0]
+	elif op == 'gold':
+		hero_info['money'] = args[0]
+	elif op == 'skill':
+		hero_info['skills'][args[0]] = args[1]
+	elif op == 'profile':
+		hero_info['profile'] = args[0]
+	elif op == 'slot':
+		inventory[args[0]] = args[1]
+	else:
+		raise ValueError(f"Unknown journal record {op!r}")
+
+
+class JsonStorage:
+	"""
+	Хранилище, которое при сохранении полностью перезаписывает файлы с данными.
+
+	Методы:
+		load(): Загружает все данные.
+		append(op, *args): Записывает изменение. Для этого хранилища ничего не делает.
+		transaction(): Объединяет несколько изменений в одну запись.
+		need_compact(): Нужно ли записать снимок данных.
+		is_synced(): Совпадают ли сохранённые файлы с загруженными данными.
+		save(tasks, hero_info, inventory): Сохраняет изменившиеся данные.
+	"""
+
+	def load(self) -> tuple[dict, dict, list]:
+		""" Загружает все данные. """
+		tasks = read_tasks()
+		tasks['user_tasks'] = number_tasks(tasks['user_tasks'], 2)
+		tasks['daily_tasks']['tasks'] = number_tasks(tasks['daily_tasks']['tasks'], 3)
+
+		return tasks, read_player_info(), read_inventory()
+
+	def append(self, op: str, *args):
+		""" Записывает изменение. Все данные сохраняются только в save(). """
+
+	@contextmanager
+	def transaction(self):
+		""" Объединяет несколько изменений в одну запись. """
+		yield
+
+	def need_compact(self) -> bool:
+		""" Нужно ли записать снимок данных. """
+		return False
+
+	def is_synced(self) -> bool:
+		""" Совпадают ли сохранённые файлы с загруженными данными. """
+		return True
+
+	def save(self, tasks: dict | None, hero_info: dict | None, inventory: list | None):
+		""" Сохраняет изменившиеся данные. Данные, переданные как None, не изменились и не перезаписываются. """
+		if tasks is not None:
+			save_tasks(tasks)
+		if hero_info is not None:
+			save_hero_info(hero_info)
+		if inventory is not None:
+			save_read_inventory(inventory)
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return "<JsonStorage>"
+
+
+class Journal(JsonStorage):
+	"""
+	Журнал изменений. Каждое изменение дописывается в конец файла журнала отдельной строкой,
+	а json файлы служат снимком данных, который периодически обновляется.
+
+	Параметры:
+		path (str): Путь до файла журнала.
+		compact_size (int): Количество записей, после которого нужно записать новый снимок.
+
+	Аргументы:
+		seq (int): Номер последней записи.
+		size (int): Количество записей в журнале после последнего снимка.
+
+	Методы:
+		load(): Загружает снимок и применяет к нему записи журнала.
+		append(op, *args): Дописывает изменение в журнал.
+		transaction(): Сбрасывает записи на диск один раз после группы изменений.
+		need_compact(): Нужно ли записать снимок данных.
+		is_synced(): Совпадает ли снимок с загруженными данными.
+		save(tasks, hero_info, inventory): Записывает снимок и очищает журнал.
+		close(): Закрывает файл журнала.
+	"""
+
+	def __init__(self, path: str = journal_path, compact_size: int = 500):
+		self.path = path
+		self.compact_size = compact_size
+
+		self.seq: int = 0
+		self.size: int = 0
+		self.file = None
+		self.batch: bool = False
+
+	def load(self) -> tuple[dict, dict, list]:
+		""" Загружает снимок и применяет к нему записи журнала. """
+		tasks, hero_info, inventory = super().load()
+		self.seq = tasks.get('seq', 0)
+		self.size = 0
+
+		if not os.path.exists(self.path):
+			return tasks, hero_info, inventory
+
+		user_tasks = {task[2]: task for task in tasks['user_tasks']}
+		daily_tasks = {task[3]: task for task in tasks['daily_tasks']['tasks']}
+		tasks['user_tasks'], tasks['daily_tasks']['tasks'] = user_tasks, daily_tasks
+
+		valid_end = 0
+		with open(self.path, 'rb') as file:
+			for line in file:
+				# Последняя запись могла оборваться при аварийном завершении.
+				if not line.endswith(b'\n'):
+					break
+				try:
+					seq, op, *args = json.loads(line)
+				except ValueError:
+					break
+
+				valid_end += len(line)
+				if seq <= self.seq:  # Запись уже есть в снимке
+					continue
+
+				apply_record(tasks, hero_info, inventory, op, args)
+				self.seq = seq
+				self.size += 1
+
+		tasks['user_tasks'] = list(user_tasks.values())
+		tasks['daily_tasks']['tasks'] = list(daily_tasks.values())
+
+		if valid_end != os.path.getsize(self.path):
+			with open(self.path, 'r+b') as file:
+				file.truncate(valid_end)
+
+		return tasks, hero_info, inventory
+
+	def append(self, op: str, *args):
+		""" Дописывает изменение в журнал. """
+		if self.file is None:
+			self.file = open(self.path, 'a', encoding='utf-8')
+
+		self.seq += 1
+		self.file.write(json.dumps([self.seq, op, *args], ensure_ascii=False) + '\n')
+		if not self.batch:
+			self.file.flush()
+		self.size += 1
+
+	@contextmanager
+	def transaction(self):
+		""" Сбрасывает записи на диск один раз после группы изменений. """
+		if self.batch:
+			yield
+			return
+
+		self.batch = True
+		try:
+			yield
+		finally:
+			self.batch = False
+			if self.file is not None:
+				self.file.flush()
+
+	def need_compact(self) -> bool:
+		""" Нужно ли записать снимок данных. """
+		return self.size >= self.compact_size
+
+	def is_synced(self) -> bool:
+		""" Совпадает ли снимок с загруженными данными, то есть пуст ли журнал. """
+		return not self.size
+
+	def save(self, tasks: dict | None, hero_info: dict | None, inventory: list | None):
+		"""
+		Записывает снимок изменившихся данных и очищает журнал.
+
+		Если задания не изменились, то в журнале нет записей о них, а остальные записи
+		хранят итоговые значения и могут быть применены повторно.
+		"""
+		# Задания сохраняются последними, так как в них хранится номер последней записи снимка.
+		if hero_info is not None:
+			save_hero_info(hero_info)
+		if inventory is not None:
+			save_read_inventory(inventory)
+		if tasks is not None:
+			tasks['seq'] = self.seq
+			save_tasks(tasks)
+
+		self.close()
+		open(self.path, 'w').close()
+		self.size = 0
+
+	def close(self):
+		""" Закрывает файл журнала. """
+		if self.file is not None:
+			self.file.close()
+			self.file = None
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return f"<Journal seq={self.seq} size={self.size}>"
+
+
+class SqliteStorage(JsonStorage):
+	"""
+	Хранилище в базе данных SQLite. Каждое изменение записывается отдельной строкой таблицы в своей транзакции,
+	поэтому сохранение при выходе ничего не перезаписывает.
+
+	Параметры:
+		path (str): Путь до файла базы данных.
+
+	Аргументы:
+		connection (sqlite3.Connection): Соединение с базой данных.
+		batch (bool): True, если изменения объединяются в одну транзакцию.
+
+	Методы:
+		load(): Загружает все данные.
+		append(op, *args): Записывает изменение в базу данных.
+		transaction(): Объединяет несколько изменений в одну транзакцию.
+		save(tasks, hero_info, inventory): Фиксирует незавершённую транзакцию.
+		write_all(tasks, hero_info, inventory): Полностью перезаписывает базу данных.
+		close(): Закрывает соединение.
+	"""
+
+	schema = """
+		CREATE TABLE IF NOT EXISTS user_tasks (id INTEGER PRIMARY KEY, task TEXT NOT NULL, skills TEXT);
+		CREATE TABLE IF NOT EXISTS daily_tasks (
+			id INTEGER PRIMARY KEY, task TEXT NOT NULL, skills TEXT, done INTEGER NOT NULL DEFAULT 0, rule TEXT
+		);
+		CREATE TABLE IF NOT EXISTS skills (skill INTEGER PRIMARY KEY, level INTEGER NOT NULL, exp REAL NOT NULL);
+		CREATE TABLE IF NOT EXISTS slots (slot INTEGER PRIMARY KEY, item TEXT NOT NULL, amount INTEGER NOT NULL);
+		CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+	"""
+
+	def __init__(self, path: str = sqlite_path):
+		import sqlite3  # Нужен только в режиме 'sqlite'
+
+		self.path = path
+		self.connection = sqlite3.connect(path)
+		self.connection.executescript(self.schema)
+		self.batch = False
+
+		# В базах, созданных до появления правил повторения, нет столбца rule
+		columns = {row[1] for row in self.connection.execute('PRAGMA table_info(daily_tasks)')}
+		if 'rule' not in columns:
+			self.connection.execute('ALTER TABLE daily_tasks ADD COLUMN rule TEXT')
+			self.connection.commit()
+
+	def load(self) -> tuple[dict, dict, list]:
+		""" Загружает все данные. """
+		cursor = self.connection.cursor()
+		meta = {key: json.loads(value) for key, value in cursor.execute('SELECT key, value FROM meta')}
+
+		user_tasks = [[task, json.loads(skills), identifier] for identifier, task, skills in
+					  cursor.execute('SELECT id, task, skills FROM user_tasks ORDER BY id')]
+		daily_tasks = [[task, json.loads(skills), bool(done), identifier, json.loads(rule or 'null')]
+					   for identifier, task, skills, done, rule in
+					   cursor.execute('SELECT id, task, skills, done, rule FROM daily_tasks ORDER BY id')]
+		tasks = {
+			'user_tasks': user_tasks,
+			'daily_tasks': {'tasks': daily_tasks, 'date': meta['date']},
+			'quests': meta['quests'],
+		}
+
+		skills = [[level, exp] for level, exp in cursor.execute('SELECT level, exp FROM skills ORDER BY skill')]
+		hero_info = {'money': meta['money'], 'skills': skills, 'profile': meta['profile']}
+
+		inventory = [None] * meta['inventory_size']
+		for slot, item, amount in cursor.execute('SELECT slot, item, amount FROM slots'):
+			inventory[slot] = [item, amount]
+
+		return tasks, hero_info, inventory
+
+	def append(self, op: str, *args):
+		""" Записывает изменение в базу данных. """
+		execute = self.connection.execute
+
+		if op == 'task_add':
+			execute('INSERT INTO user_tasks (id, task, skills) VALUES (?, ?, ?)', (args[0], args[1], json.dumps(args[2])))
+		elif op == 'task_delete':
+			execute('DELETE FROM user_tasks WHERE id = ?', args)
+		elif op == 'daily_add':
+			rule = json.dumps(args[3]) if len(args) > 3 and args[3] is not None else None
+			execute('INSERT INTO daily_tasks (id, task, skills, rule) VALUES (?, ?, ?, ?)',
+					(args[0], args[1], json.dumps(args[2]), rule))
+		elif op == 'daily_delete':
+			execute('DELETE FROM daily_tasks WHERE id = ?', args)
+		elif op == 'daily_complete':
+			execute('UPDATE daily_tasks SET done = 1 WHERE id = ?', args)
+		elif op == 'daily_update':
+			execute('UPDATE daily_tasks SET done = 0 WHERE done = 1')
+			self.set_meta('date', args[0])
+		elif op == 'quests':
+			self.set_meta('quests', args[0])
+		elif op == 'gold':
+			self.set_meta('money', args[0])
+		elif op == 'profile':
+			self.set_meta('profile', args[0])
+		elif op == 'skill':
+			execute('INSERT OR REPLACE INTO skills (skill, level, exp) VALUES (?, ?, ?)', (args[0], *args[1]))
+		elif op == 'slot':
+			if args[1] is None:
+				execute('DELETE FROM slots WHERE slot = ?', (args[0],))
+			else:
+				execute('INSERT OR REPLACE INTO slots (slot, item, amount) VALUES (?, ?, ?)', (args[0], *args[1]))
+		else:
+			raise ValueError(f"Unknown storage record {op!r}")
+
+		if not self.batch:
+			self.connection.commit()
+
+	def set_meta(self, key: str, value):
+		""" Записывает значение в таблицу meta. """
+		self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+								(key, json.dumps(value, ensure_ascii=False)))
+
+	@contextmanager
+	def transaction(self):
+		""" Объединяет несколько изменений в одну транзакцию. """
+		if self.batch:
+			yield
+			return
+
+		self.batch = True
+		try:
+			yield
+		except BaseException:
+			self.connection.rollback()
+			raise
+		else:
+			self.connection.commit()
+		finally:
+			self.batch = False
+
+	def save(self, tasks: dict | None, hero_info: dict | None, inventory: list | None):
+		""" Все изменения уже записаны построчно, поэтому только фиксирует незавершённую транзакцию. """
+		self.connection.commit()
+
+	def write_all(self, tasks: dict, hero_info: dict, inventory: list):
+		""" Полностью перезаписывает базу данных. """
+		with self.transaction():
+			execute, executemany = self.connection.execute, self.connection.executemany
+
+			for table in ('user_tasks', 'daily_tasks', 'skills', 'slots', 'meta'):
+				execute(f'DELETE FROM {table}')
+
+			executemany('INSERT INTO user_tasks (id, task, skills) VALUES (?, ?, ?)',
+						((identifier, task, json.dumps(skills)) for task, skills, identifier in tasks['user_tasks']))
+			executemany('INSERT INTO daily_tasks (id, task, skills, done, rule) VALUES (?, ?, ?, ?, ?)',
+						((identifier, task, json.dumps(skills), done, json.dumps(rule[0]) if rule and rule[0] else None)
+						 for task, skills, done, identifier, *rule in tasks['daily_tasks']['tasks']))
+			executemany('INSERT INTO skills (skill, level, exp) VALUES (?, ?, ?)',
+						((num, *skill) for num, skill in enumerate(hero_info['skills'])))
+			executemany('INSERT INTO slots (slot, item, amount) VALUES (?, ?, ?)',
+						((num, *slot) for num, slot in enumerate(inventory) if slot is not None))
+
+			self.set_meta('date', tasks['daily_tasks']['date'])
+			self.set_meta('quests', tasks['quests'])
+			self.set_meta('money', hero_info['money'])
+			self.set_meta('profile', hero_info['profile'])
+			self.set_meta('inventory_size', len(inventory))
+
+	def is_empty(self) -> bool:
+		""" True если в базе данных ещё нет сохранения. """
+		return self.connection.execute("SELECT 1 FROM meta WHERE key = 'money'").fetchone() is None
+
+	def close(self):
+		""" Закрывает соединение. """
+		self.connection.close()
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return f"<SqliteStorage path={self.path!r}>"
+
+
+def migrate_json_to_sqlite(db_path: str = sqlite_path) -> SqliteStorage:
+	"""
+	Переносит данные из json файлов (вместе с журналом изменений) в базу данных SQLite.
+
+	Аргументы:
+		db_path (str): Путь до файла базы данных.
+	"""
+	journal = Journal()
+	data = journal.load()
+
+	storage = SqliteStorage(db_path)
+	storage.write_all(*data)
+	return storage
+
+
+def open_storage(mode: str) -> JsonStorage:
+	"""
+	Создаёт хранилище данных.
+
+	Аргументы:
+		mode (str): Режим хранения. 'json' - полная перезапись файлов, 'journal' - журнал изменений,
+			'sqlite' - база данных SQLite. При первом запуске в режиме 'sqlite' данные переносятся из json файлов.
+	"""
+	if mode == 'json':
+		return JsonStorage()
+	elif mode == 'journal':
+		return Journal(compact_size=JOURNAL_COMPACT_SIZE)
+	elif mode == 'sqlite':
+		storage = SqliteStorage()
+		if storage.is_empty():
+			storage.close()
+			storage = migrate_json_to_sqlite()
+		return storage
+	raise ValueError(f"Unknown storage mode {mode!r}")
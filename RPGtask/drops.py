@@ -0,0 +1,155 @@
+from random import Random
+
+from .config import PROBABILITY_ITEM_FALL_OUT, PROBABILITY_ITEM_FALL_OUT_DAILY_TASK, PROBABILITY_DROP_ITEM_CERTAIN_LEVEL
+from .inventory import Item
+from .registry import registry
+
+LEVELS = ('one', 'two', 'three')
+
+
+class AliasTable:
+	"""
+	Таблица Уолкера. Позволяет выбирать исход с заданными вероятностями за O(1).
+
+	Параметры:
+		weights (list[float]): Веса исходов.
+
+	Аргументы:
+		prob (list[float]): Вероятность остаться в выбранной ячейке.
+		alias (list[int]): Исход, на который заменяется ячейка.
+
+	Методы:
+		sample(rnd): Выбирает один исход.
+		sample_many(rnd, count): Выбирает несколько исходов.
+	"""
+
+	def __init__(self, weights: list[float]):
+		count = len(weights)
+		total = sum(weights)
+		scaled = [weight * count / total for weight in weights]
+
+		self.prob: list[float] = [1.0] * count
+		self.alias: list[int] = list(range(count))
+
+		small = [i for i, weight in enumerate(scaled) if weight < 1]
+		large = [i for i, weight in enumerate(scaled) if weight >= 1]
+
+		while small and large:
+			less, more = small.pop(), large.pop()
+
+			self.prob[less] = scaled[less]
+			self.alias[less] = more
+
+			scaled[more] -= 1 - scaled[less]
+			(small if scaled[more] < 1 else large).append(more)
+
+	def sample(self, rnd: Random) -> int:
+		""" Выбирает один исход. """
+		i = int(rnd.random() * len(self.prob))
+		return i if rnd.random() < self.prob[i] else self.alias[i]
+
+	def sample_many(self, rnd: Random, count: int) -> list[int]:
+		""" Выбирает несколько исходов. """
+		return [self.sample(rnd) for _ in range(count)]
+
+	def __len__(self):
+		""" Количество исходов. """
+		return len(self.prob)
+
+
+class DropSampler:
+	"""
+	Выбор выпадающих предметов. Для каждого источника наград строится таблица Уолкера, в которой нулевой исход —
+	«предмет не выпал», а остальные — предметы из реестра предметов с вероятностью
+	вероятность выпадения * вероятность уровня / количество предметов уровня.
+
+	Заранее заданы источники 'user' и 'daily' с одной таблицей для всех рангов. Другие источники и отдельные таблицы
+	для рангов задаются через add_source.
+
+	Аргументы:
+		codes (list[int]): Индексы предметов в реестре в порядке исходов таблиц (исход i соответствует codes[i - 1]).
+		sources (dict): Параметры источников наград: вероятность выпадения и вероятности уровней.
+		tables (dict[tuple[str, int | None], AliasTable]): Построенные таблицы по источнику и рангу.
+
+	Методы:
+		add_source(source, fall_out, levels, rank): Задаёт вероятности для источника наград.
+		rebuild(): Перестраивает таблицы по текущему каталогу предметов.
+		table(source, rank): Возвращает таблицу источника.
+		item(outcome): Возвращает предмет, соответствующий исходу таблицы.
+		sample(rnd, source, rank): Выбирает выпавший предмет или None.
+		sample_many(rnd, count, source, rank): Выбирает выпавшие предметы для нескольких наград.
+	"""
+
+	def __init__(self):
+		self.codes: list[int] = []
+		self.sources: dict[tuple[str, int | None], tuple[float, list[float]]] = {}
+		self.tables: dict[tuple[str, int | None], AliasTable] = {}
+		self.signature: int = 0
+
+		self.add_source('user', PROBABILITY_ITEM_FALL_OUT[1], PROBABILITY_DROP_ITEM_CERTAIN_LEVEL)
+		self.add_source('daily', PROBABILITY_ITEM_FALL_OUT_DAILY_TASK[1], PROBABILITY_DROP_ITEM_CERTAIN_LEVEL)
+
+	def add_source(self, source: str, fall_out: float, levels: list[float], rank: int | None = None):
+		"""
+		Задаёт вероятности для источника наград.
+
+		Аргументы:
+			source (str): Название источника наград, например 'user', 'daily' или 'quest'.
+			fall_out (float): Вероятность выпадения предмета.
+			levels (list[float]): Вероятности выпадения предмета определённого уровня. [первый, второй, третий].
+			rank (int | None): Ранг, для которого действуют вероятности. None - для всех рангов.
+		"""
+		self.sources[(source, rank)] = (fall_out, levels)
+		self.tables.pop((source, rank), None)
+
+	def rebuild(self):
+		""" Перестраивает таблицы по текущему каталогу предметов. """
+		self.codes = [code for level in LEVELS for code in range(*registry.bounds.get(level, (0, 0)))]
+		self.signature = self.catalog_signature()
+		self.tables = {}
+
+	@staticmethod
+	def catalog_signature() -> int:
+		""" Версия реестра предметов, по которой определяется изменение каталога. """
+		if not registry.built:
+			registry.build()
+		return registry.version
+
+	def table(self, source: str, rank: int | None = None) -> AliasTable:
+		""" Возвращает таблицу источника. Если для ранга нет отдельных вероятностей, то берутся общие. """
+		if self.signature != self.catalog_signature():
+			self.rebuild()
+
+		key = (source, rank) if (source, rank) in self.sources else (source, None)
+		table = self.tables.get(key)
+
+		if table is None:
+			fall_out, levels = self.sources[key]
+
+			weights = [1 - fall_out]
+			for level, probability in zip(LEVELS, levels):
+				start, end = registry.bounds.get(level, (0, 0))
+				size = end - start
+				if size:
+					weights.extend([fall_out * probability / size] * size)
+
+			table = self.tables[key] = AliasTable(weights)
+		return table
+
+	def item(self, outcome: int) -> Item:
+		""" Возвращает предмет, соответствующий ненулевому исходу таблицы. """
+		return registry.get(self.codes[outcome - 1])
+
+	def sample(self, rnd: Random, source: str, rank: int | None = None) -> Item | None:
+		""" Выбирает выпавший предмет или None, если предмет не выпал. """
+		outcome = self.table(source, rank).sample(rnd)
+		return self.item(outcome) if outcome else None
+
+	def sample_many(self, rnd: Random, count: int, source: str, rank: int | None = None) -> list[Item]:
+		""" Выбирает выпавшие предметы для нескольких наград. """
+		outcomes = self.table(source, rank).sample_many(rnd, count)
+		return [self.item(outcome) for outcome in outcomes if outcome]
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return f"<DropSampler items={len(self.codes)} sources={len(self.sources)}>"
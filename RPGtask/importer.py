@@ -0,0 +1,226 @@
+import re
+import sys
+from collections.abc import Iterable, Iterator
+
+from .config import MAX_TASK_SKILLS
+from .daily_tasks import DailyTaskManager
+from .database import JsonStorage
+from .player import SkillType
+from .recurrence import Recurrence, EVERY_DAY
+from .tasks import TaskManager
+from .utils import skill_check
+
+# Лексемы строки задания: группа навыков в квадратных скобках, незакрытая скобка или слово.
+# Пробелы между лексемами пропускаются, поэтому строка разбирается за один проход.
+TASK_TOKEN = re.compile(r'\[(?P<skills>[^]]*)]|(?P<open>\[)|(?P<word>[^\s\[]+)')
+DAILY_FLAGS = frozenset(('-e', '--every_day'))
+RULE_PREFIXES = ('-e:', '--every_day=')
+
+
+class ParsedTask:
+	"""
+	Разобранная строка задания.
+
+	Атрибуты:
+		task (str): Название задания.
+		skills (list[SkillType]): Распознанные навыки без повторов, не больше MAX_TASK_SKILLS.
+		daily (bool): Ежедневное ли задание.
+		rule (Recurrence): Правило повторения ежедневного задания.
+		unknown (list[str]): Названия навыков, которые не удалось распознать.
+		error (str | None): Причина, по которой задание нельзя добавить.
+	"""
+
+	def __init__(self, task: str, skills: list[SkillType], daily: bool, unknown: list[str], error: str | None = None,
+				 rule: Recurrence = EVERY_DAY):
+		self.task = task
+		self.skills = skills
+		self.daily = daily
+		self.rule = rule
+		self.unknown = unknown
+		self.error = error
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return f"<ParsedTask name={self.task!r} skills={len(self.skills)} daily={self.daily} error={self.error!r}>"
+
+
+def parse_task_line(line: str) -> ParsedTask:
+	"""
+	Разбирает строку задания формата "задание [навык, навык, навык] -e".
+	Флаг -e (или --every_day) делает задание ежедневным. Правило повторения указывается после двоеточия:
+	-e:будни, -e:3д, -e:пн,ср,пт, -e:15м (см. Recurrence.parse). Навыки распознаются с учётом опечаток (см. skill_check).
+
+	Аргументы:
+		line (str): Строка задания.
+	"""
+	words, skills, unknown = [], {}, []
+	daily, rule, error = False, EVERY_DAY, None
+
+	for match in TASK_TOKEN.finditer(line):
+		word = match['word']
+		if word is not None:
+			if word in DAILY_FLAGS:
+				daily = True
+			elif word.startswith(RULE_PREFIXES):
+				daily, rule = True, Recurrence.parse(word.split(':' if word.startswith('-e:') else '=', 1)[1])
+				if rule is None:
+					error = f'неизвестное правило повторения {word!r}'
+					break
+			else:
+				words.append(word)
+		elif match['open'] is not None:
+			error = 'не закрыта скобка навыков'
+			break
+		else:
+			for name in match['skills'].split(','):
+				name = name.strip()
+				if not name:
+					continue
+				skill = skill_check(name)
+				if skill is None:
+					unknown.append(name)
+				else:
+					skills[skill] = None
+
+	if error is None and not words:
+		error = 'пустое название задания'
+	return ParsedTask(' '.join(words), list(skills)[:MAX_TASK_SKILLS], daily, unknown, error, rule)
+
+
+def read_lines(file_path: str) -> Iterator[str]:
+	"""
+	Построчно читает файл с заданиями, не загружая его целиком.
+
+	Аргументы:
+		file_path (str): Путь до файла или '-' для стандартного ввода.
+	"""
+	if file_path == '-':
+		for line in sys.stdin:
+			yield line.rstrip('\r\n')
+		return
+
+	with open(file_path, 'r', encoding='utf-8-sig') as file:
+		for line in file:
+			yield line.rstrip('\r\n')
+
+
+class ImportReport:
+	"""
+	Итог импорта заданий.
+
+	Атрибуты:
+		lines (int): Количество прочитанных строк.
+		tasks (int): Количество добавленных обычных заданий.
+		daily_tasks (int): Количество добавленных ежедневных заданий.
+		errors (list[tuple[int, str]]): Номер строки и причина, по которой она пропущена.
+		warnings (list[tuple[int, str]]): Номер строки и замечание к добавленному заданию.
+
+	Методы:
+		format(limit) -> str: Текстовый отчёт.
+	"""
+
+	def __init__(self):
+		self.lines: int = 0
+		self.tasks: int = 0
+		self.daily_tasks: int = 0
+		self.errors: list[tuple[int, str]] = []
+		self.warnings: list[tuple[int, str]] = []
+
+	def format(self, limit: int = 20) -> str:
+		"""
+		Текстовый отчёт: количество добавленных заданий и первые ошибки и замечания.
+
+		Аргументы:
+			limit (int): Сколько ошибок и замечаний показать.
+		"""
+		lines = [
+			f'Прочитано строк: {self.lines}. Добавлено заданий: {self.tasks}, ежедневных: {self.daily_tasks}. '
+			f'Пропущено: {len(self.errors)}.'
+		]
+		for title, problems in (('Ошибки', self.errors), ('Замечания', self.warnings)):
+			if problems:
+				lines.append(f'{title}:')
+				lines.extend(f'  строка {line_no}: {message}' for line_no, message in problems[:limit])
+				if len(problems) > limit:
+					lines.append(f'  ... и ещё {len(problems) - limit}')
+		return '\n'.join(lines)
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return (f"<ImportReport lines={self.lines} tasks={self.tasks} daily_tasks={self.daily_tasks} "
+				f"errors={len(self.errors)}>")
+
+
+class TaskImporter:
+	"""
+	Потоковый импорт заданий. Строки разбираются порциями, и каждая порция добавляется в менеджеры заданий
+	и записывается в хранилище за один раз.
+
+	Пустые строки и строки, начинающиеся с #, пропускаются.
+
+	Параметры:
+		task_manager (TaskManager): Менеджер обычных заданий.
+		daily_tasks_manager (DailyTaskManager): Менеджер ежедневных заданий.
+		storage (JsonStorage | None): Хранилище, в которое записываются добавленные задания.
+		chunk_size (int): Количество строк в порции.
+
+	Методы:
+		import_lines(lines) -> ImportReport: Импортирует задания из строк.
+		import_file(file_path) -> ImportReport: Импортирует задания из файла или стандартного ввода.
+	"""
+
+	def __init__(self, task_manager: TaskManager, daily_tasks_manager: DailyTaskManager,
+				 storage: JsonStorage | None = None, chunk_size: int = 10000):
+		self.task_manager = task_manager
+		self.daily_tasks_manager = daily_tasks_manager
+		self.storage = storage
+		self.chunk_size = chunk_size
+
+	def import_lines(self, lines: Iterable[str]) -> ImportReport:
+		""" Импортирует задания из строк. """
+		report = ImportReport()
+		tasks, daily_tasks = [], []
+
+		for line_no, line in enumerate(lines, 1):
+			report.lines = line_no
+			stripped = line.strip()
+			if not stripped or stripped.startswith('#'):
+				continue
+
+			parsed = parse_task_line(stripped)
+			if parsed.error is not None:
+				report.errors.append((line_no, parsed.error))
+				continue
+			if parsed.unknown:
+				report.warnings.append((line_no, f'неизвестные навыки: {", ".join(parsed.unknown)}'))
+
+			if parsed.daily:
+				daily_tasks.append((parsed.task, parsed.skills, parsed.rule))
+			else:
+				tasks.append((parsed.task, parsed.skills))
+			if len(tasks) + len(daily_tasks) >= self.chunk_size:
+				self.flush(tasks, daily_tasks, report)
+				tasks, daily_tasks = [], []
+
+		self.flush(tasks, daily_tasks, report)
+		return report
+
+	def import_file(self, file_path: str) -> ImportReport:
+		""" Импортирует задания из файла или стандартного ввода ('-'). """
+		return self.import_lines(read_lines(file_path))
+
+	def flush(self, tasks: list[tuple[str, list[SkillType]]],
+			  daily_tasks: list[tuple[str, list[SkillType], Recurrence]], report: ImportReport):
+		""" Добавляет порцию заданий и записывает её в хранилище. """
+		new_tasks = self.task_manager.add_tasks(tasks)
+		new_daily_tasks = self.daily_tasks_manager.add_tasks(daily_tasks)
+		report.tasks += len(new_tasks)
+		report.daily_tasks += len(new_daily_tasks)
+
+		if self.storage is None:
+			return
+		with self.storage.transaction():
+			for task in new_tasks:
+				self.storage.append('task_add', task.id, task.task, task.skills)
+			for task in new_daily_tasks:
+				self.storage.append('daily_add', task.id, task.task, task.skills, task.rule.save())
@@ -1,36 +1,23 @@
-import itertools
-import random
 import re
 import sys
-from datetime import date
 
-from .awards import AwardsManager
-from .config import NUMBER_QUEST_STORE, NUMBER_ITEM_STORE
+from .config import NUMBER_QUEST_STORE, NUMBER_ITEM_STORE, AUTOSAVE
 from .console import AppConsole
-from .content import all_items, guild_welcome_text_1, guild_welcome_text_2
-from .daily_tasks import DailyTaskManager
-from .database import all_save, read_tasks, read_player_info, read_inventory, read_quest
-from .inventory import Inventory, ItemType
-from .player import Player, SKILL_DESCRIPTIONS, RankType
-from .quests import QuestManager
-from .tasks import TaskManager
-from .utils import skill_check, get_item, create_quest_item
+from .content import guild_welcome_text_1, guild_welcome_text_2
+from .importer import TaskImporter, parse_task_line
+from .inventory import ItemType
+from .loadout import LoadoutOptimizer
+from .player import SKILL_DESCRIPTIONS, RankType, SkillType
+from .session import Session
+from .utils import skill_check, get_item, item_sort_key, calculate_item_bonus
 
 
-class Interface:
+class Interface(Session):
 	"""
-	Основной класс приложения.
+	Основной класс приложения. Данные и операции над ними описаны в Session.
 
 	Аргументы:
 		console (AppConsole): Отвечает за весь вывод на экран.
-		awards_manager (AwardsManager): Отвечает за выдачу наград и наказаний.
-
-		player (Player): В этом классе хранится вся информация о деньгах и навыках.
-		inventory (Inventory): Через этот класс будет происходить вся работа с инвентарём.
-
-		task_manager (TaskManager): Отвечает за работу с пользовательскими заданиями.
-		daily_tasks_manager (DailyTaskManager): Отвечает за работу с ежедневными заданиями.
-		quest_manager (QuestManager): Отвечает за работу с квестами.
 
 	Методы:
 		main(): Основной цикл приложения.
@@ -38,26 +25,20 @@ class Interface:
 
 		view_tasks(): Функция просмотра задания.
 		add_tasks(): Функция добавления пользовательских заданий.
+		import_tasks(file_path): Импорт заданий из файла.
 		mark_completion_tasks(): Функция отметки выполнения задач.
 		delete_tasks(): Функция удаления заданий.
 		guild(): Функция гильдии.
 		skill_shop(): Функция прокачки навыков.
 		view_inventory(): Просмотр инвентаря.
+		best_gear(): Подбор лучшего снаряжения для выбранных навыков.
 
-		update(): Загрузка и обновление данных.
-		save(): Сохранение данных.
+		update(): Загрузка и обновление данных. Показывает наказание за невыполненные ежедневные задания.
 	"""
 
 	def __init__(self):
 		self.console = AppConsole(self)
-		self.awards_manager = AwardsManager(self)
-
-		self.player = Player()
-		self.inventory = Inventory()
-
-		self.task_manager = TaskManager()
-		self.daily_tasks_manager = DailyTaskManager()
-		self.quest_manager = QuestManager()
+		super().__init__()
 
 		# self.main_menu()
 		self.update()
@@ -68,6 +49,9 @@ class Interface:
 		while True:
 			try:
 				self.main_menu()
+
+				if AUTOSAVE or self.storage.need_compact():
+					self.save()
 			except Exception as e:
 				self.console.log.exception(e)
 				try:
@@ -121,31 +105,43 @@ class Interface:
 		"""
 		Функция добавления пользовательских заданий.
 
-		Формат добавления заданий - "task1 [навык, навык, навык] -e --every_day"
+		Формат добавления заданий - "task1 [навык, навык, навык] -e --every_day". Правило повторения ежедневного
+		задания указывается после двоеточия: "-e:будни", "-e:3д", "-e:пн,ср", "-e:15м".
+		Строка вида "@путь/до/файла" импортирует задания из файла, по одному в строке.
 		"""
 		skills_name = SKILL_DESCRIPTIONS.values()
 		self.console.title(f'Добавление заданий, чтобы выйти нажмите enter\n[dim]{", ".join(skills_name)}[/dim]\n')
 
 		while (line := self.console.input('[b cyan]Введите задание: [/bold cyan]')) != '':
-			# Разделение задания на компоненты #
-			task = re.sub(r'\[.*?]', '', line).rstrip()
-			skills = re.findall(r'\[([^]]*)]', line)
+			if line.startswith('@'):
+				self.import_tasks(line[1:].strip())
+				continue
 
-			# Определение навыков #
-			skills_result = []
-			if skills and skills[0] != '':
-				skills = [i.strip() for i in skills[0].split(',')]
-				skills_result = set([result for i in skills if (result := skill_check(i)) is not None])
-				skills_result = list(skills_result)[:3]
+			parsed = parse_task_line(line)
+			if parsed.error is not None:
+				self.console.print(f'[red]Задание не добавлено: {parsed.error}')
+				continue
+			if parsed.unknown:
+				self.console.print(f'[yellow]Неизвестные навыки: {", ".join(parsed.unknown)}')
 
 			# Добавление задачи в список #
-			task_split = task.split()
-			check_arg = [t for t in task_split if t != '-e']
-
-			if len(task_split) > len(check_arg):
-				self.daily_tasks_manager.add_task(' '.join(check_arg), skills_result)
+			if parsed.daily:
+				new_task = self.daily_tasks_manager.add_task(parsed.task, parsed.skills, parsed.rule)
+				self.record('daily_add', new_task.id, new_task.task, new_task.skills, new_task.rule.save())
 			else:
-				self.task_manager.add_task(task, skills_result)
+				new_task = self.task_manager.add_task(parsed.task, parsed.skills)
+				self.record('task_add', new_task.id, new_task.task, new_task.skills)
+
+	def import_tasks(self, file_path: str):
+		""" Импорт заданий из файла. """
+		importer = TaskImporter(self.task_manager, self.daily_tasks_manager, self.storage)
+		try:
+			report = importer.import_file(file_path)
+		except OSError as e:
+			self.console.print(f'[red]Не удалось прочитать файл: {e}')
+			return
+
+		self.console.print(report.format())
 
 	def mark_completion_tasks(self):
 		self.console.title('Отметить выполнение заданий, чтобы выйти нажмите enter')
@@ -159,102 +155,37 @@ class Interface:
 
 		self.console.title('Награды, чтобы выйти нажмите enter')
 
-		nums_user_tasks, nums_daily_tasks, nums_quests = [], [], []
-		for num in nums:
-			if num < user_tasks_count:
-				task = self.task_manager.get_task(num)
-				nums_user_tasks.append(num)
-
-			elif num < daily_tasks_count:
-				num = num - user_tasks_count
-
-				if self.daily_tasks_manager.done or self.daily_tasks_manager.get_task(num).done: continue
-
-				task = self.daily_tasks_manager.get_task(num)
-				nums_daily_tasks.append(num)
-
-			elif num < quests_count:
-				num = num - daily_tasks_count
-
-				task = self.quest_manager.active_quests[0].get_goal(num)
-				nums_quests.append(num)
+		user_tasks, daily_tasks, goals = self.resolve_tasks(nums)
+		active_quest = self.quest_manager.active_quests[0] if goals else None
 
+		for task in [*user_tasks, *daily_tasks, *(active_quest.get_goal(num) for num in goals)]:
 			self.console.print(f'- [green]{task.task}')
 
-		# Пользовательские задания #
-		gold, skills_exp, items = self.awards_manager.get_rewards_user_tasks(nums_user_tasks)
-
-		for num in sorted(nums_user_tasks, reverse=True):
-			self.task_manager.delete_task(num)
-
-		# Ежедневные задания #
-		gold_d, skills_exp_d, items_d = self.awards_manager.get_rewards_daily_tasks(nums_daily_tasks)
-
-		gold += gold_d
-		items.extend(items_d)
-
-		for skill, exp in skills_exp_d.items():
-			if skill in skills_exp:
-				skills_exp[skill] += exp
-			else:
-				skills_exp[skill] = exp
-
-		for num in sorted(nums_daily_tasks, reverse=True):
-			self.daily_tasks_manager.complete(num)
+		result = self.complete_tasks(user_tasks, daily_tasks, goals)
 
 		# Сообщения о наградах #
-		if gold:
-			self.console.print(f'\n[yellow]Золото: [green]+{round(gold, 2)}')
-		if skills_exp:
-			self.console.print_tree_skills(skills_exp)
-		if items:
-			self.console.print_item_tree(items)
-
-		self.quest_manager.add_damage(len(nums_user_tasks) + len(nums_daily_tasks))
+		if result.gold:
+			self.console.print(f'\n[yellow]Золото: [green]+{round(result.gold, 2)}')
+		if result.skills_exp:
+			self.console.print_tree_skills(result.skills_exp)
+		if result.items:
+			self.console.print_item_tree(result.items)
 
 		# Квест #
-		for num in sorted(nums_quests, reverse=True):
-			self.quest_manager.complete_goal(num)
-
-		if self.quest_manager.is_done():
-			rewards = self.quest_manager.active_quests[0].quest.reward
-
-			gold_q = rewards['gold']
-			items_q = [get_item(item) for item in rewards['items']]
-
+		if result.quest is not None:
 			self.console.print('\nВы выполнили квест, вот ваша награда:')
-
-			if self.player.profile.add_experience():
+			if result.rank_up:
 				self.console.print(f'[blue]Вы получили {RankType.description(self.player.profile.rank)} ранг.')
-				self.update_shop()
-
-			self.console.print(f'[yellow]Золото: [green]+{round(gold_q, 2)}')
-			self.console.print_item_tree(items_q)
-
-			gold += gold_q
-			items.extend(items_q)
 
-			self.quest_manager.clear_active_quest()
+			self.console.print(f'[yellow]Золото: [green]+{round(result.quest_gold, 2)}')
+			self.console.print_item_tree(result.quest_items)
 
-		self.player.gold.gold += gold
-
-		for skill, exp in skills_exp.items():
-			self.player.skills[skill.skill_type].exp += exp
-
-		printed_flag = True
-		for item in items:
-			amount = self.inventory.take(item, 1)
-
-			if amount and printed_flag:
-				self.console.print(
-					"\n[red]В вашем инвентаре закончилось место, лишние предметы будут проданы автоматически."
-				)
-				printed_flag = False
-
-			if not printed_flag:
-				self.player.gold.gold += item.sell
+		if result.overflow:
+			self.console.print(
+				"\n[red]В вашем инвентаре закончилось место, лишние предметы будут проданы автоматически."
+			)
 
-		if len(nums_user_tasks + nums_daily_tasks + nums_quests) != 0:
+		if not result.empty:
 			input()
 
 	def delete_tasks(self):
@@ -274,42 +205,24 @@ class Interface:
 		# Вывод удалённых задач #
 		self.console.title('Удалённые задачи, чтобы выйти нажмите enter')
 
-		nums_user_tasks = []
-		nums_daily_tasks = []
+		user_tasks = []
+		daily_tasks = []
 
 		for num in nums:
 			if num < user_task_count:
-				self.console.print(f'- [red]{self.task_manager.get_task(num).task}')
-				nums_user_tasks.append(num)
+				task = self.task_manager.get_task(num)
+				user_tasks.append(task)
 			else:
-				num = num - user_task_count
-				self.console.print(f'- [red]{self.daily_tasks_manager.get_task(num).task}')
-				nums_daily_tasks.append(num)
+				task = self.daily_tasks_manager.get_task(num - user_task_count)
+				daily_tasks.append(task)
 
-		gold, skills_exp, items = self.awards_manager.get_rewards_user_tasks(nums_user_tasks, False)
-		gold_d, skills_exp_d, items_d = self.awards_manager.get_rewards_daily_tasks(nums_daily_tasks, False)
+			self.console.print(f'- [red]{task.task}')
 
-		gold += gold_d
-		for skill, exp in skills_exp_d.items():
-			if skill in skills_exp:
-				skills_exp[skill] += exp
-			else:
-				skills_exp[skill] = exp
+		gold, skills_exp = self.remove_tasks(user_tasks, daily_tasks)
 
 		self.console.print(f'\n[yellow]Золото: [red]-{round(gold, 2)}')
-
 		self.console.print_tree_skills(skills_exp, minus=True)
 
-		self.player.gold.payment(gold)
-		for skill, exp in skills_exp.items():
-			skill.reduce_exp(exp)
-
-		# Удаление задач #
-		for num in sorted(nums_user_tasks, reverse=True):
-			self.task_manager.delete_task(num)
-		for num in sorted(nums_daily_tasks, reverse=True):
-			self.daily_tasks_manager.delete_task(num)
-
 		input()
 
 	def guild(self):
@@ -321,7 +234,8 @@ class Interface:
 
 			while not (name := self.console.input('[cyan]Введите имя: ')):
 				self.console.print('[d magenta]Работник[/]: Имя не может быть пустым.\n')
-			self.player.profile.name = name
+			self.player.profile.register(name)
+			self.record_profile()
 
 			self.console.print(guild_welcome_text_2)
 			self.console.input()
@@ -366,8 +280,7 @@ class Interface:
 
 				quest = quests[num[0] - 1]
 
-				if not self.quest_manager.quest_been_launched():
-					self.quest_manager.start_quest(quest.id)
+				if self.start_quest(quest.id):
 					self.console.print('[green]Квест успешно активирован!')
 				else:
 					self.console.print('[red]Вы не выполнили предыдущий квест!')
@@ -389,19 +302,15 @@ class Interface:
 				self.console.title('Магазин, чтобы выйти нажмите enter')
 				items = [items[num - 1] for num in nums]
 
-				printed_flag = True
-				for item in items:
-					if item.cost > self.player.gold.gold:
-						self.console.print('\n[red]У вас не хватает денег!')
-						break
-
-					if not self.inventory.take(item, 1):
+				# Покупка проходит целиком или не проходит совсем #
+				bought = self.buy_items(items)
+				if bought is None:
+					self.console.print('\n[red]У вас не хватает денег!')
+				elif not bought:
+					self.console.print('\n[red]В вашем инвентаре не хватает места.')
+				else:
+					for item in items:
 						self.console.print(f'- {item.name}')
-						self.player.gold.payment(item.cost)
-
-					elif printed_flag:
-						self.console.print('\n[red]В вашем инвентаре закончилось место.')
-						printed_flag = False
 
 				input()
 
@@ -430,26 +339,34 @@ class Interface:
 
 			for num in nums:
 				skill = skills[num - 1]
-				level, exp = skill.level, skill.exp
+				bought = self.awards_manager.buy_skill_level(skill)
 
-				demand_exp, demand_gold = self.awards_manager.get_price_skill(level)
+				if bought is None: break
+				if not bought: continue
 
-				if demand_exp > exp: continue
-				if self.player.gold.gold - demand_gold < 0: break
-
-				self.player.gold.payment(demand_gold)
-				skill.level += 1
+				self.record_gold()
+				self.record_skills([skill])
 
 	def view_inventory(self):
 		""" Просмотр инвентаря. """
 		while True:
 			self.console.title('Инвентарь, чтобы выйти нажмите enter\n')
 			self.console.show_inventory()
-			slot = self.console.input('\nВведите номер слота для управления им: ')
+			slot = self.console.input(
+				'\nВведите номер слота для управления им, s для сортировки или b для подбора снаряжения: '
+			)
 
 			if slot == '': break
+			if slot == 's':
+				self.inventory.compact(get_item, item_sort_key)
+				self.record_inventory()
+				continue
+			if slot == 'b':
+				self.best_gear()
+				continue
 			if slot.isnumeric() and 0 < int(slot) <= len(self.inventory.slots):
-				slot = self.inventory.slots[int(slot) - 1]
+				index = int(slot) - 1
+				slot = self.inventory.slots[index]
 				self.console.clear_console()
 			else:
 				continue
@@ -477,22 +394,15 @@ class Interface:
 				self.console.presence_item(item)
 
 			elif command == "w":
-				if slot.type == ItemType.ITEM and item.type != ItemType.ITEM:
-					slots = self.inventory.get(item.type, only_empty=True)
-					if slots:
-						slots[0][1].swap(slot)
-						self.console.print("[green]Предмет надет")
-					else:
-						self.console.print("[red]Нет доступных слотов")
-				elif slot.type != ItemType.ITEM:
-					slots = self.inventory.get(ItemType.ITEM, only_empty=True)
-					if slots:
-						slots[0][1].swap(slot)
-						self.console.print("[green]Предмет снят")
-					else:
-						self.console.print("[red]Нет доступных слотов")
-				elif slot.type == ItemType.ITEM and item.type == ItemType.ITEM:
+				equipped = slot.type != ItemType.ITEM
+				moved = self.toggle_equipment(index)
+
+				if moved is None:
 					self.console.print("[red]Вы не можете это надеть")
+				elif not moved:
+					self.console.print("[red]Нет доступных слотов")
+				else:
+					self.console.print("[green]Предмет снят" if equipped else "[green]Предмет надет")
 
 			elif command == "u":
 				if item.is_usable and not item.is_wearable:
@@ -506,95 +416,68 @@ class Interface:
 
 					if quest_effect and not self.quest_manager.quest_been_launched():  # Активация квеста
 						self.quest_manager.start_quest(quest_effect)
+						self.record_quests()
 						self.console.print('[green]Квест успешно активирован!')
 						slot.amount -= 1
+						self.inventory.mark(index)
 
 					elif textbook_effect:  # Учебники
 						for skill, exp in textbook_effect.items():
-							self.player.skills[skill].exp += exp
+							self.player.skills[skill].add_exp(exp)
+						self.record_skills([self.player.skills[skill] for skill in textbook_effect])
 
 						self.console.print_tree_skills(textbook_effect)
 						slot.amount -= 1
+						self.inventory.mark(index)
 				else:
 					self.console.print('[red]Вы не можете это использовать')
 
 			elif command == "s":
 				if item.possible_sell:
 					self.console.print(f"[green]Предмет успешно продан за {item.sell} монеты")
-					self.player.gold.gold += item.sell
+					self.player.gold.add(item.sell)
 					slot.clear()
+					self.inventory.mark(index)
+					self.record_gold()
 				else:
 					self.console.print("[red]Вы не можете это продать")
 
 			else:
 				continue
 
+			self.record_inventory()
 			input()
 
-	def update(self):
-		""" Загрузка и обновление данных. """
-		today = str(date.today())
-		tasks = read_tasks()
-
-		# Запись заданий #
-		self.task_manager.load(tasks['user_tasks'])
-		self.daily_tasks_manager.load(tasks['daily_tasks'])
-		self.quest_manager.quests.extend(create_quest_item(read_quest()))
-		self.quest_manager.load(tasks['quests'])
-
-		# Запись данных пользователя #
-		self.player.load(read_player_info())
-		self.inventory.load(read_inventory())
-
-		# Обновляет магазин
-		if self.player.profile.shops['date'] != today:
-			self.update_shop()
+	def best_gear(self):
+		""" Подбор лучшего снаряжения для выбранных навыков. """
+		skills_name = SKILL_DESCRIPTIONS.values()
+		self.console.title(f'Подбор снаряжения\n[dim]{", ".join(skills_name)}[/dim]\n')
 
-		# Проверяем, что ежедневное задание актуально.
-		if self.daily_tasks_manager.date != today:
-			not_complete_tasks = self.daily_tasks_manager.update(today)
+		line = self.console.input('Для каких навыков подобрать снаряжение (enter - для всех): ')
+		skills = [result for i in line.split(',') if (result := skill_check(i.strip())) is not None]
 
-			# Если предыдущие задания не были выполнены, то наказываем игрока за это.
-			if not_complete_tasks:
-				self.console.title('Наказание за невыполнение заданий, чтобы выйти нажмите enter')
-				# self.console.print('\nВы не закончили предыдущее ежедневное задание:')
+		optimizer = LoadoutOptimizer(self.inventory)
+		changed = optimizer.apply(optimizer.best(skills))
 
-				gold, skills_exp, items = self.awards_manager.get_rewards_daily_tasks(not_complete_tasks,
-																					  need_items=False)
+		if changed:
+			self.record_inventory()
+			self.console.print('\n[green]Снаряжение подобрано')
+		else:
+			self.console.print('\n[yellow]Лучшее снаряжение уже надето')
 
-				self.console.print(f'\n[yellow]Золото: [red]-{round(gold, 2)}')
-				self.console.print_tree_skills(skills_exp, minus=True)
+		bonuses = {skill: calculate_item_bonus(self.inventory, skill, True) for skill in skills or SkillType}
+		for skill, bonus in bonuses.items():
+			self.console.print(f'  {SkillType.description(skill)}: {"[green]+" if bonus >= 0 else "[red]"}{bonus}%')
+		input()
 
-				self.player.gold.payment(gold)
-				for skill, exp in skills_exp.items():
-					skill.reduce_exp(exp)
+	def update(self):
+		""" Загрузка и обновление данных. Показывает наказание за невыполненные ежедневные задания. """
+		penalty = super().update()
 
-				input()
+		if penalty is not None:
+			gold, skills_exp = penalty
+			self.console.title('Наказание за невыполнение заданий, чтобы выйти нажмите enter')
 
-	def update_shop(self):
-		rank = self.player.profile.rank
-
-		quests = [quest.id for quest in self.quest_manager.quests if
-				  rank - 2 < quest.rank < rank + 2 and quest.in_guild]
-		items = random.sample(
-			list(itertools.chain.from_iterable(items.keys() for items in all_items.values())),
-			NUMBER_ITEM_STORE
-		)
-
-		# todo: Убрать, когда квестов станет достаточно
-		number_quest_store = NUMBER_QUEST_STORE if len(quests) > NUMBER_QUEST_STORE else len(quests)
-		quests = random.sample(quests, k=number_quest_store)
-
-		self.player.profile.shops = {'date': str(date.today()), 'quests': quests, 'items': items}
-
-	def save(self):
-		""" Сохранение данных. """
-		all_save(
-			{
-				'user_tasks': self.task_manager.save(),
-				'daily_tasks': self.daily_tasks_manager.save(),
-				'quests': self.quest_manager.save()
-			},
-			self.player.save(),
-			self.inventory.save()
-		)
+			self.console.print(f'\n[yellow]Золото: [red]-{round(gold, 2)}')
+			self.console.print_tree_skills(skills_exp, minus=True)
+			input()
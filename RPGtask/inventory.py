@@ -1,5 +1,10 @@
+from array import array
+from collections.abc import Sequence
 from enum import IntEnum
-from typing import NoReturn, Self
+from heapq import heappop, heappush
+from typing import Any, Callable, NoReturn, Self
+
+from .config import COMPACT_INVENTORY_SIZE
 
 
 class ItemType(IntEnum):
@@ -138,6 +143,25 @@ class Item:
 		return f"<Item {self.id!r}>"
 
 
+# Слоты снаряжения, которые идут в инвентаре игрока после обычных слотов
+EQUIPMENT_SLOTS = (
+	ItemType.HELMET,
+	ItemType.BREASTPLATE,
+	ItemType.LEGGINGS,
+	ItemType.BOOTS,
+	ItemType.WEAPON,
+	ItemType.RING,
+	ItemType.RING,
+	ItemType.AMULET,
+)
+
+
+def item_id(code: int) -> str:
+	""" Возвращает идентификатор предмета по его индексу в реестре предметов (см. registry.ItemRegistry). """
+	from .registry import registry  # Реестр сам импортирует этот модуль
+	return registry.get(code).id
+
+
 class Slot:
 	"""
 	Объект слота в инвентаре.
@@ -148,6 +172,8 @@ class Slot:
 	Атрибуты:
 		id (str): Идентификатор объекта, находящегося внутри. По умолчанию пустая строка.
 		amount (int): Количество объектов внутри ячейки. По умолчанию 0.
+		owner (Inventory | None): Инвентарь, которому принадлежит слот. По умолчанию None.
+		index (int | None): Номер слота в инвентаре. По умолчанию None.
 
 	Методы:
 		set(identifier: str, amount: int = 1) -> Self: Задаёт id и amount.
@@ -156,13 +182,36 @@ class Slot:
 		clear(): Очищает слот.
 		optimize(): Оптимизирует слот, удаляя ненужные данные.
 		swap(slot: Slot): Меняет местами содержимое двух слотов.
+		notify(): Сообщает инвентарю об изменении слота.
 		empty() -> bool: Проверяет слот на пустоту.
 	"""
 
 	def __init__(self, item_type: ItemType = ItemType.ITEM):
 		self.type = item_type
-		self.id: str = ""
-		self.amount: int = 0
+		self._id: str = ""
+		self._amount: int = 0
+		self.owner = None
+		self.index: int | None = None
+
+	@property
+	def id(self) -> str:
+		""" Идентификатор объекта, находящегося внутри. """
+		return self._id
+
+	@id.setter
+	def id(self, identifier: str):
+		self._id = identifier
+		self.notify()
+
+	@property
+	def amount(self) -> int:
+		""" Количество объектов внутри ячейки. """
+		return self._amount
+
+	@amount.setter
+	def amount(self, amount: int):
+		self._amount = amount
+		self.notify()
 
 	def set(self, identifier: str, amount: int = 1) -> Self:
 		"""
@@ -175,8 +224,9 @@ class Slot:
 		Возвращается:
 			self: Ссылка на экземпляр объекта.
 		"""
-		self.id = identifier
-		self.amount = amount
+		self._id = identifier
+		self._amount = amount
+		self.notify()
 
 		return self
 
@@ -187,32 +237,33 @@ class Slot:
 		Возвращается:
 			tuple: Кортеж, содержащий идентификатор и количество ячеек, или None, если ячейка пуста.
 		"""
-		return None if self.empty else [self.id, self.amount]
+		return None if self.empty else [self._id, self._amount]
 
 	def load(self, data: list[str, int] | None) -> NoReturn:
 		"""
 		Загружает данные слота. Если данных нет, то очищает слот.
 
 		Аргументы:
-			data (tuple[str, int] | None): Кортеж, состоящий из идентификатора и количества ячеек, или None.
+			data (tuple[str | int, int] | None): Кортеж, состоящий из идентификатора или индекса предмета
+				в реестре (см. ItemRegistry.pack) и количества ячеек, или None.
 		"""
 		if data is not None:
-			self.id = data[0]
-			self.amount = data[1]
+			self._id = data[0] if isinstance(data[0], str) else item_id(data[0])
+			self._amount = data[1]
+			self.notify()
 		else:
 			self.clear()
 
 	def clear(self) -> NoReturn:
 		""" Очищает слот. """
-		self.id = ""
-		self.amount = 0
+		self._id = ""
+		self._amount = 0
+		self.notify()
 
 	def optimize(self) -> NoReturn:
 		""" Оптимизирует слот, удаляя ненужные данные. """
-		if not self.amount:
-			self.id = ""
-		if not self.id:
-			self.amount = 0
+		if self.empty:
+			self.clear()
 
 	def swap(self, slot) -> NoReturn:
 		"""
@@ -221,42 +272,94 @@ class Slot:
 		Аргументы:
 			slot (Slot): Слот для обмена.
 		"""
-		slot.id, self.id = self.id, slot.id
-		slot.amount, self.amount = self.amount, slot.amount
+		slot._id, self._id = self._id, slot._id
+		slot._amount, self._amount = self._amount, slot._amount
+
+		self.notify()
+		slot.notify()
+
+	def notify(self) -> NoReturn:
+		""" Сообщает инвентарю об изменении слота. """
+		if self.owner is not None:
+			self.owner.slot_changed(self)
 
 	@property
 	def empty(self) -> bool:
 		"""
-		Проверяет слот на пустоту.
+		Проверяет слот на пустоту. Слот без идентификатора или без предметов считается пустым.
 
 		Возвращается:
 			bool: True если слот пустой, иначе False.
 		"""
-		self.optimize()
-		return not self.amount
+		return not self._amount or not self._id
 
 	def __repr__(self) -> str:
 		""" Возвращает строковое представление объекта Slot. """
-		return f"<Slot {self.amount}x{self.id!r}>"
+		return f"<Slot {self._amount}x{self._id!r}>"
+
+
+class TakeResult:
+	"""
+	Результат Inventory.take_many.
+
+	Атрибуты:
+		placed (list[tuple[Item, int, int]]): Положенные предметы: предмет, номер слота и количество.
+		overflow (list[tuple[Item, int]]): Предметы, которые не поместились, и их количество.
+		rolled_back (bool): True, если предметы не поместились целиком и инвентарь остался без изменений.
+	"""
+
+	def __init__(self):
+		self.placed: list[tuple[Item, int, int]] = []
+		self.overflow: list[tuple[Item, int]] = []
+		self.rolled_back: bool = False
+
+	@property
+	def ok(self) -> bool:
+		""" Поместились ли все предметы. """
+		return not self.overflow
+
+	def __repr__(self) -> str:
+		""" Возвращает строковое представление объекта TakeResult. """
+		return f"<TakeResult placed={len(self.placed)} overflow={len(self.overflow)} rolled_back={self.rolled_back}>"
 
 
 class Inventory:
 	"""
 	Представляет собой инвентарь.
 
+	Все изменения слотов проходят через Slot.notify(), поэтому индексы ниже всегда соответствуют содержимому слотов,
+	а take(), count_item() и count_all() не перебирают весь инвентарь.
+
 	Параметры:
 		is_carrier (bool, optional): Указывает на тип инвентаря. True - инвентарь игрока, False - хранилища. По умолчанию True.
 		size (int, optional): Размер инвентаря. По умолчанию 10.
 
 	Атрибуты:
 		slots (list[Slot]): Слоты инвентаря.
+		changed (set[int]): Номера слотов, изменённых после последнего вызова pop_changed().
+		version (int): Номер версии инвентаря. Увеличивается при каждом изменении.
+		bonus (tuple[list[float], list[int]] | None): Бонусы надетых предметов к навыкам в десятичном виде
+			и в процентах. None, если бонусы нужно пересчитать (см. utils.calculate_item_bonus).
+
+		counts (dict[str, int]): Количество каждого предмета в инвентаре.
+		total (int): Количество всех предметов в инвентаре.
+		stacks (dict[str, int]): Размеры стаков предметов, которые уже попадали в take().
+		partial (dict[str, set[int]]): Номера неполных слотов типа ItemType.ITEM для предметов из stacks.
+		free (dict[ItemType, set[int]]): Номера пустых слотов каждого типа.
 
 	Методы:
 		save() -> list[tuple[str, int]]: Возвращает данные для сохранения инвентаря.
 		load(data: list[tuple[str, int]]): Загружает инвентарь из сохранения.
+		mark(*indices: int): Отмечает слоты изменёнными.
+		slot_changed(slot: Slot): Обновляет индексы и сбрасывает бонусы, если изменился слот снаряжения.
+		pop_changed() -> list[int]: Возвращает и сбрасывает номера изменённых слотов.
 
 		take(item: Item, amount: int) -> int: Добавляет предмет в инвентарь.
+		take_many(items: list[tuple[Item, int]], atomic: bool = False) -> TakeResult: Добавляет несколько предметов.
+		compact(get_item, key=None) -> list[int]: Объединяет стаки, сортирует предметы и собирает пустые слоты в конце.
 		get(): Извлекает из инвентаря слоты определенного типа предметов.
+		free_slot(item_type: ItemType) -> int | None: Возвращает номер первого пустого слота.
+		type_indices(item_type: ItemType) -> list[int] | range: Возвращает номера слотов определённого типа.
 
 		count_item( item: Item | str) -> int: Считает количество определённых предметов в инвентаре.
 		count_all() -> int: Возвращает количество всех предметов в инвентаре.
@@ -268,29 +371,137 @@ class Inventory:
 
 		self.slots: list[Slot] = [Slot(ItemType.ITEM) for _ in range(size)]
 		if is_carrier:
-			self.slots.extend([
-				Slot(ItemType.HELMET),
-				Slot(ItemType.BREASTPLATE),
-				Slot(ItemType.LEGGINGS),
-				Slot(ItemType.BOOTS),
-				Slot(ItemType.WEAPON),
-				Slot(ItemType.RING),
-				Slot(ItemType.RING),
-				Slot(ItemType.AMULET),
-			])
+			self.slots.extend(Slot(item_type) for item_type in EQUIPMENT_SLOTS)
+
+		self.changed: set[int] = set()
+		self.version: int = 0
+		self.bonus: tuple[list[float], list[int]] | None = None
+
+		# Сохранённое представление слотов. При сохранении заново сериализуются только изменённые слоты.
+		self.saved: list[list[str, int] | None] = [None] * len(self.slots)
+		self.unsaved: set[int] = set(range(len(self.slots)))
+
+		# Индексы #
+		self.counts: dict[str, int] = {}
+		self.total: int = 0
+		self.stacks: dict[str, int] = {}
+		self.partial: dict[str, set[int]] = {}
+
+		# Пустые слоты хранятся в куче по типам, чтобы быстро находить первый из них.
+		# Из кучи номера удаляются лениво: актуальность проверяется по множеству free.
+		self.free: dict[ItemType, set[int]] = {}
+		self.free_heap: dict[ItemType, list[int]] = {}
+		self.by_type: dict[ItemType, list[int]] = {}
+
+		# Содержимое слотов на момент последнего обновления индексов
+		self.indexed: list[tuple[str, int]] = [("", 0)] * len(self.slots)
+
+		for i, slot in enumerate(self.slots):
+			slot.owner = self
+			slot.index = i
+
+			self.by_type.setdefault(slot.type, []).append(i)
+			self.free.setdefault(slot.type, set()).add(i)
+
+		# Номера уже идут по возрастанию, поэтому списки сразу являются кучами
+		self.free_heap = {item_type: list(indices) for item_type, indices in self.by_type.items()}
 
 	def save(self) -> list[list[str, int]]:
 		""" Возвращает данные для сохранения инвентаря. """
-		return [slot.save() for slot in self.slots]
+		for i in self.unsaved:
+			self.saved[i] = self.slots[i].save()
+		self.unsaved.clear()
+		return self.saved
 
 	def load(self, data):
 		""" Загружает инвентарь из сохранения. """
 		for count, slot_data in enumerate(data):
 			self.slots[count].load(slot_data)
+			self.saved[count] = self.slots[count].save()
+			self.unsaved.discard(count)
+
+		self.version += 1
+
+	def mark(self, *indices: int):
+		""" Отмечает слоты изменёнными. """
+		self.changed.update(indices)
+		self.unsaved.update(indices)
+		self.version += 1
+
+	def slot_changed(self, slot: Slot):
+		""" Обновляет индексы и сбрасывает бонусы, если изменился слот снаряжения. """
+		i = slot.index
+		old_id, old_amount = self.indexed[i]
+		new_id, new_amount = ("", 0) if slot.empty else (slot.id, slot.amount)
+
+		if (old_id, old_amount) != (new_id, new_amount):
+			self.indexed[i] = (new_id, new_amount)
+			self.unsaved.add(i)
+			self._update_index(i, slot.type, old_id, old_amount, new_id, new_amount)
+
+	def _update_index(self, i: int, item_type: ItemType, old_id: str, old_amount: int, new_id: str, new_amount: int):
+		""" Переносит слот в индексах из старого состояния в новое. """
+		if item_type != ItemType.ITEM:
+			self.bonus = None
+
+		# Счётчики #
+		if old_amount:
+			self.total -= old_amount
+			self.counts[old_id] -= old_amount
+			if not self.counts[old_id]:
+				del self.counts[old_id]
+		if new_amount:
+			self.total += new_amount
+			self.counts[new_id] = self.counts.get(new_id, 0) + new_amount
+
+		# Неполные стаки. Учитываются только предметы, размер стака которых уже известен #
+		if item_type == ItemType.ITEM:
+			if old_amount:
+				self._discard_partial(old_id, i)
+			if new_amount and new_amount < self.stacks.get(new_id, 0):
+				self.partial.setdefault(new_id, set()).add(i)
+
+		self._set_free(i, item_type, not new_amount)
+
+	def _set_free(self, i: int, item_type: ItemType, is_free: bool):
+		""" Отмечает слот пустым или занятым. """
+		free = self.free[item_type]
+		if is_free:
+			if i not in free:
+				free.add(i)
+				heap = self.free_heap[item_type]
+				heappush(heap, i)
+
+				# Устаревшие номера накапливаются в куче, поэтому время от времени она пересобирается
+				if len(heap) > 2 * len(self.by_type[item_type]):
+					self.free_heap[item_type] = sorted(free)
+		else:
+			free.discard(i)
+
+	def _find_partial(self, identifier: str, stack: int) -> set[int]:
+		""" Ищет неполные слоты предмета перебором. Вызывается, когда становится известен размер его стака. """
+		return {
+			i for i in self.by_type.get(ItemType.ITEM, ())
+			if self.indexed[i][0] == identifier and self.indexed[i][1] < stack
+		}
+
+	def _discard_partial(self, identifier: str, i: int):
+		""" Убирает слот из неполных стаков предмета. """
+		partial = self.partial.get(identifier)
+		if partial is not None:
+			partial.discard(i)
+			if not partial:
+				del self.partial[identifier]
+
+	def pop_changed(self) -> list[int]:
+		""" Возвращает и сбрасывает номера изменённых слотов. """
+		changed = sorted(self.changed)
+		self.changed.clear()
+		return changed
 
 	def take(self, item: Item, amount: int) -> int:
 		"""
-		Добавляет предмет в инвентарь.
+		Добавляет предмет в инвентарь. Сначала дополняются неполные стаки этого предмета, затем занимаются пустые слоты.
 
 		Аргументы:
 			item (Item): Предмет, который нужно взять.
@@ -299,21 +510,157 @@ class Inventory:
 		Возвращается:
 			int: Количество предметов, которые не удалось забрать.
 		"""
-		for slot in self.slots:
-			if slot.type == ItemType.ITEM:
-				if slot.empty:
-					slot_amount = min(item.stack, amount)
-					amount -= slot_amount
-					slot.id = item.id
-					slot.amount = slot_amount
-				elif slot.id == item.id:
-					slot_amount = min(item.stack - slot.amount, amount)
-					amount -= slot_amount
-					slot.amount += slot_amount
-			if amount == 0:
+		placed: list[tuple[int, int]] = []
+		amount = self._place(item, amount, placed)
+
+		if placed:
+			self.mark(*(i for i, _ in placed))
+		return amount
+
+	def take_many(self, items: list[tuple[Item, int]], atomic: bool = False) -> TakeResult:
+		"""
+		Добавляет в инвентарь несколько предметов за один раз. Одинаковые предметы объединяются.
+
+		Аргументы:
+			items (list[tuple[Item, int]]): Предметы и их количество.
+			atomic (bool, optional): Если не помещаются все предметы, то инвентарь остаётся без изменений. По умолчанию False.
+
+		Возвращается:
+			TakeResult: Куда были положены предметы и что не поместилось.
+		"""
+		merged: dict[str, list[Item | int]] = {}
+		for item, amount in items:
+			if item.id in merged:
+				merged[item.id][1] += amount
+			else:
+				merged[item.id] = [item, amount]
+
+		result = TakeResult()
+		before: dict[int, tuple[str, int]] = {}
+
+		for item, amount in merged.values():
+			placed: list[tuple[int, int]] = []
+			amount = self._place(item, amount, placed, before)
+
+			result.placed.extend((item, i, slot_amount) for i, slot_amount in placed)
+			if amount:
+				result.overflow.append((item, amount))
+
+		if atomic and result.overflow:
+			for i, (identifier, amount) in before.items():
+				self.slots[i].set(identifier, amount)
+
+			result.placed.clear()
+			result.overflow = [(item, amount) for item, amount in merged.values()]
+			result.rolled_back = True
+
+		elif before:
+			self.mark(*before)
+
+		return result
+
+	def _place(self, item: Item, amount: int, placed: list[tuple[int, int]],
+			   before: dict[int, tuple[str, int]] | None = None) -> int:
+		"""
+		Раскладывает предмет по слотам, не отмечая их изменёнными.
+
+		Аргументы:
+			item (Item): Предмет, который нужно взять.
+			amount (int): Количество предметов.
+			placed (list[tuple[int, int]]): Сюда добавляются номера заполненных слотов и положенное количество.
+			before (dict[int, tuple[str, int]] | None): Сюда сохраняется прежнее содержимое слотов для отката.
+
+		Возвращается:
+			int: Количество предметов, которые не удалось забрать.
+		"""
+		if self.stacks.get(item.id) != item.stack:
+			self.stacks[item.id] = item.stack
+			self.partial.pop(item.id, None)
+			if partial := self._find_partial(item.id, item.stack):
+				self.partial[item.id] = partial
+
+		while amount > 0 and item.id in self.partial:
+			i = min(self.partial[item.id])
+			slot = self.slots[i]
+			if before is not None and i not in before:
+				before[i] = (slot.id, slot.amount)
+
+			slot_amount = min(item.stack - slot.amount, amount)
+			amount -= slot_amount
+			slot.amount += slot_amount
+			placed.append((i, slot_amount))
+
+		while amount > 0:
+			i = self.free_slot(ItemType.ITEM)
+			if i is None:
 				break
+			if before is not None and i not in before:
+				before[i] = ("", 0)
+
+			slot_amount = min(item.stack, amount)
+			amount -= slot_amount
+			self.slots[i].set(item.id, slot_amount)
+			placed.append((i, slot_amount))
+
 		return amount
 
+	def compact(self, get_item: Callable[[str], Item], key: Callable[[Item], Any] | None = None) -> list[int]:
+		"""
+		Дефрагментирует слоты типа ItemType.ITEM: объединяет неполные стаки одинаковых предметов,
+		при необходимости сортирует предметы и переносит пустые слоты в конец. Работает за O(n log n).
+
+		Аргументы:
+			get_item (Callable[[str], Item]): Функция получения предмета по идентификатору (utils.get_item).
+			key (Callable[[Item], Any] | None, optional): Ключ сортировки предметов (например, utils.item_sort_key).
+				По умолчанию предметы идут в порядке первого появления.
+
+		Возвращается:
+			list[int]: Номера изменившихся слотов.
+		"""
+		indices = self.type_indices(ItemType.ITEM)
+		data = self.save()
+		old = [None if data[i] is None else tuple(data[i]) for i in indices]
+
+		totals: dict[str, int] = {}
+		largest: dict[str, int] = {}
+		for slot_data in old:
+			if slot_data is not None:
+				identifier, amount = slot_data
+				totals[identifier] = totals.get(identifier, 0) + amount
+				largest[identifier] = max(largest.get(identifier, 0), amount)
+
+		items = [get_item(identifier) for identifier in totals]
+		if key is not None:
+			items.sort(key=key)
+
+		new: list[tuple[str, int] | None] = []
+		for item in items:
+			# Переполненные стаки не разбиваются, поэтому предмету никогда не понадобится больше слотов, чем было
+			stack = max(item.stack, largest[item.id])
+			full, rest = divmod(totals[item.id], stack)
+
+			new.extend([(item.id, stack)] * full)
+			if rest:
+				new.append((item.id, rest))
+		new.extend([None] * (len(old) - len(new)))
+
+		changed = []
+		for i, old_data, new_data in zip(indices, old, new):
+			if old_data != new_data:
+				changed.append(i)
+				if new_data is None:
+					self.slots[i].clear()
+				else:
+					self.slots[i].set(*new_data)
+
+		if changed:
+			self.mark(*changed)
+		return changed
+
+	def type_indices(self, item_type: ItemType) -> list[int] | range:
+		""" Возвращает номера слотов определённого типа. """
+		return self.by_type.get(item_type, [])
+
 	def get(self, item_type: ItemType, inverse: bool = False, only_empty: bool = False) -> list[tuple[int, Slot]]:
 		"""
 		Извлекает из инвентаря слоты определенного типа предметов.
@@ -326,15 +673,33 @@ class Inventory:
 		Возвращается:
 			list: Список кортежей, содержащих индекс и слот соответствующих слотов.
 		"""
-		res: list[tuple[int, Slot]] = []
-		for i, slot in enumerate(self.slots):
-			if not inverse and slot.type == item_type:
-				res.append((i, slot))
-			elif inverse and slot.type != item_type:
-				res.append((i, slot))
+		if inverse:
+			indices = sorted(i for other, type_indices in self.by_type.items() if other != item_type for i in type_indices)
+		else:
+			indices = self.by_type.get(item_type, [])
+
 		if only_empty:
-			res = [(i, slot) for i, slot in res if slot.empty]
-		return res
+			return [(i, self.slots[i]) for i in indices if not self.indexed[i][1]]
+		return [(i, self.slots[i]) for i in indices]
+
+	def free_slot(self, item_type: ItemType) -> int | None:
+		"""
+		Возвращает номер первого пустого слота определённого типа.
+
+		Аргументы:
+			item_type (ItemType): Тип слота.
+
+		Возвращается:
+			int | None: Номер слота или None, если пустых слотов нет.
+		"""
+		free = self.free.get(item_type)
+		if not free:
+			return None
+
+		heap = self.free_heap[item_type]
+		while heap[0] not in free:
+			heappop(heap)
+		return heap[0]
 
 	def count_item(self, item: Item | str) -> int:
 		"""
@@ -347,12 +712,267 @@ class Inventory:
 			int: Количество определённых предметов в инвентаре.
 		"""
 		item = item.id if isinstance(item, Item) else item
-		return sum(slot.amount for slot in self.slots if slot.id == item)
+		return self.counts.get(item, 0)
 
 	def count_all(self) -> int:
 		""" Возвращает количество всех предметов в инвентаре. """
-		return sum(slot.amount for slot in self.slots)
+		return self.total
 
 	def __repl__(self):
 		""" Возвращает строковое представление инвентаря. """
 		return f"<Inventory {[s.id for s in self.slots]}>"
+
+
+class SlotView(Slot):
+	"""
+	Слот компактного инвентаря. Не хранит данных сам, а читает и записывает массивы CompactInventory,
+	поэтому его можно передавать везде, где ожидается Slot.
+
+	Параметры:
+		owner (CompactInventory): Инвентарь, которому принадлежит слот.
+		index (int): Номер слота в инвентаре.
+	"""
+
+	def __init__(self, owner, index: int):
+		self.owner = owner
+		self.index = index
+
+	@property
+	def type(self) -> ItemType:
+		""" Тип слота в инвентаре. """
+		return ItemType(self.owner.types[self.index])
+
+	@property
+	def _id(self) -> str:
+		return self.owner.names[self.owner.ids[self.index]]
+
+	@_id.setter
+	def _id(self, identifier: str):
+		self.owner.ids[self.index] = self.owner.intern(identifier)
+
+	@property
+	def _amount(self) -> int:
+		return self.owner.amounts[self.index]
+
+	@_amount.setter
+	def _amount(self, amount: int):
+		self.owner.amounts[self.index] = amount
+
+
+class SlotArray(Sequence):
+	""" Список слотов компактного инвентаря. Создаёт SlotView при обращении к слоту. """
+
+	def __init__(self, owner):
+		self.owner = owner
+
+	def __len__(self) -> int:
+		return len(self.owner.types)
+
+	def __getitem__(self, index: int | slice) -> SlotView | list[SlotView]:
+		if isinstance(index, slice):
+			return [SlotView(self.owner, i) for i in range(*index.indices(len(self)))]
+
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError('slot index out of range')
+		return SlotView(self.owner, index)
+
+
+class CompactInventory(Inventory):
+	"""
+	Инвентарь хранилища на массивах. Вместо объектов Slot данные слотов лежат в трёх массивах,
+	а идентификаторы предметов заменены небольшими числами. Подходит для хранилищ на сотни тысяч слотов.
+
+	Слоты доступны через slots как SlotView, поэтому остальной код работает с ним так же, как с Inventory.
+
+	Параметры:
+		size (int, optional): Размер инвентаря. По умолчанию 10.
+
+	Атрибуты:
+		types (bytearray): Типы слотов.
+		ids (array): Номера идентификаторов предметов в слотах. 0 - пустой слот.
+		amounts (array): Количество предметов в слотах.
+		names (list[str]): Идентификаторы предметов по номерам.
+		codes (dict[str, int]): Номера идентификаторов предметов.
+		free_marks (bytearray): Тип пустого слота или FULL, если слот занят.
+
+	Методы:
+		intern(identifier: str) -> int: Возвращает номер идентификатора предмета.
+	"""
+	FULL = 255  # Отметка занятого слота в free_marks
+
+	def __init__(self, size: int = 10):
+		# Общие атрибуты и учёт изменений (changed, unsaved, version) задаёт Inventory, слоты создаются ниже на массивах
+		super().__init__(is_carrier=False, size=0)
+		self.size = size
+
+		self.types = bytearray(size)  # Все слоты хранилища имеют тип ItemType.ITEM
+		self.ids = array('I', bytes(4 * size))
+		self.amounts = array('I', bytes(4 * size))
+		# Номера идентификаторов совпадают с индексами реестра предметов, сдвинутыми на 1
+		from .registry import registry  # Реестр сам импортирует этот модуль
+
+		self.names: list[str] = ["", *registry.ids()]
+		self.codes: dict[str, int] = {identifier: code for code, identifier in enumerate(self.names)}
+		self.slots = SlotArray(self)
+
+		# Сохранённое представление слотов (saved) не хранится: save() собирает его из массивов за один проход,
+		# иначе список на каждый слот съел бы почти всю экономию памяти.
+
+		# Пустые слоты ищутся через bytearray.find. free_hint - номер, до которого пустых слотов этого типа нет.
+		self.free_marks = bytearray(self.types)
+		self.free_hint: dict[ItemType, int] = {}
+
+		# Содержимое слотов на момент последнего обновления индексов
+		self.indexed_ids = array('I', self.ids)
+		self.indexed_amounts = array('I', self.amounts)
+
+	def intern(self, identifier: str) -> int:
+		""" Возвращает номер идентификатора предмета, при необходимости добавляя его. """
+		code = self.codes.get(identifier)
+		if code is None:
+			code = self.codes[identifier] = len(self.names)
+			self.names.append(identifier)
+		return code
+
+	def save(self) -> list[list[str, int]]:
+		""" Возвращает данные для сохранения инвентаря. Данные собираются из массивов за один проход. """
+		names = self.names
+		self.unsaved.clear()
+		return [[names[code], amount] if code and amount else None for code, amount in zip(self.ids, self.amounts)]
+
+	def load(self, data):
+		""" Загружает инвентарь из сохранения. Индексы пересчитываются один раз для всего инвентаря. """
+		ids, amounts, intern = self.ids, self.amounts, self.intern
+
+		for count, slot_data in enumerate(data):
+			if slot_data is not None and slot_data[0] != "" and slot_data[1]:
+				identifier = slot_data[0]
+				ids[count] = intern(identifier if isinstance(identifier, str) else item_id(identifier))
+				amounts[count] = slot_data[1]
+			else:
+				ids[count] = amounts[count] = 0
+
+		self.rebuild()
+		self.unsaved.difference_update(range(len(data)))
+		self.version += 1
+
+	def rebuild(self):
+		""" Пересчитывает индексы по массивам слотов. """
+		names, counts = self.names, {}
+		free_marks = bytearray(self.types)
+
+		for i, (code, amount) in enumerate(zip(self.ids, self.amounts)):
+			if code and amount:
+				counts[code] = counts.get(code, 0) + amount
+				free_marks[i] = self.FULL
+			else:
+				self.ids[i] = self.amounts[i] = 0
+
+		self.counts = {names[code]: amount for code, amount in counts.items()}
+		self.total = sum(counts.values())
+		self.free_marks = free_marks
+		self.free_hint.clear()
+		self.indexed_ids = array('I', self.ids)
+		self.indexed_amounts = array('I', self.amounts)
+
+		# Неполные стаки будут найдены заново при следующем take()
+		self.stacks.clear()
+		self.partial.clear()
+
+	def slot_changed(self, slot: SlotView):
+		""" Обновляет индексы. """
+		i = slot.index
+		old_code, old_amount = self.indexed_ids[i], self.indexed_amounts[i]
+		new_code, new_amount = self.ids[i], self.amounts[i]
+		if not new_code or not new_amount:
+			new_code = new_amount = 0
+
+		if (old_code, old_amount) != (new_code, new_amount):
+			self.indexed_ids[i], self.indexed_amounts[i] = new_code, new_amount
+			self.unsaved.add(i)
+			self._update_index(
+				i, ItemType(self.types[i]), self.names[old_code], old_amount, self.names[new_code], new_amount
+			)
+
+	def _set_free(self, i: int, item_type: ItemType, is_free: bool):
+		""" Отмечает слот пустым или занятым. """
+		if is_free:
+			self.free_marks[i] = item_type
+			if i < self.free_hint.get(item_type, 0):
+				self.free_hint[item_type] = i
+		else:
+			self.free_marks[i] = self.FULL
+
+	def _find_partial(self, identifier: str, stack: int) -> set[int]:
+		""" Ищет неполные слоты предмета перебором. Вызывается, когда становится известен размер его стака. """
+		code = self.codes.get(identifier)
+		if not code:
+			return set()
+		amounts = self.amounts
+		return {i for i, slot_code in enumerate(self.ids) if slot_code == code and 0 < amounts[i] < stack}
+
+	def get(self, item_type: ItemType, inverse: bool = False, only_empty: bool = False) -> list[tuple[int, Slot]]:
+		"""
+		Извлекает из инвентаря слоты определенного типа предметов.
+
+		Аргументы:
+			item_type (ItemType): Тип предмета, для которого нужно получить слоты.
+			inverse (bool, optional): Возвращает все ячейки других типов. По умолчанию False.
+			only_empty (bool, optional): Возвращает только пустые ячейки. По умолчанию False.
+
+		Возвращается:
+			list: Список кортежей, содержащих индекс и слот соответствующих слотов.
+		"""
+		marks = self.free_marks if only_empty else self.types
+		return [
+			(i, SlotView(self, i)) for i, mark in enumerate(marks)
+			if mark != self.FULL and (mark == item_type) != inverse
+		]
+
+	def type_indices(self, item_type: ItemType) -> list[int] | range:
+		""" Возвращает номера слотов определённого типа. """
+		return range(len(self.types)) if item_type == ItemType.ITEM else range(0)
+
+	def free_slot(self, item_type: ItemType) -> int | None:
+		"""
+		Возвращает номер первого пустого слота определённого типа.
+
+		Аргументы:
+			item_type (ItemType): Тип слота.
+
+		Возвращается:
+			int | None: Номер слота или None, если пустых слотов нет.
+		"""
+		i = self.free_marks.find(item_type, self.free_hint.get(item_type, 0))
+		self.free_hint[item_type] = len(self.free_marks) if i == -1 else i
+		return None if i == -1 else i
+
+
+def create_inventory(is_carrier: bool = True, size: int = 10) -> Inventory:
+	"""
+	Создаёт инвентарь. Большие хранилища создаются на массивах (см. CompactInventory).
+
+	Аргументы:
+		is_carrier (bool, optional): True - инвентарь игрока, False - хранилища. По умолчанию True.
+		size (int, optional): Размер инвентаря. По умолчанию 10.
+	"""
+	if not is_carrier and size >= COMPACT_INVENTORY_SIZE:
+		return CompactInventory(size)
+	return Inventory(is_carrier, size)
+
+
+def load_inventory(data: list, is_carrier: bool = True) -> Inventory:
+	"""
+	Создаёт инвентарь по размеру сохранения и загружает его. Хранилища от COMPACT_INVENTORY_SIZE слотов создаются
+	на массивах (см. create_inventory).
+
+	Аргументы:
+		data (list): Данные сохранения инвентаря (см. Inventory.save).
+		is_carrier (bool, optional): True - инвентарь игрока, False - хранилища. По умолчанию True.
+	"""
+	size = len(data) - len(EQUIPMENT_SLOTS) if is_carrier else len(data)
+	inventory = create_inventory(is_carrier, max(size, 10))
+	inventory.load(data)
+	return inventory
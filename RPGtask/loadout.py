@@ -0,0 +1,184 @@
+from heapq import nlargest
+
+from .inventory import Inventory, Item, ItemType
+from .player import SkillType
+from .utils import get_item, item_bonus_vector
+
+EQUIPMENT_TYPES = (
+	ItemType.HELMET, ItemType.BREASTPLATE, ItemType.LEGGINGS, ItemType.BOOTS,
+	ItemType.WEAPON, ItemType.RING, ItemType.AMULET,
+)
+
+
+class Candidate:
+	"""
+	Предмет, который можно надеть.
+
+	Параметры:
+		item (Item): Предмет.
+		copies (int): Количество экземпляров предмета в инвентаре, включая надетые.
+
+	Атрибуты:
+		bonus (list[float]): Прибавка предмета к множителю опыта каждого навыка (см. utils.item_bonus_vector).
+	"""
+
+	def __init__(self, item: Item, copies: int):
+		self.item = item
+		self.copies = copies
+		self.bonus = item_bonus_vector(item)
+
+	def score(self, skills: list[SkillType]) -> float:
+		""" Прибавка предмета к сумме множителей выбранных навыков. """
+		return sum(self.bonus[skill] for skill in skills)
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return f"<Candidate {self.copies}x{self.item.id!r}>"
+
+
+class LoadoutOptimizer:
+	"""
+	Подбор снаряжения, при котором сумма множителей опыта выбранных навыков (см. utils.calculate_item_bonus)
+	максимальна.
+
+	Множитель навыка складывается из прибавок надетых предметов, поэтому вклад каждого слота не зависит
+	от остальных. Вместо перебора всех комбинаций для каждого типа слота достаточно выбрать лучшие предметы
+	из отсортированного списка кандидатов, учитывая количество экземпляров (например, два одинаковых кольца).
+
+	Параметры:
+		inventory (Inventory): Инвентарь игрока.
+
+	Атрибуты:
+		candidates (dict[ItemType, list[Candidate]]): Предметы, которые можно надеть в слот каждого типа.
+		by_skill (dict[ItemType, list[list[Candidate]]]): Кандидаты, отсортированные по убыванию прибавки
+			к каждому навыку. Индекс списка — тип навыка.
+
+	Методы:
+		best(skills) -> dict[int, str | None]: Лучшее снаряжение для выбранных навыков.
+		apply(plan) -> list[int]: Надевает подобранное снаряжение.
+	"""
+
+	def __init__(self, inventory: Inventory):
+		self.inventory = inventory
+		self.candidates: dict[ItemType, list[Candidate]] = {}
+		self.by_skill: dict[ItemType, list[list[Candidate]]] = {}
+
+		# Сначала учитываются надетые предметы, чтобы при равной прибавке они оставались на месте
+		copies: dict[str, int] = {}
+		for item_type in (*EQUIPMENT_TYPES, ItemType.ITEM):
+			for _, slot in inventory.get(item_type):
+				if not slot.empty:
+					copies[slot.id] = copies.get(slot.id, 0) + slot.amount
+
+		for identifier, amount in copies.items():
+			item = get_item(identifier)
+			if item.type in EQUIPMENT_TYPES:
+				self.candidates.setdefault(item.type, []).append(Candidate(item, amount))
+
+		for item_type, candidates in self.candidates.items():
+			self.by_skill[item_type] = [
+				sorted(candidates, key=lambda candidate: candidate.bonus[skill], reverse=True) for skill in SkillType
+			]
+
+	def ranked(self, item_type: ItemType, skills: list[SkillType], count: int) -> list[Candidate]:
+		"""
+		Лучшие кандидаты для слотов одного типа. Предметы с отрицательной прибавкой не надеваются.
+
+		Аргументы:
+			item_type (ItemType): Тип слота.
+			skills (list[SkillType]): Навыки, для которых подбирается снаряжение.
+			count (int): Количество слотов этого типа.
+		"""
+		candidates = self.candidates.get(item_type, [])
+
+		if len(skills) == 1:
+			ranked = self.by_skill[item_type][skills[0]] if candidates else []
+		else:
+			# Каждый кандидат занимает не больше count слотов, поэтому хватит count лучших
+			ranked = nlargest(count, candidates, key=lambda candidate: candidate.score(skills))
+
+		chosen = []
+		for candidate in ranked:
+			if len(chosen) == count or candidate.score(skills) <= 0:
+				break
+			chosen.extend([candidate] * min(candidate.copies, count - len(chosen)))
+		return chosen
+
+	def best(self, skills: list[SkillType] | None = None) -> dict[int, str | None]:
+		"""
+		Лучшее снаряжение для выбранных навыков. Уже надетые предметы из решения остаются в своих слотах.
+
+		Аргументы:
+			skills (list[SkillType] | None): Навыки. По умолчанию все навыки.
+
+		Возвращается:
+			dict[int, str | None]: Номер слота снаряжения и идентификатор предмета, который должен быть в нём надет.
+		"""
+		skills = list(dict.fromkeys(skills)) if skills else list(SkillType)
+		plan: dict[int, str | None] = {}
+
+		for item_type in EQUIPMENT_TYPES:
+			indices = list(self.inventory.type_indices(item_type))
+			wanted = [candidate.item.id for candidate in self.ranked(item_type, skills, len(indices))]
+
+			free = []
+			for i in indices:
+				slot = self.inventory.slots[i]
+				if not slot.empty and slot.id in wanted:
+					wanted.remove(slot.id)
+					plan[i] = slot.id
+				else:
+					free.append(i)
+
+			for i in free:
+				plan[i] = wanted.pop(0) if wanted else None
+		return plan
+
+	def apply(self, plan: dict[int, str | None]) -> list[int]:
+		"""
+		Надевает подобранное снаряжение. Снятые предметы перекладываются на место надетых или в пустые слоты.
+		Если места для снятого предмета нет, то он остаётся надетым.
+
+		Аргументы:
+			plan (dict[int, str | None]): Результат best().
+
+		Возвращается:
+			list[int]: Номера изменившихся слотов.
+		"""
+		inventory = self.inventory
+		changed = []
+
+		# Сначала надеваются предметы: это может освободить место для тех, что нужно снять
+		for i, identifier in sorted(plan.items(), key=lambda pair: pair[1] is None):
+			slot = inventory.slots[i]
+			if (slot.id if not slot.empty else None) == identifier:
+				continue
+
+			if identifier is None:
+				target = inventory.free_slot(ItemType.ITEM)
+			else:
+				target = next(
+					(j for j, source in inventory.get(ItemType.ITEM) if not source.empty and source.id == identifier),
+					None
+				)
+			if target is None:
+				continue
+
+			source = inventory.slots[target]
+			if source.amount > 1:
+				# Из стопки берётся один предмет, а снятый кладётся в свободный слот
+				free = inventory.free_slot(ItemType.ITEM)
+				if not slot.empty and free is None:
+					continue
+				if not slot.empty:
+					inventory.slots[free].swap(slot)
+					changed.append(free)
+				source.amount -= 1
+				slot.set(identifier)
+			else:
+				source.swap(slot)
+			changed.extend((i, target))
+
+		if changed:
+			inventory.mark(*changed)
+		return sorted(set(changed))
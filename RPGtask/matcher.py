@@ -0,0 +1,122 @@
+from functools import lru_cache
+
+from .player import SKILL_DESCRIPTIONS, SKILL_ALIASES, SkillType
+
+
+def bounded_distance(a: str, b: str, limit: int) -> int:
+	"""
+	Расстояние Дамерау-Левенштейна (с ограничением: каждая подстрока редактируется не больше одного раза).
+	Подсчёт прекращается, как только расстояние гарантированно превысит limit.
+
+	Аргументы:
+		a (str): Первая строка.
+		b (str): Вторая строка.
+		limit (int): Максимальное интересующее расстояние.
+
+	Возвращается:
+		int: Расстояние или limit + 1, если оно больше limit.
+	"""
+	if abs(len(a) - len(b)) > limit:
+		return limit + 1
+
+	before: list[int] = []
+	previous = list(range(len(b) + 1))
+	for i in range(1, len(a) + 1):
+		char = a[i - 1]
+		current = [i] + [0] * len(b)
+
+		for j in range(1, len(b) + 1):
+			other = b[j - 1]
+			value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+			if i > 1 and j > 1 and char == b[j - 2] and a[i - 2] == other:
+				value = min(value, before[j - 2] + 1)
+			current[j] = value
+
+		# Значения следующих строк не меньше минимума текущей
+		if min(current) > limit:
+			return limit + 1
+		before, previous = previous, current
+
+	return min(previous[-1], limit + 1)
+
+
+class SkillMatcher:
+	"""
+	Распознавание навыков по названию с учётом опечаток. Названия нормализуются один раз при добавлении,
+	а результаты для уже встречавшихся слов запоминаются.
+
+	Из подходящих названий выбирается ближайшее. При равном расстоянии побеждает название, добавленное раньше:
+	сначала русские названия навыков (SKILL_DESCRIPTIONS), затем псевдонимы (SKILL_ALIASES).
+
+	Параметры:
+		max_distance (int): Допустимое количество опечаток. Для коротких названий не больше половины их длины.
+		cache_size (int): Количество запоминаемых слов.
+
+	Атрибуты:
+		names (dict[str, SkillType]): Нормализованные названия и псевдонимы навыков.
+
+	Методы:
+		add(name, skill): Добавляет название навыка.
+		match(text) -> SkillType | None: Распознаёт навык.
+	"""
+
+	def __init__(self, max_distance: int = 2, cache_size: int = 4096):
+		self.max_distance = max_distance
+		self.names: dict[str, SkillType] = {}
+		self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+		for skill, name in SKILL_DESCRIPTIONS.items():
+			self.add(name, skill)
+		for skill, aliases in SKILL_ALIASES.items():
+			for alias in aliases:
+				self.add(alias, skill)
+
+	@staticmethod
+	def normalize(text: str) -> str:
+		""" Приводит название к виду, в котором оно сравнивается. """
+		return text.strip().lower().replace('ё', 'е')
+
+	def add(self, name: str, skill: SkillType):
+		"""
+		Добавляет название навыка. Если название уже занято, то оно остаётся за прежним навыком.
+
+		Аргументы:
+			name (str): Название или псевдоним.
+			skill (SkillType): Навык.
+		"""
+		self.names.setdefault(self.normalize(name), skill)
+		self.lookup.cache_clear()
+
+	def match(self, text: str) -> SkillType | None:
+		"""
+		Распознаёт навык по ближайшему названию.
+
+		Аргументы:
+			text (str): Название навыка, возможно с опечатками.
+
+		Возвращается:
+			SkillType | None: Навык или None, если подходящего названия нет.
+		"""
+		return self.lookup(self.normalize(text))
+
+	def _lookup(self, token: str) -> SkillType | None:
+		""" Поиск ближайшего названия для нормализованного слова. """
+		skill = self.names.get(token)
+		if skill is not None or not token:
+			return skill
+
+		best_distance = self.max_distance + 1
+		for name, candidate in self.names.items():
+			limit = min(best_distance - 1, self.max_distance, len(name) // 2)
+			if abs(len(name) - len(token)) > limit:
+				continue
+
+			distance = bounded_distance(token, name, limit)
+			if distance <= limit:
+				skill, best_distance = candidate, distance
+				if distance == 1:  # Точное совпадение уже проверено, ближе не бывает
+					break
+		return skill
+
+
+skill_matcher = SkillMatcher()
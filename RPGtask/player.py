@@ -32,6 +32,7 @@ RANK_DESCRIPTIONS = {
 	RankType.A: ('A', 120),
 	RankType.S: ('S', 200),
 }
+RANK_BY_NAME = {data[0]: rank for rank, data in RANK_DESCRIPTIONS.items()}
 
 
 class SkillType(IntEnum):
@@ -62,15 +63,34 @@ SKILL_DESCRIPTIONS = {
 	SkillType.CRAFT: 'Ремесло'
 }
 
+# Дополнительные названия навыков, которые распознаются при добавлении заданий (см. matcher.SkillMatcher).
+SKILL_ALIASES = {
+	SkillType.INTELLECT: ('intellect',),
+	SkillType.SCIENCE: ('science',),
+	SkillType.LANGUAGES: ('languages', 'язык'),
+	SkillType.ART: ('art', 'творчество'),
+	SkillType.POWER: ('power', 'strength'),
+	SkillType.ENDURANCE: ('endurance',),
+	SkillType.FINANCE: ('finance', 'деньги'),
+	SkillType.CRAFT: ('craft',),
+}
+
 
 class Gold:
 	def __init__(self):
 		self.gold: float = 0
+		self.version: int = 0
+
+	def add(self, amount: float):
+		""" Прибавляет деньги. """
+		self.gold += amount
+		self.version += 1
 
 	def payment(self, amount: float):
 		""" Отнимает деньги.  """
 		self.gold -= amount
 		self.gold = self.gold if self.gold > 0 else 0
+		self.version += 1
 
 	def __repr__(self):
 		""" Возвращает строковое представление объекта. """
@@ -83,6 +103,7 @@ class Skill:
 
 		self.level: int = 0
 		self.exp: float = 0
+		self.version: int = 0
 
 	def save(self) -> tuple[int, float]:
 		""" Возвращает данные для сохранения навыка. """
@@ -91,11 +112,23 @@ class Skill:
 	def load(self, data: tuple[int, float]):
 		""" Загружает данные навыка. """
 		self.level, self.exp = data
+		self.version += 1
+
+	def add_exp(self, amount: float):
+		""" Прибавляет опыт. """
+		self.exp += amount
+		self.version += 1
 
 	def reduce_exp(self, amount: float):
 		""" Отнимает опыт. """
 		self.exp -= amount
 		self.exp = self.exp if self.exp > 0 else 0
+		self.version += 1
+
+	def level_up(self):
+		""" Повышает уровень навыка. """
+		self.level += 1
+		self.version += 1
 
 	def __repr__(self):
 		""" Возвращает строковое представление объекта. """
@@ -109,6 +142,7 @@ class GuildProfile:
 		self.experience: int = 0
 
 		self.shops: dict[str, list[str] | str] = {}
+		self.version: int = 0
 
 	def save(self) -> tuple[str, int, int, dict]:
 		""" Возвращает данные для сохранения профиля. """
@@ -117,10 +151,22 @@ class GuildProfile:
 	def load(self, data: tuple[str, int, int, dict]):
 		""" Загружает данные профиля. """
 		self.name, self.rank, self.experience, self.shops = data
+		self.version += 1
+
+	def register(self, name: str):
+		""" Регистрирует игрока в гильдии. """
+		self.name = name
+		self.version += 1
+
+	def set_shops(self, shops: dict[str, list[str] | str]):
+		""" Задаёт ассортимент магазинов гильдии. """
+		self.shops = shops
+		self.version += 1
 
 	def add_experience(self) -> bool:
 		""" Прибавляет опыт, изменяет ранг. """
 		self.experience += 1
+		self.version += 1
 
 		if self.experience >= RankType.experience(self.rank):
 			if RankType.S == self.rank:
@@ -168,6 +214,11 @@ class Player:
 		""" Считает сумму всех уровней навыков. """
 		return sum(skill.level for skill in self.skills)
 
+	@property
+	def version(self) -> int:
+		""" Номер версии данных игрока. Увеличивается при каждом изменении золота, навыков или профиля. """
+		return self.gold.version + self.profile.version + sum(skill.version for skill in self.skills)
+
 	def __repr__(self):
 		""" Возвращает строковое представление объекта. """
 		return f"<Player gold={self.gold.gold} rank={self.profile.rank} experience={self.profile.experience}>"
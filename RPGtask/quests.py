@@ -215,8 +215,15 @@ class QuestManager:
 	Аргументы:
 		quests (list[Quest]): Список всех квестов. По умолчанию пустой список.
 		active_quests (list[QuestState]): Список активных квестов. По умолчанию пустой список.
+		version (int): Номер версии состояния квестов. Увеличивается при каждом изменении.
+
+		index (dict[str, Quest]): Квесты по идентификатору.
+		rank_index (dict[RankType, list[Quest]]): Квесты по рангу.
+		guild_index (dict[RankType, list[Quest]]): Квесты гильдии по рангу.
 
 	Методы:
+		add_quests(quests): Добавляет квесты в каталог и индексы.
+		get_guild_quests(min_rank, max_rank): Возвращает квесты гильдии в промежутке рангов.
 		save(): Сохраняет идентификатор и состояние квестов.
 		load(data): Загружает идентификатор и состояние квестов.
 		start_quest(identifier): Начинает квест по идентификатору.
@@ -229,6 +236,28 @@ class QuestManager:
 	def __init__(self):
 		self.quests: list[Quest] = []
 		self.active_quests: list[QuestState] = []
+		self.version: int = 0
+
+		self.index: dict[str, Quest] = {}
+		self.rank_index: dict[RankType, list[Quest]] = {rank: [] for rank in RankType}
+		self.guild_index: dict[RankType, list[Quest]] = {rank: [] for rank in RankType}
+
+	def add_quests(self, quests: list[Quest]):
+		""" Добавляет квесты в каталог и индексы. """
+		self.quests.extend(quests)
+
+		for quest in quests:
+			self.index[quest.id] = quest
+			self.rank_index[quest.rank].append(quest)
+			if quest.in_guild:
+				self.guild_index[quest.rank].append(quest)
+
+	def get_guild_quests(self, min_rank: int, max_rank: int) -> list[Quest]:
+		""" Возвращает квесты гильдии, ранг которых находится в промежутке [min_rank, max_rank]. """
+		quests = []
+		for rank in range(max(min_rank, RankType.F), min(max_rank, RankType.S) + 1):
+			quests.extend(self.guild_index[RankType(rank)])
+		return quests
 
 	def save(self) -> dict[str, bool | tuple[list[int], int, list[bool]]]:
 		""" Возвращает идентификатор и состояние квестов. """
@@ -237,6 +266,7 @@ class QuestManager:
 	def load(self, data: dict[str, bool | list[list[str | int] | list[Any] | Any]]):
 		""" Загружает идентификатор и состояние квестов. """
 		self.active_quests = []
+		self.version += 1
 
 		for identifier, state in data.items():
 			new_state = QuestState(self.get_quest(identifier))
@@ -246,6 +276,7 @@ class QuestManager:
 	def start_quest(self, identifier: str):
 		""" Начинает квест по идентификатору. """
 		self.active_quests.append(QuestState(self.get_quest(identifier)))
+		self.version += 1
 
 	def complete_goal(self, num: int):
 		""" Выполняет задание из активного квеста по номеру. """
@@ -253,17 +284,19 @@ class QuestManager:
 			raise ValueError(f"Goal {num} not found")
 
 		self.active_quests[0].complete(num)
+		self.version += 1
 
 	def add_damage(self, damage: int):
 		if self.quest_been_launched() and self.active_quests[0].check_boss_fight():
 			self.active_quests[0].add_damage(damage)
+			self.version += 1
 
 	def get_quest(self, identifier: str) -> Quest:
 		""" Возвращает квест по идентификатору. """
-		for quest in self.quests:
-			if quest.id == identifier:
-				return quest
-		raise ValueError(f"Quest {identifier} not found")
+		try:
+			return self.index[identifier]
+		except KeyError:
+			raise ValueError(f"Quest {identifier} not found") from None
 
 	def is_done(self) -> bool:
 		""" Проверяет выполнено ли задание. """
@@ -278,6 +311,7 @@ class QuestManager:
 	def clear_active_quest(self):
 		""" Удаляет квесты из активных. """
 		self.active_quests = []
+		self.version += 1
 
 	def __repr__(self):
 		""" Возвращает строковое представление объекта. """
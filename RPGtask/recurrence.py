@@ -0,0 +1,190 @@
+from calendar import monthrange
+from datetime import date
+
+WEEKDAY_NAMES = ('пн', 'вт', 'ср', 'чт', 'пт', 'сб', 'вс')
+WEEKDAY_ALIASES = {name: num for num, name in enumerate(WEEKDAY_NAMES)} | {
+	name: num for num, name in enumerate(('mo', 'tu', 'we', 'th', 'fr', 'sa', 'su'))
+}
+WEEKDAYS_MASK = 0b0011111  # С понедельника по пятницу
+WEEKENDS_MASK = 0b1100000
+
+
+def weekday(day: int) -> int:
+	""" День недели по порядковому номеру даты (date.toordinal). Понедельник — 0. """
+	return (day - 1) % 7
+
+
+def month_occurrence(year: int, month: int, day_of_month: int) -> int:
+	""" Порядковый номер даты в месяце. Если в месяце меньше дней, то берётся последний день месяца. """
+	return date(year, month, min(day_of_month, monthrange(year, month)[1])).toordinal()
+
+
+class Recurrence:
+	"""
+	Правило повторения ежедневного задания. Даты хранятся порядковыми номерами (date.toordinal).
+
+	Виды правил:
+		'daily': каждый день.
+		'weekly': по дням недели из маски value (бит 0 — понедельник). Будни — частный случай.
+		'every': каждые value дней, начиная с даты anchor.
+		'monthly': каждый месяц value-го числа, в коротких месяцах — последнего числа.
+
+	Атрибуты:
+		kind (str): Вид правила.
+		value (int): Параметр правила.
+		anchor (int | None): Дата, от которой отсчитывается правило 'every'.
+
+	Методы:
+		parse(text): Разбирает правило из строки задания.
+		load(data): Создаёт правило из сохранённых данных.
+		save(): Возвращает данные для сохранения правила.
+		anchored(day): Правило, привязанное к дате.
+		next_due(day): Ближайшая дата повторения, начиная с day.
+		count(start, end): Количество повторений в промежутке [start, end).
+		flag(): Флаг правила для строки задания.
+	"""
+
+	def __init__(self, kind: str = 'daily', value: int = 1, anchor: int | None = None):
+		self.kind = kind
+		self.value = value
+		self.anchor = anchor
+
+	@classmethod
+	def parse(cls, text: str) -> 'Recurrence | None':
+		"""
+		Разбирает правило из строки задания: "будни", "выходные", "3д" (каждые 3 дня), "пн,ср,пт" или "15м"
+		(каждое 15-е число). Английские варианты: "weekdays", "weekends", "3d", "mo,we,fr", "15m".
+
+		Возвращается:
+			Recurrence | None: Правило или None, если строку не удалось разобрать.
+		"""
+		text = text.strip().lower()
+
+		if text in ('будни', 'weekdays'):
+			return cls('weekly', WEEKDAYS_MASK)
+		if text in ('выходные', 'weekends'):
+			return cls('weekly', WEEKENDS_MASK)
+
+		number, suffix = text[:-1], text[-1:]
+		if number.isdigit():
+			number = int(number)
+			if suffix in ('д', 'd') and number >= 1:
+				return EVERY_DAY if number == 1 else cls('every', number)
+			if suffix in ('м', 'm') and 1 <= number <= 31:
+				return cls('monthly', number)
+			return None
+
+		mask = 0
+		for name in text.split(','):
+			num = WEEKDAY_ALIASES.get(name.strip())
+			if num is None:
+				return None
+			mask |= 1 << num
+		return cls('weekly', mask)
+
+	@classmethod
+	def load(cls, data: list | None) -> 'Recurrence':
+		""" Создаёт правило из сохранённых данных. Пустые данные — каждый день (старые сохранения). """
+		if data is None:
+			return EVERY_DAY
+		kind, value, *anchor = data
+		return cls(kind, value, date.fromisoformat(anchor[0]).toordinal() if anchor else None)
+
+	def save(self) -> list | None:
+		""" Возвращает данные для сохранения правила. Для ежедневного правила — None. """
+		if self.kind == 'daily':
+			return None
+		if self.anchor is not None:
+			return [self.kind, self.value, str(date.fromordinal(self.anchor))]
+		return [self.kind, self.value]
+
+	def anchored(self, day: int) -> 'Recurrence':
+		""" Правило, привязанное к дате. Нужно только для правила 'every', у которого ещё нет начала отсчёта. """
+		if self.kind == 'every' and self.anchor is None:
+			return Recurrence(self.kind, self.value, day)
+		return self
+
+	def next_due(self, day: int) -> int:
+		""" Ближайшая дата повторения, начиная с day (включительно). """
+		if self.kind == 'weekly':
+			for shift in range(7):
+				if self.value >> weekday(day + shift) & 1:
+					return day + shift
+			raise ValueError('Empty weekday mask')
+
+		if self.kind == 'every':
+			if day <= self.anchor:
+				return self.anchor
+			return self.anchor + -(-(day - self.anchor) // self.value) * self.value
+
+		if self.kind == 'monthly':
+			current = date.fromordinal(day)
+			due = month_occurrence(current.year, current.month, self.value)
+			if due >= day:
+				return due
+			year, month = divmod(current.year * 12 + current.month, 12)
+			return month_occurrence(year, month + 1, self.value)
+
+		return day
+
+	def count(self, start: int, end: int) -> int:
+		""" Количество повторений в промежутке [start, end). Считается без перебора дней. """
+		if end <= start:
+			return 0
+
+		if self.kind == 'weekly':
+			weeks, rest = divmod(end - start, 7)
+			return weeks * self.value.bit_count() + sum(
+				self.value >> weekday(start + shift) & 1 for shift in range(rest)
+			)
+
+		if self.kind in ('every', 'monthly'):
+			first = self.next_due(start)
+			if first >= end:
+				return 0
+			if self.kind == 'every':
+				return (end - 1 - first) // self.value + 1
+
+			# В каждом месяце ровно одно повторение: считаем месяцы от первого до последнего повторения
+			first, last = date.fromordinal(first), date.fromordinal(end - 1)
+			months = (last.year - first.year) * 12 + last.month - first.month
+			if month_occurrence(last.year, last.month, self.value) <= end - 1:
+				months += 1
+			return months
+
+		return end - start
+
+	def flag(self) -> str:
+		""" Флаг правила для строки задания (см. importer.parse_task_line). """
+		if self.kind == 'weekly':
+			if self.value == WEEKDAYS_MASK:
+				return '-e:будни'
+			if self.value == WEEKENDS_MASK:
+				return '-e:выходные'
+			return '-e:' + ','.join(name for num, name in enumerate(WEEKDAY_NAMES) if self.value >> num & 1)
+		if self.kind == 'every':
+			return f'-e:{self.value}д'
+		if self.kind == 'monthly':
+			return f'-e:{self.value}м'
+		return '-e'
+
+	def __str__(self):
+		""" Формирует удобочитаемое представление объекта. """
+		if self.kind == 'weekly':
+			if self.value == WEEKDAYS_MASK:
+				return 'по будням'
+			if self.value == WEEKENDS_MASK:
+				return 'по выходным'
+			return ', '.join(name for num, name in enumerate(WEEKDAY_NAMES) if self.value >> num & 1)
+		if self.kind == 'every':
+			return f'раз в {self.value} дн.'
+		if self.kind == 'monthly':
+			return f'{self.value}-го числа'
+		return 'каждый день'
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return f"<Recurrence kind={self.kind} value={self.value} anchor={self.anchor}>"
+
+
+EVERY_DAY = Recurrence()
@@ -0,0 +1,170 @@
+from .database import read_items
+from .inventory import Item, ItemType
+from .player import SkillType
+
+
+class ItemRegistry:
+	"""
+	Плоский реестр предметов. При первом обращении читает скомпилированный каталог content/items.yaml
+	(см. database.read_items), а объекты Item создаёт только тогда, когда предмет впервые понадобится.
+
+	Записи лежат в одном списке, отсортированном по уровню, поэтому номер записи служит плотным индексом предмета,
+	а предметы одного уровня образуют непрерывный срез.
+
+	Атрибуты:
+		records (list[dict]): Скомпилированные записи предметов, отсортированные по уровню.
+		items (list[Item | None]): Созданные предметы. None, если предмет ещё не запрашивался.
+		tiers (list[int]): Уровни предметов: 0 - первый, 1 - второй и т.д.
+		index (dict[str, int]): Плотный индекс предмета по его идентификатору.
+		tier_names (list[str]): Названия уровней в порядке первого появления в каталоге ('one', 'two', 'three').
+		bounds (dict[str, tuple[int, int]]): Границы среза для каждого уровня.
+		version (int): Номер версии реестра. Увеличивается при каждой перестройке.
+
+	Методы:
+		build(records): Строит реестр из скомпилированных записей.
+		get(identifier) -> Item: Возвращает предмет по идентификатору или индексу.
+		code(identifier) -> int: Возвращает плотный индекс предмета.
+		tier(identifier) -> int: Возвращает уровень предмета.
+		tier_items(tier_name) -> list[Item]: Возвращает предметы одного уровня.
+		ids() -> list[str]: Возвращает идентификаторы всех предметов.
+		pack(data) -> list: Заменяет идентификаторы в сохранении инвентаря на индексы.
+	"""
+
+	def __init__(self):
+		self.records: list[dict] = []
+		self.items: list[Item | None] = []
+		self.tiers: list[int] = []
+		self.index: dict[str, int] = {}
+		self.tier_names: list[str] = []
+		self.bounds: dict[str, tuple[int, int]] = {}
+
+		self.version: int = 0
+		self.built: bool = False
+
+	def build(self, records: list[dict] | None = None):
+		"""
+		Строит реестр из скомпилированных записей. Объекты Item при этом не создаются.
+
+		Аргументы:
+			records (list[dict] | None): Записи предметов (см. database.compile_item). По умолчанию каталог items.yaml.
+		"""
+		if records is None:
+			records = read_items()
+
+		self.tier_names = list(dict.fromkeys(record['tier'] for record in records))
+		tier_order = {tier_name: tier for tier, tier_name in enumerate(self.tier_names)}
+
+		self.records = sorted(records, key=lambda record: tier_order[record['tier']])
+		self.items = [None] * len(self.records)
+		self.tiers = [tier_order[record['tier']] for record in self.records]
+		self.index = {}
+		for index, record in enumerate(self.records):
+			if record['id'] in self.index:
+				raise ValueError(f"Item {record['id']!r} is defined twice")
+			self.index[record['id']] = index
+
+		self.bounds = {}
+		for index, tier in enumerate(self.tiers):
+			start, _ = self.bounds.get(self.tier_names[tier], (index, index))
+			self.bounds[self.tier_names[tier]] = (start, index + 1)
+
+		self.version += 1
+		self.built = True
+
+	@staticmethod
+	def materialize(record: dict) -> Item:
+		""" Создаёт предмет из скомпилированной записи. """
+		item = Item(record['id'], record['name'], record['description'])
+		item.set_type(ItemType(record['type']))
+		item.set_stack(record['stack'])
+
+		for action, amount in record['effects'].items():
+			if isinstance(action, int):
+				action = SkillType(action)
+			elif action == 'textbook':
+				amount = {SkillType(skill): exp for skill, exp in amount.items()}
+			item.set_effect(action, amount)
+
+		item.set_cost(record['cost'], record['sell'])
+		return item
+
+	def get(self, identifier: str | int | Item) -> Item:
+		"""
+		Возвращает предмет по идентификатору или плотному индексу.
+
+		Аргументы:
+			identifier (str | int | Item): Идентификатор, индекс или сам предмет.
+		"""
+		if isinstance(identifier, Item):
+			return identifier
+		if not self.built:
+			self.build()
+
+		if isinstance(identifier, str):
+			index = self.index.get(identifier)
+			if index is None:
+				raise ValueError(f"Item {identifier} not found")
+		else:
+			index = identifier
+
+		item = self.items[index]
+		if item is None:
+			item = self.items[index] = self.materialize(self.records[index])
+		return item
+
+	def code(self, identifier: str) -> int:
+		""" Возвращает плотный индекс предмета. """
+		if not self.built:
+			self.build()
+		return self.index[identifier]
+
+	def tier(self, identifier: str) -> int:
+		""" Возвращает уровень предмета. Для неизвестных предметов - количество уровней. """
+		if not self.built:
+			self.build()
+
+		index = self.index.get(identifier)
+		return len(self.tier_names) if index is None else self.tiers[index]
+
+	def tier_items(self, tier_name: str) -> list[Item]:
+		""" Возвращает предметы одного уровня. """
+		if not self.built:
+			self.build()
+
+		start, end = self.bounds.get(tier_name, (0, 0))
+		return [self.get(index) for index in range(start, end)]
+
+	def ids(self) -> list[str]:
+		""" Возвращает идентификаторы всех предметов в порядке плотных индексов. """
+		if not self.built:
+			self.build()
+		return [record['id'] for record in self.records]
+
+	def pack(self, data: list[list[str, int] | None]) -> list[list[str | int, int] | None]:
+		"""
+		Заменяет идентификаторы в сохранении инвентаря на плотные индексы. Inventory.load принимает оба вида.
+		Индексы зависят от каталога, поэтому такое сохранение годится только для той же версии предметов.
+		Неизвестные предметы остаются строками.
+		"""
+		if not self.built:
+			self.build()
+
+		index = self.index
+		return [
+			None if slot_data is None else [index.get(slot_data[0], slot_data[0]), slot_data[1]]
+			for slot_data in data
+		]
+
+	def __len__(self) -> int:
+		""" Количество предметов. """
+		if not self.built:
+			self.build()
+		return len(self.records)
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		created = sum(item is not None for item in self.items)
+		return f"<ItemRegistry items={len(self.records)} created={created} tiers={self.tier_names}>"
+
+
+registry = ItemRegistry()
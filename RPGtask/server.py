@@ -0,0 +1,509 @@
+"""
+Сервер RPGtask для нескольких локальных клиентов. Данные игрока постоянно находятся в памяти, а операции над ними
+доступны по JSON-RPC 2.0 через Unix сокет или TCP на localhost. Каждое сообщение - одна строка JSON.
+
+	python -m RPGtask.server --socket /tmp/rpgtask.sock
+	python -m RPGtask.server --port 8765
+
+	-> {"jsonrpc": "2.0", "id": 1, "method": "tasks.add", "params": {"line": "Полить цветочки [Ремесло]"}}
+	<- {"jsonrpc": "2.0", "id": 1, "result": {"id": 7, "daily": false, "task": "Полить цветочки", ...}}
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from contextlib import ExitStack
+from datetime import date
+from inspect import Signature, signature
+from typing import Any, Callable
+
+from .importer import TaskImporter, parse_task_line
+from .player import SkillType
+from .quests import BossFight
+from .session import Session, CompletionResult
+from .utils import get_item
+
+# Коды ошибок JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+APPLICATION_ERROR = -32000
+
+log = logging.getLogger('rpgtask.server')
+
+# Названия типов JSON для сообщений об ошибках
+JSON_TYPES = {int: 'integer', str: 'string'}
+
+
+class RPCError(Exception):
+	"""
+	Ошибка, которая возвращается клиенту в ответе JSON-RPC.
+
+	Параметры:
+		message (str): Описание ошибки.
+		code (int): Код ошибки. По умолчанию ошибка приложения.
+	"""
+
+	def __init__(self, message: str, code: int = APPLICATION_ERROR):
+		super().__init__(message)
+		self.message = message
+		self.code = code
+
+
+def check_type(name: str, value: Any, expected: type) -> Any:
+	""" Проверяет тип параметра. true и false в JSON не считаются числами. """
+	if not isinstance(value, expected) or isinstance(value, bool):
+		raise RPCError(f'{name} must be of type {JSON_TYPES[expected]}', INVALID_PARAMS)
+	return value
+
+
+def check_array(name: str, values: Any, expected: type) -> list | tuple:
+	""" Проверяет, что параметр - массив значений одного типа. Строка не считается массивом символов. """
+	if not isinstance(values, (list, tuple)) or any(
+			not isinstance(value, expected) or isinstance(value, bool) for value in values):
+		raise RPCError(f'{name} must be an array of {JSON_TYPES[expected]}s', INVALID_PARAMS)
+	return values
+
+
+class RPCServer:
+	"""
+	JSON-RPC сервер над одной сессией.
+
+	Запросы каждого соединения читаются и обрабатываются по порядку, не дожидаясь, пока клиент прочитает
+	предыдущие ответы, поэтому клиент может отправлять запросы пачкой. Обработчики синхронные и выполняются
+	в цикле событий целиком, поэтому изменения данных от разных клиентов никогда не перемешиваются.
+
+	Записи хранилища копятся в одной транзакции, которая раз в save_interval секунд фиксируется вместе
+	со снимком изменившихся данных.
+
+	Параметры:
+		session (Session): Загруженные данные игрока.
+		save_interval (float): Период сохранения данных в секундах.
+
+	Атрибуты:
+		methods (dict[str, Callable]): Обработчики по имени метода.
+		signatures (dict[str, Signature]): Сигнатуры обработчиков. По ним параметры проверяются до вызова.
+		requests (int): Количество обработанных запросов.
+		connections (int): Количество открытых соединений.
+
+	Методы:
+		dispatch(message) -> dict | list | None: Обрабатывает сообщение: один запрос или пакет запросов.
+		persist(): Фиксирует накопленные изменения и сохраняет данные.
+		serve(path, host, port): Запускает сервер.
+	"""
+
+	def __init__(self, session: Session, save_interval: float = 5.0):
+		self.session = session
+		self.save_interval = save_interval
+
+		self.methods: dict[str, Callable[..., Any]] = {
+			'tasks.list': self.tasks_list,
+			'tasks.add': self.tasks_add,
+			'tasks.import': self.tasks_import,
+			'tasks.complete': self.tasks_complete,
+			'tasks.delete': self.tasks_delete,
+			'player.get': self.player_get,
+			'skills.buy': self.skills_buy,
+			'shop.list': self.shop_list,
+			'shop.buy': self.shop_buy,
+			'inventory.list': self.inventory_list,
+			'inventory.equip': self.inventory_equip,
+			'quests.active': self.quests_active,
+			'quests.start': self.quests_start,
+			'server.save': self.server_save,
+			'server.stats': self.server_stats,
+		}
+
+		self.signatures: dict[str, Signature] = {name: signature(handler) for name, handler in self.methods.items()}
+
+		self.requests: int = 0
+		self.connections: int = 0
+		self.started: float = time.monotonic()
+		self.transaction: ExitStack | None = None
+
+	# Протокол #
+
+	def dispatch(self, message: Any) -> dict | list | None:
+		""" Обрабатывает сообщение: один запрос или пакет запросов. На уведомления (без id) ответ не отправляется. """
+		if isinstance(message, list):
+			if not message:
+				return self.error(None, INVALID_REQUEST, 'Empty batch')
+			responses = [response for request in message if (response := self.call(request)) is not None]
+			return responses or None
+		return self.call(message)
+
+	def call(self, request: Any) -> dict | None:
+		""" Выполняет один запрос. """
+		if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' or not isinstance(request.get('method'), str):
+			return self.error(request.get('id') if isinstance(request, dict) else None, INVALID_REQUEST,
+							  'Invalid request')
+
+		identifier = request.get('id')
+		handler = self.methods.get(request['method'])
+		params = request.get('params', {})
+		self.requests += 1
+
+		try:
+			if handler is None:
+				raise RPCError(f"Method {request['method']!r} not found", METHOD_NOT_FOUND)
+			if isinstance(params, dict):
+				args, kwargs = (), params
+			elif isinstance(params, list):
+				args, kwargs = params, {}
+			else:
+				raise RPCError('Params must be an object or an array', INVALID_PARAMS)
+
+			# Несовпадение с сигнатурой проверяется до вызова, чтобы TypeError внутри обработчика не выдавался
+			# за ошибку параметров
+			try:
+				self.signatures[request['method']].bind(*args, **kwargs)
+			except TypeError as e:
+				raise RPCError(str(e), INVALID_PARAMS)
+
+			result = handler(*args, **kwargs)
+		except RPCError as e:
+			return self.error(identifier, e.code, e.message) if 'id' in request else None
+		except (ValueError, KeyError, IndexError) as e:
+			return self.error(identifier, APPLICATION_ERROR, str(e)) if 'id' in request else None
+		except Exception as e:
+			# Ошибка в обработчике не должна обрывать соединение и запросы, которые пришли следом
+			log.exception('Internal error in %s', request['method'])
+			return self.error(identifier, INTERNAL_ERROR, f'Internal error: {e}') if 'id' in request else None
+
+		if 'id' not in request:
+			return None
+		return {'jsonrpc': '2.0', 'id': identifier, 'result': result}
+
+	@staticmethod
+	def error(identifier: Any, code: int, message: str) -> dict:
+		""" Ответ с ошибкой. """
+		return {'jsonrpc': '2.0', 'id': identifier, 'error': {'code': code, 'message': message}}
+
+	async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		""" Обслуживает одно соединение. """
+		self.connections += 1
+		try:
+			while line := await reader.readline():
+				if not line.strip():
+					continue
+				try:
+					message = json.loads(line)
+				except ValueError:
+					response = self.error(None, PARSE_ERROR, 'Parse error')
+				else:
+					response = self.dispatch(message)
+
+				if response is not None:
+					writer.write(json.dumps(response, ensure_ascii=False).encode() + b'\n')
+					# Ждёт только если клиент не успевает читать ответы
+					await writer.drain()
+		except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+			pass
+		finally:
+			self.connections -= 1
+			writer.close()
+
+	# Сохранение #
+
+	def begin(self):
+		""" Открывает транзакцию хранилища, в которой копятся записи до следующего сохранения. """
+		self.transaction = ExitStack()
+		self.transaction.enter_context(self.session.storage.transaction())
+
+	def persist(self):
+		""" Фиксирует накопленные изменения и сохраняет данные. Новый день начинается здесь же. """
+		if self.transaction is not None:
+			self.transaction.close()
+
+		self.session.start_day()
+		self.session.save()
+		self.begin()
+
+	async def autosave(self):
+		""" Периодически сохраняет данные. """
+		while True:
+			await asyncio.sleep(self.save_interval)
+			self.persist()
+
+	async def serve(self, path: str | None = None, host: str = '127.0.0.1', port: int = 8765):
+		"""
+		Запускает сервер и работает до SIGINT или SIGTERM.
+
+		Аргументы:
+			path (str | None): Путь до Unix сокета. Если не указан, то используется TCP.
+			host (str): Адрес для TCP.
+			port (int): Порт для TCP.
+		"""
+		limit = 16 * 1024 * 1024  # Пакеты запросов могут быть большими
+		if path is not None:
+			if os.path.exists(path):
+				os.remove(path)
+			server = await asyncio.start_unix_server(self.handle, path=path, limit=limit)
+		else:
+			server = await asyncio.start_server(self.handle, host, port, limit=limit)
+
+		stop = asyncio.Event()
+		loop = asyncio.get_running_loop()
+		for signum in (signal.SIGINT, signal.SIGTERM):
+			try:
+				loop.add_signal_handler(signum, stop.set)
+			except (NotImplementedError, RuntimeError):  # Windows
+				pass
+
+		self.begin()
+		autosave = asyncio.create_task(self.autosave())
+		try:
+			async with server:
+				await server.start_serving()
+				await stop.wait()
+		finally:
+			autosave.cancel()
+			self.persist()
+			self.transaction.close()
+			if path is not None and os.path.exists(path):
+				os.remove(path)
+
+	# Методы #
+
+	def tasks_list(self) -> dict:
+		""" Все задания. """
+		session = self.session
+		return {
+			'tasks': [
+				{'id': task.id, 'task': task.task, 'skills': task.skills or []}
+				for task in session.task_manager.tasks.values()
+			],
+			'daily_tasks': [
+				{'id': task.id, 'task': task.task, 'skills': task.skills or [], 'done': task.done,
+				 'rule': task.rule.flag(), 'active': task.active, 'due': str(date.fromordinal(task.due))}
+				for task in session.daily_tasks_manager.daily_tasks.values()
+			],
+			'date': session.daily_tasks_manager.date,
+		}
+
+	def tasks_add(self, line: str) -> dict:
+		""" Добавляет задание, записанное в формате "задание [навык, навык] -e". """
+		check_type('line', line, str)
+
+		session = self.session
+		parsed = parse_task_line(line)
+		if parsed.error is not None:
+			raise RPCError(parsed.error, INVALID_PARAMS)
+
+		if parsed.daily:
+			task = session.daily_tasks_manager.add_task(parsed.task, parsed.skills, parsed.rule)
+			session.record('daily_add', task.id, task.task, task.skills, task.rule.save())
+		else:
+			task = session.task_manager.add_task(parsed.task, parsed.skills)
+			session.record('task_add', task.id, task.task, task.skills)
+
+		return {'id': task.id, 'daily': parsed.daily, 'task': task.task, 'skills': task.skills or [],
+				'unknown': parsed.unknown}
+
+	def tasks_import(self, lines: list[str]) -> dict:
+		""" Добавляет много заданий за один запрос. """
+		check_array('lines', lines, str)
+
+		session = self.session
+		report = TaskImporter(session.task_manager, session.daily_tasks_manager, session.storage).import_lines(lines)
+		return {'tasks': report.tasks, 'daily_tasks': report.daily_tasks, 'errors': report.errors,
+				'warnings': report.warnings}
+
+	def tasks_complete(self, tasks: list[int] = (), daily: list[int] = (), goals: list[int] = ()) -> dict:
+		"""
+		Выполняет задания и выдаёт награды.
+
+		Аргументы:
+			tasks (list[int]): Идентификаторы пользовательских заданий.
+			daily (list[int]): Идентификаторы ежедневных заданий. Уже выполненные и не запланированные на сегодня
+				пропускаются.
+			goals (list[int]): Номера заданий активного квеста, начиная с 0.
+		"""
+		check_array('tasks', tasks, int)
+		check_array('daily', daily, int)
+		check_array('goals', goals, int)
+
+		session = self.session
+		user_tasks = [self.get_task(identifier) for identifier in dict.fromkeys(tasks)]
+
+		daily_tasks = [self.get_daily_task(identifier) for identifier in dict.fromkeys(daily)]
+		daily_tasks = [task for task in daily_tasks if task.active and not task.done]
+
+		goals = list(dict.fromkeys(goals))
+		if goals:
+			active = session.quest_manager.active_quests
+			count = len(active[0].goals) if active and not active[0].done else 0
+			wrong = [num for num in goals if not 0 <= num < count or isinstance(active[0].goals[num], BossFight)]
+			if wrong:
+				raise RPCError(f'Goals {wrong} not found')
+
+		return self.result(session.complete_tasks(user_tasks, daily_tasks, goals))
+
+	def tasks_delete(self, tasks: list[int] = (), daily: list[int] = ()) -> dict:
+		""" Удаляет задания. За удаление отнимается столько же золота и опыта, сколько дали бы задания. """
+		check_array('tasks', tasks, int)
+		check_array('daily', daily, int)
+
+		user_tasks = [self.get_task(identifier) for identifier in dict.fromkeys(tasks)]
+		daily_tasks = [self.get_daily_task(identifier) for identifier in dict.fromkeys(daily)]
+
+		gold, skills_exp = self.session.remove_tasks(user_tasks, daily_tasks)
+		return {'gold': -gold, 'exp': {int(skill.skill_type): -exp for skill, exp in skills_exp.items()}}
+
+	def player_get(self) -> dict:
+		""" Золото, навыки и профиль гильдии. """
+		return self.session.player.save()
+
+	def skills_buy(self, skill: int) -> dict:
+		""" Покупает уровень навыка. """
+		try:
+			skill_type = SkillType(check_type('skill', skill, int))
+		except ValueError:
+			raise RPCError(f'Skill {skill} not found', INVALID_PARAMS)
+
+		session = self.session
+		target = session.player.skills[skill_type]
+
+		bought = session.awards_manager.buy_skill_level(target)
+		if bought is None:
+			raise RPCError('Not enough gold')
+		if not bought:
+			raise RPCError('Not enough experience')
+
+		session.record_gold()
+		session.record_skills([target])
+		return {'level': target.level, 'gold': session.player.gold.gold}
+
+	def shop_list(self) -> dict:
+		""" Ассортимент магазинов гильдии. """
+		shops = self.session.player.profile.shops
+		return {
+			'items': [{'id': item.id, 'name': item.name, 'cost': item.cost}
+					  for item in map(get_item, shops['items'])],
+			'quests': shops['quests'],
+		}
+
+	def shop_buy(self, items: list[str]) -> dict:
+		""" Покупает предметы из магазина гильдии. Покупка проходит целиком или не проходит совсем. """
+		check_array('items', items, str)
+
+		session = self.session
+		wrong = [identifier for identifier in items if identifier not in session.player.profile.shops['items']]
+		if wrong:
+			raise RPCError(f'Items {wrong} are not sold in the shop')
+
+		bought = session.buy_items([get_item(identifier) for identifier in items])
+		if bought is None:
+			raise RPCError('Not enough gold')
+		if not bought:
+			raise RPCError('Not enough inventory space')
+		return {'gold': session.player.gold.gold}
+
+	def inventory_list(self) -> list:
+		""" Содержимое слотов инвентаря: идентификатор предмета и количество или None. """
+		return self.session.inventory.save()
+
+	def inventory_equip(self, slot: int) -> dict:
+		""" Надевает предмет из слота инвентаря (номер с 0) или снимает надетый. """
+		check_type('slot', slot, int)
+
+		session = self.session
+		if not 0 <= slot < len(session.inventory.slots):
+			raise RPCError(f'Slot {slot} not found', INVALID_PARAMS)
+
+		moved = session.toggle_equipment(slot)
+		if moved is None:
+			raise RPCError('Item cannot be worn')
+		if not moved:
+			raise RPCError('No free slot')
+		return {'inventory': session.inventory.save()}
+
+	def quests_active(self) -> dict | None:
+		""" Активный квест: текущая стадия и задания. """
+		active = self.session.quest_manager.active_quests
+		if not active:
+			return None
+
+		state = active[0]
+		goals = [] if state.done else [
+			{'boss': True, 'name': goal.name, 'hp': goal.hp, 'damage': goal.damage, 'completed': goal.completed}
+			if isinstance(goal, BossFight) else
+			{'boss': False, 'task': goal.task, 'completed': goal.completed}
+			for goal in state.goals
+		]
+		return {'id': state.quest.id, 'name': state.quest.name, 'done': state.done,
+				'stages': [len(state.done_stages), len(state.quest.stages)], 'goals': goals}
+
+	def quests_start(self, quest: str) -> dict | None:
+		""" Начинает квест из доски квестов гильдии. """
+		check_type('quest', quest, str)
+
+		session = self.session
+		if quest not in session.player.profile.shops['quests']:
+			raise RPCError(f'Quest {quest!r} is not on the board')
+		if not session.start_quest(quest):
+			raise RPCError('Previous quest is not finished')
+		return self.quests_active()
+
+	def server_save(self) -> bool:
+		""" Сохраняет данные, не дожидаясь периодического сохранения. """
+		self.persist()
+		return True
+
+	def server_stats(self) -> dict:
+		""" Статистика сервера. """
+		return {'requests': self.requests, 'connections': self.connections,
+				'uptime': round(time.monotonic() - self.started, 1)}
+
+	# Вспомогательные функции #
+
+	def get_task(self, identifier: int):
+		""" Пользовательское задание по идентификатору. """
+		task = self.session.task_manager.tasks.get(identifier)
+		if task is None:
+			raise RPCError(f'Task {identifier} not found')
+		return task
+
+	def get_daily_task(self, identifier: int):
+		""" Ежедневное задание по идентификатору. """
+		task = self.session.daily_tasks_manager.daily_tasks.get(identifier)
+		if task is None:
+			raise RPCError(f'Daily task {identifier} not found')
+		return task
+
+	@staticmethod
+	def result(result: CompletionResult) -> dict:
+		""" Награды за выполненные задания. """
+		return {
+			'gold': result.gold + result.quest_gold,
+			'exp': {int(skill.skill_type): exp for skill, exp in result.skills_exp.items()},
+			'items': [item.id for item in result.items + result.quest_items],
+			'quest': result.quest.id if result.quest is not None else None,
+			'rank_up': result.rank_up,
+			'sold': [[item.id, amount] for item, amount in result.overflow],
+		}
+
+
+def main(argv: list[str] | None = None):
+	parser = argparse.ArgumentParser(prog='python -m RPGtask.server', description='JSON-RPC сервер RPGtask.')
+	parser.add_argument('--socket', metavar='PATH', help='путь до Unix сокета')
+	parser.add_argument('--host', default='127.0.0.1', help='адрес для TCP')
+	parser.add_argument('--port', type=int, default=8765, help='порт для TCP')
+	parser.add_argument('--save-interval', type=float, default=5.0, help='период сохранения данных в секундах')
+	args = parser.parse_args(argv)
+	logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+	session = Session()
+	session.update()
+
+	server = RPCServer(session, args.save_interval)
+	asyncio.run(server.serve(args.socket, args.host, args.port))
+
+
+if __name__ == '__main__':
+	main()
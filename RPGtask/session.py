@@ -0,0 +1,483 @@
+import random
+from datetime import date
+
+from .awards import AwardsManager
+from .config import NUMBER_QUEST_STORE, NUMBER_ITEM_STORE, STORAGE_MODE
+from .daily_tasks import DailyTaskManager, DailyTask
+from .database import open_storage, read_quest
+from .inventory import Inventory, Item, ItemType, load_inventory
+from .player import Player, Skill
+from .quests import QuestManager, Quest, BossFight
+from .registry import registry
+from .tasks import TaskManager, Task
+from .utils import get_item, create_quest_item
+
+
+class CompletionResult:
+	"""
+	Итог выполнения заданий.
+
+	Атрибуты:
+		user_tasks (list[Task]): Выполненные пользовательские задания.
+		daily_tasks (list[DailyTask]): Выполненные ежедневные задания.
+		goals (list[int]): Номера выполненных заданий квеста.
+
+		gold (float): Золото за задания.
+		skills_exp (dict[Skill, float]): Опыт за задания.
+		items (list[Item]): Предметы за задания.
+
+		quest (Quest | None): Квест, который был завершён.
+		quest_gold (float): Золото за квест.
+		quest_items (list[Item]): Предметы за квест.
+		rank_up (bool): Получил ли игрок новый ранг.
+
+		overflow (list[tuple[Item, int]]): Предметы, которые не поместились в инвентарь и были проданы.
+	"""
+
+	def __init__(self, user_tasks: list[Task], daily_tasks: list[DailyTask], goals: list[int]):
+		self.user_tasks = user_tasks
+		self.daily_tasks = daily_tasks
+		self.goals = goals
+
+		self.gold: float = 0
+		self.skills_exp: dict[Skill, float] = {}
+		self.items: list[Item] = []
+
+		self.quest: Quest | None = None
+		self.quest_gold: float = 0
+		self.quest_items: list[Item] = []
+		self.rank_up: bool = False
+
+		self.overflow: list[tuple[Item, int]] = []
+
+	@property
+	def empty(self) -> bool:
+		""" True если ни одно задание не было выполнено. """
+		return not (self.user_tasks or self.daily_tasks or self.goals)
+
+	def __repr__(self):
+		""" Возвращает строковое представление объекта. """
+		return (f"<CompletionResult user_tasks={len(self.user_tasks)} daily_tasks={len(self.daily_tasks)} "
+				f"goals={len(self.goals)} gold={round(self.gold + self.quest_gold, 2)}>")
+
+
+class Session:
+	"""
+	Данные игрока и операции над ними без пользовательского интерфейса. На этом классе построены
+	Interface и пакетный режим командной строки (см. cli.py).
+
+	Параметры:
+		storage_mode (str): Режим хранения данных (см. config.STORAGE_MODE).
+
+	Аргументы:
+		awards_manager (AwardsManager): Отвечает за выдачу наград и наказаний.
+		storage (JsonStorage): Отвечает за хранение данных.
+		saved_versions (dict[str, tuple]): Версии данных на момент последнего сохранения.
+
+		player (Player): В этом классе хранится вся информация о деньгах и навыках.
+		inventory (Inventory): Через этот класс будет происходить вся работа с инвентарём.
+
+		task_manager (TaskManager): Отвечает за работу с пользовательскими заданиями.
+		daily_tasks_manager (DailyTaskManager): Отвечает за работу с ежедневными заданиями.
+		quest_manager (QuestManager): Отвечает за работу с квестами. Каталог квестов читается при первом обращении.
+
+	Методы:
+		update() -> tuple | None: Загрузка и обновление данных.
+		start_day() -> tuple | None: Обновляет магазин и ежедневные задания, если наступил новый день.
+		update_shop(today): Обновляет ассортимент магазинов гильдии.
+		task_counts() -> tuple[int, int, int]: Границы номеров заданий.
+		resolve_tasks(nums) -> tuple: Задания по номерам.
+		complete_tasks(user_tasks, daily_tasks, goals) -> CompletionResult: Выполняет задания и выдаёт награды.
+		remove_tasks(user_tasks, daily_tasks) -> tuple: Удаляет задания и наказывает за это.
+		start_quest(identifier) -> bool: Начинает квест.
+		buy_items(items) -> bool | None: Покупка предметов в магазине гильдии.
+		toggle_equipment(index) -> bool | None: Надевает или снимает предмет.
+
+		versions(): Текущие версии данных.
+		save(): Сохранение изменившихся данных.
+
+		record(op, *args): Записывает изменение данных в хранилище.
+		record_gold(): Записывает количество золота.
+		record_skills(skills): Записывает состояние навыков.
+		record_profile(): Записывает профиль гильдии.
+		record_quests(): Записывает состояние квестов.
+		record_inventory(): Записывает изменённые слоты инвентаря.
+	"""
+
+	def __init__(self, storage_mode: str = STORAGE_MODE):
+		self.awards_manager = AwardsManager(self)
+		self.storage = open_storage(storage_mode)
+		self.saved_versions: dict[str, tuple] = {}
+
+		self.player = Player()
+		self.inventory = Inventory()
+
+		self.task_manager = TaskManager()
+		self.daily_tasks_manager = DailyTaskManager()
+
+		# Сохранённое состояние квестов, пока менеджер квестов не создан
+		self.quest_data: dict = {}
+		self._quest_manager: QuestManager | None = None
+
+	@property
+	def quest_manager(self) -> QuestManager:
+		""" Менеджер квестов. Каталог квестов читается и состояние загружается при первом обращении. """
+		if self._quest_manager is None:
+			quest_manager = QuestManager()
+			quest_manager.add_quests(create_quest_item(read_quest()))
+			quest_manager.load(self.quest_data)
+
+			# Чтение каталога не изменяет данные, поэтому не должно делать их несохранёнными
+			saved = self.saved_versions.get('tasks')
+			if saved is not None and saved[2] is None:
+				self.saved_versions['tasks'] = (*saved[:2], quest_manager.version)
+			self._quest_manager = quest_manager
+		return self._quest_manager
+
+	def update(self) -> tuple[float, dict[Skill, float]] | None:
+		"""
+		Загрузка и обновление данных.
+
+		Возвращается:
+			tuple[float, dict[Skill, float]] | None: Золото и опыт, отнятые за невыполненные ежедневные задания.
+		"""
+		tasks, player_info, inventory = self.storage.load()
+
+		# Запись заданий #
+		self.task_manager.load(tasks['user_tasks'])
+		self.daily_tasks_manager.load(tasks['daily_tasks'])
+		self.quest_data, self._quest_manager = tasks['quests'], None
+
+		# Запись данных пользователя #
+		self.player.load(player_info)
+		self.inventory = load_inventory(inventory)
+
+		# Если при загрузке были применены записи журнала, то снимок устарел и должен быть записан целиком.
+		self.saved_versions = self.versions() if self.storage.is_synced() else {}
+
+		return self.start_day()
+
+	def start_day(self) -> tuple[float, dict[Skill, float]] | None:
+		"""
+		Обновляет магазин и ежедневные задания, если наступил новый день. Наказание начисляется за каждое
+		пропущенное повторение задания, в том числе в дни, когда игрок не заходил
+		(см. AwardsManager.get_penalty_missed_days).
+
+		Возвращается:
+			tuple[float, dict[Skill, float]] | None: Золото и опыт, отнятые за невыполненные ежедневные задания.
+		"""
+		today = str(date.today())
+
+		# Обновляет магазин. Промежуточные ассортименты никто не видел, поэтому за пропущенные дни он обновляется один раз.
+		if self.player.profile.shops['date'] != today:
+			self.update_shop(today)
+
+		# Проверяем, что ежедневное задание актуально.
+		if self.daily_tasks_manager.date == today:
+			return None
+
+		missed = self.daily_tasks_manager.update(today)
+		self.record('daily_update', today)
+
+		# Если предыдущие задания не были выполнены, то наказываем игрока за это.
+		if not missed:
+			return None
+
+		gold, skills_exp = self.awards_manager.get_penalty_missed_days(missed)
+
+		self.player.gold.payment(gold)
+		for skill, exp in skills_exp.items():
+			skill.reduce_exp(exp)
+
+		self.record_gold()
+		self.record_skills(skills_exp)
+		return gold, skills_exp
+
+	def update_shop(self, today: str | None = None):
+		""" Обновляет ассортимент магазинов гильдии. """
+		rank = self.player.profile.rank
+
+		quests = [quest.id for quest in self.quest_manager.get_guild_quests(rank - 1, rank + 1)]
+		items = random.sample(registry.ids(), NUMBER_ITEM_STORE)
+
+		# todo: Убрать, когда квестов станет достаточно
+		number_quest_store = NUMBER_QUEST_STORE if len(quests) > NUMBER_QUEST_STORE else len(quests)
+		quests = random.sample(quests, k=number_quest_store)
+
+		self.player.profile.set_shops({'date': today or str(date.today()), 'quests': quests, 'items': items})
+		self.record_profile()
+
+	def task_counts(self) -> tuple[int, int, int]:
+		"""
+		Границы номеров заданий: пользовательские задания нумеруются с 1, за ними идут ежедневные задания,
+		затем задания активного квеста. Совпадает с нумерацией AppConsole.print_all_task.
+
+		Возвращается:
+			tuple[int, int, int]: Номер после последнего пользовательского, ежедневного задания и задания квеста.
+		"""
+		user_tasks_count = len(self.task_manager.tasks) + 1
+		daily_tasks_count = user_tasks_count + len(self.daily_tasks_manager.daily_tasks)
+
+		goals = 0
+		for active in self.quest_manager.active_quests:
+			if not active.done:
+				goals += sum(not isinstance(goal, BossFight) for goal in active.goals)
+		return user_tasks_count, daily_tasks_count, daily_tasks_count + goals
+
+	def resolve_tasks(self, nums: set[int]) -> tuple[list[Task], list[DailyTask], list[int]]:
+		"""
+		Задания по номерам. Некорректные номера, уже выполненные и не запланированные на сегодня ежедневные задания
+		пропускаются.
+
+		Аргументы:
+			nums (set[int]): Номера заданий.
+
+		Возвращается:
+			tuple: Пользовательские задания, ежедневные задания и номера заданий квеста.
+		"""
+		user_tasks_count, daily_tasks_count, quests_count = self.task_counts()
+
+		user_tasks, daily_tasks, goals = [], [], []
+		for num in sorted(nums):
+			if 0 < num < user_tasks_count:
+				user_tasks.append(self.task_manager.get_task(num))
+
+			elif user_tasks_count <= num < daily_tasks_count:
+				task = self.daily_tasks_manager.get_task(num - user_tasks_count)
+				if task.active and not task.done:
+					daily_tasks.append(task)
+
+			elif daily_tasks_count <= num < quests_count:
+				goals.append(num - daily_tasks_count)
+
+		return user_tasks, daily_tasks, goals
+
+	def complete_tasks(self, user_tasks: list[Task], daily_tasks: list[DailyTask],
+					   goals: list[int]) -> CompletionResult:
+		"""
+		Выполняет задания и выдаёт награды.
+
+		Аргументы:
+			user_tasks (list[Task]): Пользовательские задания.
+			daily_tasks (list[DailyTask]): Ежедневные задания.
+			goals (list[int]): Номера заданий активного квеста.
+		"""
+		result = CompletionResult(user_tasks, daily_tasks, goals)
+
+		# Пользовательские задания #
+		gold, skills_exp, items = self.awards_manager.get_rewards_user_tasks(user_tasks)
+
+		self.task_manager.delete_tasks([task.id for task in user_tasks])
+		for task in user_tasks:
+			self.record('task_delete', task.id)
+
+		# Ежедневные задания #
+		gold_d, skills_exp_d, items_d = self.awards_manager.get_rewards_daily_tasks(daily_tasks)
+
+		gold += gold_d
+		items.extend(items_d)
+
+		for skill, exp in skills_exp_d.items():
+			if skill in skills_exp:
+				skills_exp[skill] += exp
+			else:
+				skills_exp[skill] = exp
+
+		self.daily_tasks_manager.complete_tasks([task.id for task in daily_tasks])
+		for task in daily_tasks:
+			self.record('daily_complete', task.id)
+
+		result.gold, result.skills_exp, result.items = gold, skills_exp, list(items)
+
+		quest_launched = self.quest_manager.quest_been_launched()
+		self.quest_manager.add_damage(len(user_tasks) + len(daily_tasks))
+
+		# Квест #
+		for num in sorted(goals, reverse=True):
+			self.quest_manager.complete_goal(num)
+
+		if self.quest_manager.is_done():
+			result.quest = self.quest_manager.active_quests[0].quest
+			rewards = result.quest.reward
+
+			result.quest_gold = rewards['gold']
+			result.quest_items = [get_item(item) for item in rewards['items']]
+
+			if self.player.profile.add_experience():
+				result.rank_up = True
+				self.update_shop()
+			self.record_profile()
+
+			gold += result.quest_gold
+			items.extend(result.quest_items)
+
+			self.quest_manager.clear_active_quest()
+
+		if quest_launched:
+			self.record_quests()
+
+		self.player.gold.add(gold)
+
+		for skill, exp in skills_exp.items():
+			skill.add_exp(exp)
+
+		result.overflow = self.inventory.take_many([(item, 1) for item in items]).overflow
+		if result.overflow:
+			self.player.gold.add(sum(item.sell * amount for item, amount in result.overflow))
+
+		self.record_gold()
+		self.record_skills(skills_exp)
+		self.record_inventory()
+		return result
+
+	def remove_tasks(self, user_tasks: list[Task], daily_tasks: list[DailyTask]) -> tuple[float, dict[Skill, float]]:
+		"""
+		Удаляет задания. За удаление отнимается столько же золота и опыта, сколько дали бы задания.
+
+		Возвращается:
+			tuple[float, dict[Skill, float]]: Отнятые золото и опыт.
+		"""
+		gold, skills_exp, _ = self.awards_manager.get_rewards_user_tasks(user_tasks, False)
+		gold_d, skills_exp_d, _ = self.awards_manager.get_rewards_daily_tasks(daily_tasks, False)
+
+		gold += gold_d
+		for skill, exp in skills_exp_d.items():
+			if skill in skills_exp:
+				skills_exp[skill] += exp
+			else:
+				skills_exp[skill] = exp
+
+		self.player.gold.payment(gold)
+		for skill, exp in skills_exp.items():
+			skill.reduce_exp(exp)
+
+		self.record_gold()
+		self.record_skills(skills_exp)
+
+		# Удаление задач #
+		self.task_manager.delete_tasks([task.id for task in user_tasks])
+		for task in user_tasks:
+			self.record('task_delete', task.id)
+
+		self.daily_tasks_manager.delete_tasks([task.id for task in daily_tasks])
+		for task in daily_tasks:
+			self.record('daily_delete', task.id)
+
+		return gold, skills_exp
+
+	def start_quest(self, identifier: str) -> bool:
+		"""
+		Начинает квест по идентификатору.
+
+		Возвращается:
+			bool: False если предыдущий квест ещё не выполнен.
+		"""
+		if self.quest_manager.quest_been_launched():
+			return False
+
+		self.quest_manager.start_quest(identifier)
+		self.record_quests()
+		return True
+
+	def buy_items(self, items: list[Item]) -> bool | None:
+		"""
+		Покупка предметов в магазине гильдии. Покупка проходит целиком или не проходит совсем.
+
+		Возвращается:
+			bool | None: True если предметы куплены, False если не хватает места, None если не хватает золота.
+		"""
+		cost = sum(item.cost for item in items)
+		if cost > self.player.gold.gold:
+			return None
+		if not self.inventory.take_many([(item, 1) for item in items], atomic=True).ok:
+			return False
+
+		self.player.gold.payment(cost)
+		self.record_gold()
+		self.record_inventory()
+		return True
+
+	def toggle_equipment(self, index: int) -> bool | None:
+		"""
+		Надевает предмет из слота инвентаря или снимает надетый предмет.
+
+		Аргументы:
+			index (int): Номер слота, начиная с 0.
+
+		Возвращается:
+			bool | None: True если предмет перемещён, False если нет свободного слота, None если слот пуст
+				или предмет нельзя надеть.
+		"""
+		slot = self.inventory.slots[index]
+		if slot.empty:
+			return None
+
+		if slot.type != ItemType.ITEM:
+			free = self.inventory.free_slot(ItemType.ITEM)
+		elif (item_type := get_item(slot.id).type) != ItemType.ITEM:
+			free = self.inventory.free_slot(item_type)
+		else:
+			return None
+
+		if free is None:
+			return False
+
+		self.inventory.slots[free].swap(slot)
+		self.inventory.mark(free, index)
+		self.record_inventory()
+		return True
+
+	def versions(self) -> dict[str, tuple]:
+		""" Текущие версии данных, сгруппированные по файлам сохранения. """
+		return {
+			'tasks': (
+				self.task_manager.version, self.daily_tasks_manager.version,
+				self._quest_manager.version if self._quest_manager is not None else None
+			),
+			'player': (self.player.version,),
+			'inventory': (self.inventory.version,),
+		}
+
+	def save(self):
+		""" Сохранение изменившихся данных. """
+		versions = self.versions()
+		dirty = {name for name, version in versions.items() if self.saved_versions.get(name) != version}
+		if not dirty:
+			return
+
+		self.storage.save(
+			{
+				'user_tasks': self.task_manager.save(),
+				'daily_tasks': self.daily_tasks_manager.save(),
+				'quests': self._quest_manager.save() if self._quest_manager is not None else self.quest_data
+			} if 'tasks' in dirty else None,
+			self.player.save() if 'player' in dirty else None,
+			self.inventory.save() if 'inventory' in dirty else None
+		)
+		self.saved_versions = versions
+
+	def record(self, op: str, *args):
+		""" Записывает изменение данных в хранилище. """
+		self.storage.append(op, *args)
+
+	def record_gold(self):
+		""" Записывает количество золота. """
+		self.record('gold', self.player.gold.gold)
+
+	def record_skills(self, skills):
+		""" Записывает состояние навыков. """
+		for skill in skills:
+			self.record('skill', skill.skill_type, skill.save())
+
+	def record_profile(self):
+		""" Записывает профиль гильдии. """
+		self.record('profile', self.player.profile.save())
+
+	def record_quests(self):
+		""" Записывает состояние квестов. """
+		self.record('quests', self.quest_manager.save())
+
+	def record_inventory(self):
+		""" Записывает изменённые слоты инвентаря. """
+		for i in self.inventory.pop_changed():
+			self.record('slot', i, self.inventory.slots[i].save())
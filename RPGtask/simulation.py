@@ -0,0 +1,224 @@
+"""
+Симуляция экономики методом Монте-Карло.
+
+Прогоняет синтетических игроков через настоящие AwardsManager и лавку навыков, чтобы подбирать константы
+из config.py не наугад. Запуск: python -m RPGtask.simulation --players 10000 --days 100
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+
+import numpy as np
+
+from .awards import AwardsManager
+from .daily_tasks import DailyTaskManager
+from .inventory import Inventory
+from .player import Player, SkillType, RankType
+from .tasks import TaskManager, Task
+
+
+class SimulationConfig:
+	"""
+	Поведение синтетических игроков.
+
+	Атрибуты:
+		user_tasks (tuple[int, int]): Сколько обычных заданий игрок выполняет за день (от, до).
+		max_skills (int): Максимальное количество навыков у задания.
+		daily_tasks (int): Количество ежедневных заданий.
+		daily_chance (float): Вероятность выполнить ежедневное задание.
+		quest_chance (float): Вероятность выполнить квест гильдии за день.
+		auto_equip (bool): Надевать ли выпавшее снаряжение в пустые слоты.
+	"""
+
+	def __init__(self, user_tasks: tuple[int, int] = (1, 5), max_skills: int = 3, daily_tasks: int = 3,
+				 daily_chance: float = 0.8, quest_chance: float = 0.1, auto_equip: bool = True):
+		self.user_tasks = user_tasks
+		self.max_skills = max_skills
+		self.daily_tasks = daily_tasks
+		self.daily_chance = daily_chance
+		self.quest_chance = quest_chance
+		self.auto_equip = auto_equip
+
+
+class SimulatedPlayer:
+	"""
+	Синтетический игрок. Заменяет Interface для AwardsManager: хранит игрока, инвентарь и менеджеры заданий.
+
+	Параметры:
+		seed (int): Зерно генератора случайных чисел игрока.
+		config (SimulationConfig): Поведение игрока.
+
+	Методы:
+		play_day(): Проживает один день: выполняет задания, получает наказания и покупает уровни навыков.
+	"""
+
+	def __init__(self, seed: int, config: SimulationConfig):
+		self.config = config
+		self.rnd = Random(seed)
+
+		self.player = Player()
+		self.inventory = Inventory()
+		self.task_manager = TaskManager()
+		self.daily_tasks_manager = DailyTaskManager()
+
+		self.awards_manager = AwardsManager(self)
+		self.awards_manager.rnd = self.rnd
+
+		for num in range(config.daily_tasks):
+			self.daily_tasks_manager.add_task(f'daily {num}', self.random_skills())
+
+	def random_skills(self) -> list[SkillType] | None:
+		""" Случайный набор навыков задания. """
+		count = self.rnd.randint(0, self.config.max_skills)
+		return self.rnd.sample(list(SkillType), count) or None
+
+	def play_day(self):
+		""" Проживает один день: выполняет задания, получает наказания и покупает уровни навыков. """
+		config, rnd, player = self.config, self.rnd, self.player
+
+		# Обычные задания #
+		tasks = [Task('task', self.random_skills(), num) for num in range(rnd.randint(*config.user_tasks))]
+		gold, skills_exp, items = self.awards_manager.get_rewards_user_tasks(tasks)
+		self.apply_rewards(gold, skills_exp, items)
+
+		# Ежедневные задания #
+		daily_tasks = list(self.daily_tasks_manager.daily_tasks.values())
+		done = [task for task in daily_tasks if rnd.random() < config.daily_chance]
+		missed = [task for task in daily_tasks if task not in done]
+
+		self.apply_rewards(*self.awards_manager.get_rewards_daily_tasks(done))
+
+		gold, skills_exp, _ = self.awards_manager.get_rewards_daily_tasks(missed, need_items=False)
+		player.gold.payment(gold)
+		for skill, exp in skills_exp.items():
+			skill.reduce_exp(exp)
+
+		# Квесты #
+		if rnd.random() < config.quest_chance:
+			player.profile.add_experience()
+
+		# Лавка навыков: покупаем самые дешёвые доступные уровни, пока хватает золота #
+		price = self.awards_manager.get_price_skill
+		while True:
+			available = [skill for skill in player.skills if price(skill.level)[0] <= skill.exp]
+			if not available:
+				break
+
+			if not self.awards_manager.buy_skill_level(min(available, key=lambda skill: skill.level)):
+				break
+
+	def apply_rewards(self, gold: float, skills_exp: dict, items: list):
+		""" Выдаёт награды так же, как Interface.mark_completion_tasks. """
+		self.player.gold.add(gold)
+		for skill, exp in skills_exp.items():
+			skill.add_exp(exp)
+
+		rest = []
+		for item in items:
+			free = self.inventory.free_slot(item.type) if self.config.auto_equip and item.is_wearable else None
+			if free is not None:
+				self.inventory.slots[free].set(item.id)
+			else:
+				rest.append((item, 1))
+
+		for item, amount in self.inventory.take_many(rest).overflow:
+			self.player.gold.add(item.sell * amount)
+
+
+def simulate_chunk(seeds: list[int], days: int, config: SimulationConfig) -> np.ndarray:
+	"""
+	Симулирует группу игроков. Выполняется в отдельном процессе.
+
+	Возвращается:
+		np.ndarray: Массив (игроки x дни x 3): золото, сумма уровней навыков и ранг в конце каждого дня.
+	"""
+	result = np.zeros((len(seeds), days, 3))
+
+	for row, seed in enumerate(seeds):
+		simulated = SimulatedPlayer(seed, config)
+		player = simulated.player
+
+		for day in range(days):
+			simulated.play_day()
+			result[row, day] = player.gold.gold, player.sum_level(), player.profile.rank
+
+	return result
+
+
+def simulate(players: int, days: int, config: SimulationConfig = None, seed: int | None = None,
+			 workers: int | None = None, chunk_size: int = 256) -> np.ndarray:
+	"""
+	Симулирует игроков в пуле процессов. У каждого игрока свой независимый поток случайных чисел,
+	поэтому при одинаковом seed результат не зависит от количества процессов.
+
+	Аргументы:
+		players (int): Количество игроков.
+		days (int): Количество дней.
+		config (SimulationConfig): Поведение игроков.
+		seed (int | None): Зерно симуляции.
+		workers (int | None): Количество процессов. По умолчанию количество ядер.
+		chunk_size (int): Количество игроков, которое обрабатывает процесс за раз.
+
+	Возвращается:
+		np.ndarray: Массив (игроки x дни x 3): золото, сумма уровней навыков и ранг в конце каждого дня.
+	"""
+	config = config or SimulationConfig()
+	seeds = [int(s.generate_state(1, np.uint64)[0]) for s in np.random.SeedSequence(seed).spawn(players)]
+	chunks = [seeds[i:i + chunk_size] for i in range(0, players, chunk_size)]
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		results = list(executor.map(simulate_chunk, chunks, [days] * len(chunks), [config] * len(chunks)))
+
+	return np.concatenate(results)
+
+
+def report(result: np.ndarray, every: int = 10) -> str:
+	""" Таблица процентилей золота и уровней и распределения рангов по дням. """
+	lines = [
+		f"{'день':>5} | {'золото p10/p50/p90':>26} | {'уровни p10/p50/p90':>20} | ранги",
+	]
+	days = result.shape[1]
+
+	for day in sorted({*range(every - 1, days, every), days - 1}):
+		gold = np.percentile(result[:, day, 0], [10, 50, 90])
+		levels = np.percentile(result[:, day, 1], [10, 50, 90])
+		ranks = np.bincount(result[:, day, 2].astype(int), minlength=RankType.S + 1)
+		ranks_str = ' '.join(f'{RankType.description(rank)}:{ranks[rank] / len(result):.0%}'
+							 for rank in RankType if ranks[rank])
+
+		lines.append(
+			f"{day + 1:>5} | {' / '.join(f'{v:.2f}' for v in gold):>26} | "
+			f"{' / '.join(f'{v:.0f}' for v in levels):>20} | {ranks_str}"
+		)
+	return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None):
+	parser = argparse.ArgumentParser(prog='python -m RPGtask.simulation', description='Симуляция экономики RPGtask.')
+	parser.add_argument('--players', type=int, default=1000, help='количество игроков')
+	parser.add_argument('--days', type=int, default=100, help='количество дней')
+	parser.add_argument('--seed', type=int, default=None, help='зерно симуляции')
+	parser.add_argument('--workers', type=int, default=os.cpu_count(), help='количество процессов')
+	parser.add_argument('--every', type=int, default=10, help='шаг таблицы в днях')
+	parser.add_argument('--user-tasks', type=int, nargs=2, default=(1, 5), metavar=('FROM', 'TO'),
+						help='сколько обычных заданий выполняется за день')
+	parser.add_argument('--daily-tasks', type=int, default=3, help='количество ежедневных заданий')
+	parser.add_argument('--daily-chance', type=float, default=0.8, help='вероятность выполнить ежедневное задание')
+	parser.add_argument('--quest-chance', type=float, default=0.1, help='вероятность выполнить квест за день')
+	args = parser.parse_args(argv)
+
+	config = SimulationConfig(tuple(args.user_tasks), daily_tasks=args.daily_tasks, daily_chance=args.daily_chance,
+							  quest_chance=args.quest_chance)
+
+	start = time.perf_counter()
+	result = simulate(args.players, args.days, config, args.seed, args.workers)
+	elapsed = time.perf_counter() - start
+
+	print(report(result, args.every))
+	print(f'\n{args.players * args.days} игроко-дней за {elapsed:.1f} с')
+
+
+if __name__ == '__main__':
+	main()
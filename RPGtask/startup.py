@@ -0,0 +1,130 @@
+"""
+Замер холодного запуска. Каждый путь запуска выполняется в новом процессе с -X importtime, поэтому в замер входит
+запуск интерпретатора, импорт модулей и загрузка данных.
+
+	python -m RPGtask.startup --repeat 5 --top 15
+
+Данные читаются в режиме хранения 'json' и никуда не записываются, поэтому замер не меняет сохранения.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Код, который выполняется в отдельном процессе для каждого пути запуска. Печатает длительность этапов в JSON.
+PATHS = {
+	'tui': """
+import time
+start = time.perf_counter()
+from RPGtask.interface import Interface
+from RPGtask.console import AppConsole
+from RPGtask.session import Session
+imported = time.perf_counter()
+session = Session('json')
+AppConsole(session)
+session.update()
+loaded = time.perf_counter()
+""",
+	'headless': """
+import time
+start = time.perf_counter()
+import RPGtask.cli
+from RPGtask.session import Session
+imported = time.perf_counter()
+session = Session('json')
+session.update()
+loaded = time.perf_counter()
+""",
+}
+REPORT = "\nimport json; print(json.dumps({'import': imported - start, 'load': loaded - imported}))\n"
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+	"""
+	Разбирает отчёт -X importtime.
+
+	Возвращается:
+		dict[str, tuple[int, int]]: Собственное и суммарное время импорта модуля в микросекундах.
+	"""
+	modules = {}
+	for line in stderr.splitlines():
+		if not line.startswith('import time:') or 'self [us]' in line:
+			continue
+		own, cumulative, name = line[len('import time:'):].split('|')
+		modules[name.strip()] = int(own), int(cumulative)
+	return modules
+
+
+def measure(code: str) -> tuple[float, dict[str, float], dict[str, tuple[int, int]]]:
+	"""
+	Один холодный запуск.
+
+	Возвращается:
+		tuple: Полное время процесса в секундах, длительность этапов и время импорта модулей.
+	"""
+	start = time.perf_counter()
+	process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code + REPORT],
+							 capture_output=True, text=True, check=True)
+	total = time.perf_counter() - start
+
+	return total, json.loads(process.stdout.splitlines()[-1]), parse_importtime(process.stderr)
+
+
+def benchmark(path: str, repeat: int = 5) -> dict:
+	"""
+	Медианы нескольких холодных запусков.
+
+	Аргументы:
+		path (str): Путь запуска: 'tui' или 'headless'.
+		repeat (int): Количество запусков.
+	"""
+	runs = [measure(PATHS[path]) for _ in range(repeat)]
+
+	modules = {}
+	for name in runs[0][2]:
+		times = [run[2][name] for run in runs if name in run[2]]
+		modules[name] = statistics.median(t[0] for t in times), statistics.median(t[1] for t in times)
+
+	return {
+		'total': statistics.median(run[0] for run in runs),
+		'import': statistics.median(run[1]['import'] for run in runs),
+		'load': statistics.median(run[1]['load'] for run in runs),
+		'modules': modules,
+	}
+
+
+def report(results: dict[str, dict], top: int = 15) -> str:
+	""" Таблица этапов запуска и самых долгих модулей по собственному времени импорта. """
+	lines = [f"{'путь':>10} | {'процесс, мс':>11} | {'импорт, мс':>10} | {'данные, мс':>10}"]
+	for path, result in results.items():
+		lines.append(f"{path:>10} | {result['total'] * 1000:>11.1f} | {result['import'] * 1000:>10.1f} | "
+					 f"{result['load'] * 1000:>10.1f}")
+
+	for path, result in results.items():
+		lines.append(f"\n{path}: самые долгие модули (собственное / суммарное время, мс)")
+		modules = sorted(result['modules'].items(), key=lambda pair: pair[1][0], reverse=True)[:top]
+		lines.extend(f'  {own / 1000:>7.1f} / {cumulative / 1000:>7.1f}  {name}' for name, (own, cumulative) in modules)
+	return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None):
+	parser = argparse.ArgumentParser(prog='python -m RPGtask.startup', description='Замер холодного запуска RPGtask.')
+	parser.add_argument('--repeat', type=int, default=5, help='количество запусков каждого пути')
+	parser.add_argument('--top', type=int, default=15, help='сколько модулей показать')
+	parser.add_argument('--path', choices=list(PATHS), action='append', help='путь запуска. По умолчанию все')
+	parser.add_argument('--json', action='store_true', help='вывести результат в JSON')
+	args = parser.parse_args(argv)
+
+	results = {path: benchmark(path, args.repeat) for path in args.path or PATHS}
+
+	if args.json:
+		print(json.dumps({path: {key: value for key, value in result.items() if key != 'modules'}
+						  for path, result in results.items()}))
+	else:
+		print(report(results, args.top))
+
+
+if __name__ == '__main__':
+	main()
@@ -2,13 +2,14 @@ from .player import SkillType
 
 
 class Task:
-	def __init__(self, task: str, skills: list[SkillType] | None):
+	def __init__(self, task: str, skills: list[SkillType] | None, identifier: int | None = None):
 		self.task = task
 		self.skills = skills
+		self.id = identifier
 
-	def save(self) -> tuple[str, list[SkillType] | None]:
+	def save(self) -> tuple[str, list[SkillType] | None, int]:
 		""" Возвращает данные для сохранения заданий. """
-		return self.task, self.skills
+		return self.task, self.skills, self.id
 
 	def __str__(self):
 		""" Формирует удобочитаемое представление объекта. """
@@ -18,7 +19,7 @@ class Task:
 
 	def __repr__(self):
 		""" Возвращает строковое представление объекта. """
-		return f"<Task name={self.task!r} skills={len(self.skills)}>"
+		return f"<Task id={self.id} name={self.task!r} skills={len(self.skills or ())}>"
 
 
 class TaskManager:
@@ -26,44 +27,105 @@ class TaskManager:
 	Менеджер обычных заданий.
 
 	Атрибуты:
-		tasks (list[Task]): Список активных заданий.
+		tasks (dict[int, Task]): Активные задания по идентификатору в порядке добавления.
+		next_id (int): Идентификатор, который получит следующее задание.
+		version (int): Номер версии заданий. Увеличивается при каждом изменении.
 
 	Методы:
 		save(): Возвращает данные для сохранения обычных заданий.
 		load(data): Загружает данные обычных заданий.
 		add_task(name, skills): Добавляет задачу в список активных.
-		delete_task(num): Удаляет задание по номеру. Если номер некорректный вызывает ошибку.
+		add_tasks(tasks): Добавляет несколько задач в список активных.
+		delete_task(identifier): Удаляет задание по идентификатору. Если идентификатор некорректный вызывает ошибку.
+		delete_tasks(identifiers): Удаляет задания по идентификаторам.
 		get_task(num): Получение задания по номеру. Если номер некорректный вызывает ошибку.
+		ids(): Идентификаторы заданий в порядке отображения.
 		is_empty(): True если заданий нет, иначе False.
 	"""
 
 	def __init__(self):
-		self.tasks: list[Task] = []
+		self.tasks: dict[int, Task] = {}
+		self.next_id: int = 1
+		self.version: int = 0
 
-	def save(self) -> list[tuple[str, list[SkillType] | None]]:
+		# Порядок отображения заданий. Пересчитывается после удаления при первом обращении.
+		self.order: list[int] | None = []
+
+	def save(self) -> list[tuple[str, list[SkillType] | None, int]]:
 		""" Возвращает данные для сохранения обычных заданий. """
-		return [task.save() for task in self.tasks]
+		return [task.save() for task in self.tasks.values()]
 
-	def load(self, data: list[tuple[str, list[SkillType] | None]]):
-		""" Загружает данные обычных заданий. """
-		self.tasks = [Task(*task) for task in data]
+	def load(self, data: list[tuple[str, list[SkillType] | None] | tuple[str, list[SkillType] | None, int]]):
+		""" Загружает данные обычных заданий. Заданиям из старых сохранений выдаются новые идентификаторы. """
+		tasks = [Task(*task) for task in data]
+		self.next_id = max((task.id for task in tasks if task.id is not None), default=0) + 1
 
-	def add_task(self, task: str, skills: list[SkillType] = None):
-		""" Добавляет задачу в список активных. """
-		self.tasks.append(Task(task, skills or None))
+		self.tasks = {}
+		for task in tasks:
+			if task.id is None:
+				task.id = self.next_id
+				self.next_id += 1
+			self.tasks[task.id] = task
 
-	def delete_task(self, num: int) -> Task:
-		""" Удаляет задание по номеру. Если номер некорректный вызывает ошибку. """
-		if len(self.tasks) >= num:
-			return self.tasks.pop(num - 1)
-		raise ValueError(f"Task {num - 1} not found")
+		self.order = None
+		self.version += 1
+
+	def add_task(self, task: str, skills: list[SkillType] = None) -> Task:
+		""" Добавляет задачу в список активных. """
+		new_task = Task(task, skills or None, self.next_id)
+		self.next_id += 1
+
+		self.tasks[new_task.id] = new_task
+		if self.order is not None:
+			self.order.append(new_task.id)
+		self.version += 1
+		return new_task
+
+	def add_tasks(self, tasks: list[tuple[str, list[SkillType] | None]]) -> list[Task]:
+		""" Добавляет несколько задач в список активных. Версия увеличивается один раз. """
+		new_tasks = [Task(task, skills or None, self.next_id + i) for i, (task, skills) in enumerate(tasks)]
+		if not new_tasks:
+			return []
+		self.next_id += len(new_tasks)
+
+		self.tasks.update((task.id, task) for task in new_tasks)
+		if self.order is not None:
+			self.order.extend(task.id for task in new_tasks)
+		self.version += 1
+		return new_tasks
+
+	def delete_task(self, identifier: int) -> Task:
+		""" Удаляет задание по идентификатору. Если идентификатор некорректный вызывает ошибку. """
+		return self.delete_tasks([identifier])[0]
+
+	def delete_tasks(self, identifiers: list[int] | set[int]) -> list[Task]:
+		""" Удаляет задания по идентификаторам. Если идентификатор некорректный вызывает ошибку. """
+		if not identifiers:
+			return []
+
+		for identifier in identifiers:
+			if identifier not in self.tasks:
+				raise ValueError(f"Task {identifier} not found")
+
+		deleted = [self.tasks.pop(identifier) for identifier in identifiers]
+
+		self.order = None
+		self.version += 1
+		return deleted
 
 	def get_task(self, num: int) -> Task:
 		""" Получение задания по номеру. Если номер некорректный вызывает ошибку. """
-		if len(self.tasks) >= num:
-			return self.tasks[num - 1]
+		order = self.ids()
+		if len(order) >= num:
+			return self.tasks[order[num - 1]]
 		raise ValueError(f"Task {num - 1} not found")
 
+	def ids(self) -> list[int]:
+		""" Идентификаторы заданий в порядке отображения. """
+		if self.order is None:
+			self.order = list(self.tasks)
+		return self.order
+
 	def is_empty(self) -> bool:
 		""" True если заданий нет, иначе False. """
 		return not self.tasks
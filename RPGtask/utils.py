@@ -1,18 +1,13 @@
-from pyxdameraulevenshtein import damerau_levenshtein_distance
-
-from .content import all_items
 from .inventory import Item, ItemType, Inventory
-from .player import SKILL_DESCRIPTIONS, SkillType, RANK_DESCRIPTIONS
+from .matcher import skill_matcher
+from .player import SkillType, RankType, Skill
 from .quests import Quest
+from .registry import registry
 
 
 def skill_check(skill: str) -> SkillType | None:
 	""" Проверка на ошибки при записи навыков """
-	for d, correct_skill in SKILL_DESCRIPTIONS.items():
-		number = damerau_levenshtein_distance(skill.lower(), correct_skill.lower())
-		if number < 3:  # Считаем что разница в 2 символа и меньше еще нормальная
-			return d
-	return None
+	return skill_matcher.match(skill)
 
 
 def get_item(identifier: str | Item) -> Item:
@@ -22,50 +17,88 @@ def get_item(identifier: str | Item) -> Item:
 	Аргументы:
 		identifier (Union[str, Item]): идентификатор предмета.
 	"""
-	if isinstance(identifier, Item):
-		return identifier
+	return registry.get(identifier)
+
+
+def item_sort_key(item: Item) -> tuple[int, int, str]:
+	"""
+	Ключ сортировки предметов в инвентаре: тип, уровень, название.
+
+	Аргументы:
+		item (Item): предмет.
+	"""
+	return item.type, registry.tier(item.id), item.name
+
+
+def item_bonus_vector(item: Item) -> list[float]:
+	"""
+	Считает прибавку предмета к множителю опыта каждого навыка.
+
+	Аргументы:
+		item (Item): предмет.
+
+	Возвращается:
+		list[float]: Прибавка к множителю. Индекс списка — тип навыка.
+	"""
+	bonus: list[float] = [0] * len(SkillType)
 
-	if identifier in all_items['one']:
-		return all_items['one'][identifier]
-	elif identifier in all_items['two']:
-		return all_items['two'][identifier]
-	elif identifier in all_items['three']:
-		return all_items['three'][identifier]
+	for skill, effect in item.effects.items():
+		if not isinstance(skill, int):  # Эффекты использования: квесты, учебники, текст
+			continue
 
-	raise ValueError(f"Item {identifier} not found")
+		bonus[skill] += effect % 1 if effect >= 1 else effect - 1
+	return bonus
 
 
-def calculate_item_bonus(inventory: Inventory, skill: SkillType, percent: bool = False) -> int:
+def calculate_bonus_vector(inventory: Inventory) -> tuple[list[float], list[int]]:
 	"""
-	Считает бонусы предметов к навыку.
+	Считает бонусы надетых предметов ко всем навыкам.
 
 	Аргументы:
 		inventory (Inventory): объект инвентаря.
-		skill (SkillType): тип навыка, бонус к которому мы считаем.
-		percent (bool): Если True, то возвращаем результат в виде процента, иначе в десятичном виде.
+
+	Возвращается:
+		tuple: Бонусы в десятичном виде и в процентах. Индекс списка — тип навыка.
 	"""
-	result: int = int(not percent)
+	multipliers: list[float] = [1] * len(SkillType)
+	percents: list[int] = [0] * len(SkillType)
 
 	for _, slot in inventory.get(ItemType.ITEM, True):
 		if not slot.empty:
 			item = get_item(slot.id)
 
-			try:
-				if percent:
-					result += int(item.effects[skill] * 100 - 100)
-				else:
-					if item.effects[skill] >= 1:
-						result += item.effects[skill] % 1
-					else:
-						result -= 1 - item.effects[skill]
-			except KeyError:
-				continue
-	return result
+			for skill, effect in item.effects.items():
+				if isinstance(skill, int):  # Эффекты использования: квесты, учебники, текст
+					percents[skill] += int(effect * 100 - 100)
+
+			for skill, bonus in enumerate(item_bonus_vector(item)):
+				multipliers[skill] += bonus
+	return multipliers, percents
+
+
+def calculate_item_bonus(inventory: Inventory, skill: SkillType | Skill, percent: bool = False) -> int:
+	"""
+	Считает бонусы предметов к навыку. Бонусы ко всем навыкам считаются один раз и хранятся в инвентаре,
+	пока не изменится один из слотов снаряжения.
+
+	Аргументы:
+		inventory (Inventory): объект инвентаря.
+		skill (SkillType | Skill): навык или тип навыка, бонус к которому мы считаем.
+		percent (bool): Если True, то возвращаем результат в виде процента, иначе в десятичном виде.
+	"""
+	if inventory.bonus is None:
+		inventory.bonus = calculate_bonus_vector(inventory)
+
+	multipliers, percents = inventory.bonus
+	skill = skill.skill_type if isinstance(skill, Skill) else skill
+
+	return percents[skill] if percent else multipliers[skill]
 
 
 def create_quest_item(data: list[dict]) -> list[Quest]:
+	""" Создаёт квесты из скомпилированных записей (см. database.read_quest). """
 	def create_quest(quest_data: dict) -> Quest:
-		rank = [rank_t for rank_t, data in RANK_DESCRIPTIONS.items() if quest_data['rank'] == data[0]][0]
+		rank = RankType(quest_data['rank'])
 
 		return Quest(quest_data["id"], quest_data["name"], quest_data["description"], rank, quest_data['in_guild'],
 					 quest_data['stages'], quest_data['rewards'])
@@ -1,4 +1,9 @@
-from RPGtask import Interface
+import sys
 
 if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		from RPGtask.cli import main
+		sys.exit(main())
+
+	from RPGtask import Interface
 	Interface()
@@ -0,0 +1,16 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from RPGtask import database
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch) -> Path:
+	""" Папка с json файлами нового игрока, которые читаются и пишутся вместо RPGtask/data. """
+	for name, file_name in (('task_path', 'tasks.json'), ('hero_path', 'player.json'),
+							('inventory_path', 'inventory.json')):
+		shutil.copy(getattr(database, name), tmp_path / file_name)
+		monkeypatch.setattr(database, name, str(tmp_path / file_name))
+	return tmp_path
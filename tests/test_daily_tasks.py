@@ -0,0 +1,122 @@
+from random import Random
+
+import pytest
+
+from RPGtask.daily_tasks import DailyTaskManager, to_mask, iter_bits
+from RPGtask.player import SkillType
+from RPGtask.recurrence import Recurrence, WEEKENDS_MASK
+
+
+def check(manager: DailyTaskManager):
+	""" Маски и счётчик невыполненных заданий согласованы между собой и с заданиями. """
+	assert manager.completed & ~manager.active == 0
+	assert manager.remaining == (manager.active & ~manager.completed).bit_count()
+	assert manager.done == (manager.remaining == 0)
+	assert set(iter_bits(manager.active)) <= set(manager.daily_tasks)
+	assert [task.id for task in manager.not_completed()] == list(iter_bits(manager.active & ~manager.completed))
+
+
+@pytest.fixture
+def manager() -> DailyTaskManager:
+	manager = DailyTaskManager()
+	manager.load({'tasks': [], 'date': '2024-01-01'})  # Понедельник
+	return manager
+
+
+@pytest.mark.parametrize('identifiers', [[], [0], [1, 2, 3], [7, 8, 64, 1000], list(range(0, 300, 7))])
+def test_mask_round_trip(identifiers):
+	mask = to_mask(identifiers)
+	assert mask == sum(1 << identifier for identifier in set(identifiers))
+	assert list(iter_bits(mask)) == sorted(set(identifiers))
+
+
+def test_to_mask_ignores_duplicates():
+	assert to_mask([5, 5, 3]) == 0b101000
+
+
+def test_remaining_after_add_complete_delete(manager):
+	first, second, third = manager.add_tasks([('a', None), ('b', [SkillType.POWER]), ('c', None)])
+	weekend = manager.add_task('d', None, Recurrence('weekly', WEEKENDS_MASK))
+	check(manager)
+	assert manager.remaining == 3 and not manager.is_active(weekend.id)
+
+	manager.complete_tasks([first.id, second.id])
+	check(manager)
+	assert manager.remaining == 1 and first.done and not third.done
+
+	# Удаление выполненного и невыполненного задания
+	manager.delete_tasks([first.id, third.id])
+	check(manager)
+	assert manager.remaining == 0 and manager.done
+
+	# Задание, которое не нужно выполнять сегодня, не учитывается
+	manager.delete_task(weekend.id)
+	check(manager)
+	assert manager.remaining == 0
+
+	fourth = manager.add_task('e')
+	check(manager)
+	assert manager.remaining == 1 and fourth.active and not fourth.done
+
+
+def test_complete_twice_counts_once(manager):
+	task = manager.add_task('a')
+	manager.complete(task.id)
+	manager.complete(task.id)
+	check(manager)
+	assert manager.remaining == 0
+
+
+def test_complete_not_due_task_raises(manager):
+	task = manager.add_task('a', None, Recurrence('weekly', WEEKENDS_MASK))
+	with pytest.raises(ValueError):
+		manager.complete(task.id)
+	check(manager)
+
+
+def test_update_resets_and_reports_missed(manager):
+	done, missed = manager.add_tasks([('a', None), ('b', None)])
+	manager.complete(done.id)
+
+	result = manager.update('2024-01-04')
+	check(manager)
+	# Невыполненное повторение 1-го числа и повторения 2-го и 3-го
+	assert {task.id: count for task, count in result} == {done.id: 2, missed.id: 3}
+	assert manager.remaining == 2 and not done.done
+
+
+def test_update_skips_deleted_tasks_in_heap(manager):
+	weekend = manager.add_task('a', None, Recurrence('weekly', WEEKENDS_MASK))
+	manager.delete_task(weekend.id)
+
+	assert manager.update('2024-01-08') == []
+	check(manager)
+	assert manager.active == 0
+
+
+def test_random_operations_keep_masks_in_sync(manager):
+	rnd = Random(0)
+	rules = [None, Recurrence('weekly', WEEKENDS_MASK), Recurrence('every', 3), Recurrence('monthly', 2)]
+	days = iter(f'2024-{month:02}-{day:02}' for month in range(1, 13) for day in range(2, 29, 3))
+
+	for _ in range(500):
+		action = rnd.random()
+		ids = list(manager.daily_tasks)
+		active = list(iter_bits(manager.active))
+
+		if action < 0.35 or not ids:
+			manager.add_tasks([('task', None, rule) if rule else ('task', None)
+							   for rule in rnd.choices(rules, k=rnd.randint(1, 3))])
+		elif action < 0.6 and active:
+			manager.complete_tasks(rnd.sample(active, rnd.randint(1, len(active))))
+		elif action < 0.85:
+			manager.delete_tasks(rnd.sample(ids, rnd.randint(1, min(3, len(ids)))))
+		else:
+			manager.update(next(days))
+		check(manager)
+
+	# После перезагрузки маски и счётчик восстанавливаются из сохранения
+	remaining, active, completed = manager.remaining, manager.active, manager.completed
+	manager.load(manager.save())
+	check(manager)
+	assert (manager.remaining, manager.active, manager.completed) == (remaining, active, completed)
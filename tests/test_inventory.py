@@ -0,0 +1,81 @@
+import pytest
+
+from RPGtask.inventory import Inventory, CompactInventory, Item
+
+
+def make_item(identifier: str, stack: int) -> Item:
+	item = Item(identifier, identifier, '')
+	item.set_stack(stack)
+	return item
+
+
+@pytest.fixture(params=[Inventory, CompactInventory], ids=['inventory', 'compact'])
+def inventory(request) -> Inventory:
+	return Inventory(is_carrier=False, size=3) if request.param is Inventory else CompactInventory(3)
+
+
+def state(inventory: Inventory) -> tuple:
+	""" Содержимое слотов и индексы инвентаря. """
+	return [slot.save() for slot in inventory.slots], dict(inventory.counts), inventory.total
+
+
+def test_take_many_atomic_rolls_back(inventory):
+	apple, stone = make_item('apple', 5), make_item('stone', 10)
+	inventory.take(apple, 3)
+	inventory.pop_changed()
+	before, version = state(inventory), inventory.version
+
+	# Яблоки дополняют неполный стак и занимают новый слот, камни не помещаются
+	result = inventory.take_many([(apple, 4), (stone, 25)], atomic=True)
+
+	assert result.rolled_back and not result.ok
+	assert result.placed == []
+	assert result.overflow == [(apple, 4), (stone, 25)]
+	assert state(inventory) == before
+	assert inventory.version == version
+	assert inventory.pop_changed() == []
+
+
+def test_take_many_after_rollback_uses_restored_slots(inventory):
+	apple = make_item('apple', 5)
+	inventory.take(apple, 3)
+	inventory.take_many([(apple, 30)], atomic=True)
+
+	# Неполный стак и пустые слоты снова доступны
+	assert inventory.take(apple, 2) == 0
+	assert inventory.slots[0].save() == ['apple', 5]
+	assert inventory.take(apple, 10) == 0
+	assert inventory.count_item(apple) == 15
+	assert inventory.free_slot(apple.type) is None
+
+
+def test_take_many_partial_without_atomic(inventory):
+	apple, stone = make_item('apple', 5), make_item('stone', 10)
+	result = inventory.take_many([(apple, 4), (apple, 3), (stone, 25)])
+
+	assert not result.rolled_back
+	assert [(item.id, amount) for item, amount in result.overflow] == [('stone', 15)]
+	assert [(item.id, i, amount) for item, i, amount in result.placed] == [
+		('apple', 0, 5), ('apple', 1, 2), ('stone', 2, 10)
+	]
+	assert inventory.pop_changed() == [0, 1, 2]
+	assert inventory.count_item(apple) == 7 and inventory.count_all() == 17
+
+
+def test_take_many_atomic_commits_when_everything_fits(inventory):
+	apple = make_item('apple', 5)
+	result = inventory.take_many([(apple, 7)], atomic=True)
+
+	assert result.ok and not result.rolled_back
+	assert inventory.pop_changed() == [0, 1]
+	assert inventory.save()[:2] == [['apple', 5], ['apple', 2]]
+
+
+def test_save_reflects_changes_after_load(inventory):
+	inventory.load([['apple', 2], None, ['stone', 4]])
+	assert inventory.save() == [['apple', 2], None, ['stone', 4]]
+
+	inventory.slots[0].swap(inventory.slots[1])
+	inventory.slots[2].clear()
+	assert inventory.save() == [None, ['apple', 2], None]
+	assert not inventory.unsaved
@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from RPGtask.database import Journal
+
+
+@pytest.fixture
+def journal(data_dir) -> Journal:
+	""" Журнал над снимком данных нового игрока во временной папке. """
+	journal = Journal(str(data_dir / 'journal.jsonl'))
+	yield journal
+	journal.close()
+
+
+def write_records(journal: Journal, *records: tuple):
+	for op, *args in records:
+		journal.append(op, *args)
+	journal.close()
+
+
+def test_load_replays_records(journal):
+	write_records(journal, ('task_add', 1, 'a', None), ('gold', 10), ('slot', 2, ['apple', 3]))
+
+	tasks, hero_info, inventory = journal.load()
+
+	assert [task[:3] for task in tasks['user_tasks']] == [['a', None, 1]]
+	assert hero_info['money'] == 10
+	assert inventory[2] == ['apple', 3]
+	assert journal.seq == 3 and journal.size == 3
+
+
+@pytest.mark.parametrize('tail', [b'[3, "gold", 5', b'[3, "gold"', b'\xd0', b'[3, "go'])
+def test_load_drops_torn_tail(journal, tail):
+	write_records(journal, ('gold', 10), ('task_add', 1, 'a', None))
+	valid = Path(journal.path).read_bytes()
+	with open(journal.path, 'ab') as file:
+		file.write(tail)
+
+	tasks, hero_info, _ = journal.load()
+
+	assert hero_info['money'] == 10
+	assert len(tasks['user_tasks']) == 1
+	assert journal.seq == 2
+	# Оборванная запись удаляется из файла
+	assert Path(journal.path).read_bytes() == valid
+
+
+def test_load_stops_at_corrupted_line(journal):
+	write_records(journal, ('gold', 10))
+	with open(journal.path, 'ab') as file:
+		file.write(b'not json\n' + json.dumps([3, 'gold', 99]).encode() + b'\n')
+
+	_, hero_info, _ = journal.load()
+
+	assert hero_info['money'] == 10
+	assert journal.seq == 1
+
+
+def test_append_after_torn_tail(journal):
+	write_records(journal, ('gold', 10))
+	with open(journal.path, 'ab') as file:
+		file.write(b'[2, "gold", 5')
+
+	journal.load()
+	write_records(journal, ('gold', 20))
+	_, hero_info, _ = journal.load()
+
+	# Новая запись не склеивается с оборванной и получает следующий номер
+	assert hero_info['money'] == 20
+	assert journal.seq == 2
+
+
+def test_load_skips_records_in_snapshot(journal):
+	write_records(journal, ('gold', 10), ('gold', 20))
+	tasks, hero_info, inventory = journal.load()
+	journal.save(tasks, hero_info, inventory)
+
+	# Запись из старого журнала с номером, который уже есть в снимке, не применяется повторно
+	with open(journal.path, 'a', encoding='utf-8') as file:
+		file.write(json.dumps([1, 'gold', 10]) + '\n')
+
+	_, hero_info, _ = journal.load()
+	assert hero_info['money'] == 20
+	assert journal.size == 0
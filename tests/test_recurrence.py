@@ -0,0 +1,84 @@
+from datetime import date
+from random import Random
+
+import pytest
+
+from RPGtask.recurrence import Recurrence, WEEKDAYS_MASK, EVERY_DAY
+
+
+def day(year: int, month: int, day_of_month: int) -> int:
+	return date(year, month, day_of_month).toordinal()
+
+
+def brute_count(rule: Recurrence, start: int, end: int) -> int:
+	""" Количество повторений в [start, end) перебором дней. """
+	return sum(rule.next_due(current) == current for current in range(start, end))
+
+
+@pytest.mark.parametrize('start, expected', [
+	(day(2024, 1, 31), day(2024, 1, 31)),
+	(day(2024, 2, 1), day(2024, 2, 29)),  # Високосный февраль
+	(day(2023, 2, 1), day(2023, 2, 28)),
+	(day(2024, 3, 1), day(2024, 3, 31)),
+	(day(2024, 4, 1), day(2024, 4, 30)),
+])
+def test_monthly_next_due_uses_last_day_of_short_month(start, expected):
+	assert Recurrence('monthly', 31).next_due(start) == expected
+
+
+def test_monthly_next_due_rolls_over_year():
+	assert Recurrence('monthly', 10).next_due(day(2023, 12, 11)) == day(2024, 1, 10)
+	assert Recurrence('monthly', 31).next_due(day(2024, 12, 31)) == day(2024, 12, 31)
+	assert Recurrence('monthly', 31).next_due(day(2025, 1, 1)) == day(2025, 1, 31)
+
+
+def test_monthly_count_is_half_open():
+	rule = Recurrence('monthly', 15)
+
+	assert rule.count(day(2024, 1, 15), day(2024, 2, 15)) == 1
+	assert rule.count(day(2024, 1, 15), day(2024, 2, 16)) == 2
+	assert rule.count(day(2024, 1, 16), day(2024, 2, 15)) == 0
+	assert rule.count(day(2024, 1, 15), day(2024, 1, 15)) == 0
+
+
+def test_monthly_count_after_short_months():
+	# 31-е число в феврале и апреле переносится на последний день месяца, но остаётся одно повторение в месяц
+	assert Recurrence('monthly', 31).count(day(2024, 1, 1), day(2025, 1, 1)) == 12
+	assert Recurrence('monthly', 31).count(day(2024, 2, 29), day(2024, 3, 31)) == 1
+
+
+def test_every_count_is_half_open():
+	rule = Recurrence('every', 3).anchored(day(2024, 1, 1))
+
+	assert rule.count(day(2024, 1, 1), day(2024, 1, 4)) == 1
+	assert rule.count(day(2024, 1, 1), day(2024, 1, 5)) == 2
+	assert rule.count(day(2024, 1, 2), day(2024, 1, 4)) == 0
+
+
+def test_weekly_count_over_week():
+	monday = day(2024, 1, 1)
+	assert Recurrence('weekly', WEEKDAYS_MASK).count(monday, monday + 7) == 5
+	assert Recurrence('weekly', WEEKDAYS_MASK).count(monday + 5, monday + 7) == 0
+
+
+@pytest.mark.parametrize('rule', [
+	EVERY_DAY,
+	Recurrence('weekly', WEEKDAYS_MASK),
+	Recurrence('weekly', 0b1000001),
+	Recurrence('every', 4, day(2023, 11, 5)),
+	Recurrence('monthly', 1),
+	Recurrence('monthly', 29),
+	Recurrence('monthly', 31),
+])
+def test_count_matches_brute_force(rule):
+	rnd = Random(0)
+	for _ in range(200):
+		start = day(2023, 1, 1) + rnd.randrange(800)
+		end = start + rnd.randrange(120)
+		assert rule.count(start, end) == brute_count(rule, start, end)
+
+
+@pytest.mark.parametrize('text', ['будни', 'выходные', 'пн,ср,пт', '3д', '15м'])
+def test_flag_round_trip(text):
+	rule = Recurrence.parse(text)
+	assert Recurrence.parse(rule.flag().removeprefix('-e:')).save() == rule.save()
@@ -0,0 +1,62 @@
+import pytest
+
+from RPGtask.server import RPCServer, INVALID_PARAMS, INTERNAL_ERROR, APPLICATION_ERROR
+from RPGtask.session import Session
+
+
+@pytest.fixture
+def server(data_dir) -> RPCServer:
+	session = Session('json')
+	session.update()
+	return RPCServer(session)
+
+
+def call(server: RPCServer, method: str, params: dict | list | None = None) -> dict:
+	return server.dispatch({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}})
+
+
+def error_code(response: dict) -> int | None:
+	return response.get('error', {}).get('code')
+
+
+@pytest.mark.parametrize('method, params', [
+	('tasks.add', {'line': 5}),
+	('tasks.import', {'lines': 'abc'}),
+	('tasks.import', {'lines': ['a', 1]}),
+	('tasks.complete', {'tasks': '12'}),
+	('tasks.complete', {'tasks': [1.5]}),
+	('tasks.complete', {'daily': [True]}),
+	('tasks.complete', {'goals': 'x'}),
+	('tasks.delete', {'tasks': 1}),
+	('tasks.delete', {'daily': ['1']}),
+	('skills.buy', {'skill': '1'}),
+	('skills.buy', {'skill': 42}),
+	('shop.buy', {'items': 'abc'}),
+	('inventory.equip', {'slot': '0'}),
+	('inventory.equip', {'slot': 99}),
+	('quests.start', {'quest': 5}),
+	('tasks.add', {'text': 'a'}),
+	('tasks.add', ['a', 'b']),
+])
+def test_wrong_params_are_invalid_params(server, method, params):
+	assert error_code(call(server, method, params)) == INVALID_PARAMS
+
+
+def test_string_is_not_iterated_as_ids(server):
+	call(server, 'tasks.add', {'line': 'a'})
+
+	assert error_code(call(server, 'tasks.complete', {'tasks': '1'})) == INVALID_PARAMS
+	assert server.session.task_manager.tasks
+
+
+def test_valid_params_still_work(server):
+	task = call(server, 'tasks.add', {'line': 'a'})['result']
+
+	assert 'result' in call(server, 'tasks.complete', {'tasks': [task['id']]})
+	assert error_code(call(server, 'tasks.delete', {'tasks': [task['id']]})) == APPLICATION_ERROR
+
+
+def test_type_error_inside_handler_is_internal_error(server, monkeypatch):
+	monkeypatch.setattr(server.session.player, 'save', lambda: None + 1)
+
+	assert error_code(call(server, 'player.get')) == INTERNAL_ERROR